@@ -0,0 +1,130 @@
+"""Compare the lxml readability extractor with newspaper3k and BeautifulSoup on saved article pages.
+
+No corpus is checked in. Capture one from the feeds in feeds.txt with
+--fetch, which needs network access, and point --corpus at it.
+"""
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+import feedparser
+
+from src.utils.extraction import extract_with_beautifulsoup, extract_with_lxml, extract_with_newspaper
+
+WORD = re.compile(r'\w+')
+
+def words(text: Optional[str]) -> List[str]:
+    return WORD.findall((text or '').lower())
+
+def agreement(text: Optional[str], reference: Optional[str]) -> float:
+    """Word-overlap F1 of an extracted text against the reference extraction."""
+    found, expected = words(text), words(reference)
+    if not found or not expected:
+        return 1.0 if found == expected else 0.0
+    counts: Dict[str, int] = {}
+    for word in expected:
+        counts[word] = counts.get(word, 0) + 1
+    overlap = 0
+    for word in found:
+        if counts.get(word):
+            counts[word] -= 1
+            overlap += 1
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / len(found), overlap / len(expected)
+    return 2 * precision * recall / (precision + recall)
+
+def load_corpus(directory: Path) -> Dict[str, str]:
+    return {path.stem: path.read_text(encoding='utf-8') for path in sorted(directory.glob('*.html'))}
+
+def time_extractor(extract: Callable[[str, str], Optional[dict]], pages: Dict[str, str],
+                   repeat: int) -> Tuple[float, Dict[str, Optional[dict]]]:
+    """Pages per second over ``repeat`` passes, and each page's result from the last pass."""
+    results = {}
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for name, html in pages.items():
+            try:
+                results[name] = extract(f'https://{name}/', html)
+            except Exception:
+                results[name] = None
+    elapsed = time.perf_counter() - start
+    return repeat * len(pages) / elapsed if elapsed else 0.0, results
+
+async def fetch_corpus(feeds_file: str, directory: Path, per_feed: int):
+    """Save the latest articles of every feed as ``<domain>-<n>.html``."""
+    with open(feeds_file) as f:
+        feeds = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    directory.mkdir(parents=True, exist_ok=True)
+    timeout = aiohttp.ClientTimeout(total=30)
+    headers = {'User-Agent': 'Mozilla/5.0 (compatible; NewsMonitor/1.0)'}
+    async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
+        for feed_url in feeds:
+            try:
+                async with session.get(feed_url) as response:
+                    feed = feedparser.parse(await response.read())
+                for n, entry in enumerate(feed.entries[:per_feed]):
+                    async with session.get(entry.link) as response:
+                        if response.status != 200:
+                            continue
+                        html = await response.text(errors='replace')
+                    domain = urlparse(entry.link).netloc.removeprefix('www.')
+                    (directory / f'{domain}-{n}.html').write_text(html, encoding='utf-8')
+                    print(f"Saved {entry.link}")
+            except Exception as e:
+                print(f"Skipped {feed_url}: {e}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark article extractors on saved HTML pages")
+    parser.add_argument("--corpus", type=Path, required=True, help="Directory of saved .html pages")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes over the corpus per extractor")
+    parser.add_argument("--fetch", action="store_true",
+                        help="First save the latest articles of the feeds in --feeds into --corpus")
+    parser.add_argument("--feeds", default=os.path.join(os.path.dirname(__file__), 'feeds.txt'))
+    parser.add_argument("--per-feed", type=int, default=1, help="Articles to save per feed with --fetch")
+    args = parser.parse_args()
+
+    if args.fetch:
+        asyncio.run(fetch_corpus(args.feeds, args.corpus, args.per_feed))
+    pages = load_corpus(args.corpus)
+    if not pages:
+        sys.exit(f"No .html pages in {args.corpus}, capture some with --fetch")
+
+    newspaper_rate, reference = time_extractor(extract_with_newspaper, pages, args.repeat)
+    lxml_rate, extracted = time_extractor(lambda url, html: extract_with_lxml(html), pages, args.repeat)
+    soup_rate, fallback = time_extractor(lambda url, html: extract_with_beautifulsoup(html), pages, args.repeat)
+
+    print(f"{'page':<28} {'newspaper':>10} {'lxml':>8} {'bs4':>8} {'agreement':>10} {'title':>6}")
+    scores = []
+    titles = 0
+    # Pages where only the BeautifulSoup fallback found text, which removing it would lose
+    soup_only = []
+    for name in pages:
+        expected, found, soup = reference[name] or {}, extracted[name] or {}, fallback[name] or {}
+        score = agreement(found.get('text'), expected.get('text'))
+        same_title = ' '.join((found.get('title') or '').split()) == ' '.join((expected.get('title') or '').split())
+        scores.append(score)
+        titles += same_title
+        if soup.get('text') and not found.get('text'):
+            soup_only.append(name)
+        print(f"{name[:28]:<28} {len(words(expected.get('text'))):>10} {len(words(found.get('text'))):>8} "
+              f"{len(words(soup.get('text'))):>8} {score:>10.2f} {'yes' if same_title else 'no':>6}")
+
+    print(f"\n{len(pages)} pages, {args.repeat} passes")
+    print(f"newspaper3k:   {newspaper_rate:8.1f} pages/sec")
+    print(f"lxml:          {lxml_rate:8.1f} pages/sec ({lxml_rate / newspaper_rate:.1f}x)")
+    print(f"BeautifulSoup: {soup_rate:8.1f} pages/sec ({soup_rate / newspaper_rate:.1f}x)")
+    print(f"lxml agreement with newspaper3k: mean {statistics.mean(scores):.2f}, min {min(scores):.2f}, "
+          f"titles {titles}/{len(pages)}")
+    print(f"Pages only BeautifulSoup extracted: {len(soup_only)}" + (f" ({', '.join(soup_only)})" if soup_only else ''))
+
+if __name__ == "__main__":
+    main()
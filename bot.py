@@ -2,6 +2,7 @@
 import asyncio
 import argparse
 from src.core.feed_watcher import FeedWatcher
+from src.core.scheduler import FeedScheduler
 
 async def main(feed_file: str):
     """Main function to start feed watching"""
@@ -13,24 +14,16 @@ async def main(feed_file: str):
         watcher = FeedWatcher()
         await watcher.init()
         
-        tasks = []
-        for feed_url in feeds:
-            tasks.append(asyncio.create_task(watcher.watch_feed(feed_url)))
+        scheduler = FeedScheduler(watcher)
+        scheduler.add_feeds(feed_url for feed_url in feeds if feed_url.strip())
             
         print("▶ Starting real-time feed monitoring...")
-        await asyncio.gather(*tasks)
+        await scheduler.run()
     except KeyboardInterrupt:
         print("\n🛑 Monitoring stopped")
     except Exception as e:
         print(f"Error in main: {e}")
     finally:
-        if tasks:
-            for task in tasks:
-                task.cancel()
-            try:
-                await asyncio.gather(*tasks, return_exceptions=True)
-            except Exception:
-                pass
         if watcher:
             await watcher.close()
 
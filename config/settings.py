@@ -1,7 +1,7 @@
 """Settings configuration."""
 import os
 from pathlib import Path
-from typing import Tuple, List
+from typing import Dict, Tuple, List
 
 # Load environment variables if .env file exists
 from dotenv import load_dotenv
@@ -34,11 +34,10 @@ TELEGRAM_CHANNEL_ID = os.getenv("TELEGRAM_CHANNEL_ID")
 # API Configuration
 GEMINI_API_KEYS = get_api_keys()
 
-# Rate Limiting
+# Rate Limiting (per API key and model; requests are spread over all keys)
 RPM_LIMIT = 15  # Requests per minute
 RPD_LIMIT = 1500  # Requests per day
-MINUTE_WINDOW = 60  # Time window in seconds for RPM
-DAY_WINDOW = 86400  # Time window in seconds for RPD
+MODEL_RATE_LIMITS: Dict[str, Tuple[int, int]] = {}  # Per-model (per minute, per day) overrides
 
 # Web Server
 WEB_HOST = "0.0.0.0"
@@ -47,8 +46,35 @@ WEB_PORT = 8000
 # Feed Processing
 MAX_CONCURRENT_FEEDS = 10
 FEED_POLL_INTERVAL: Tuple[int, int] = (30, 60)  # Random interval between these values in seconds
+PREDICTOR_MAX_POLL_INTERVAL: int = 1800  # Longest poll delay scheduled from a feed's learned publication rhythm
 ERROR_BACKOFF_DELAY: int = 60  # Seconds to wait after an error
-BATCH_SIZE: int = 5  # Number of entries to process in one batch
+FEED_STARTUP_SPREAD: int = 60  # Seconds over which first polls are staggered after a restart
+BATCH_SIZE: int = 5  # Maximum number of articles enriched in one model call
 MAX_ENTRIES_PER_FEED: int = 20  # Maximum number of new entries to process per feed
-API_CALLS_PER_MINUTE: int = 15  # Gemini API rate limit
-API_CALLS_PER_DAY: int = 1500  # Gemini API daily limit
\ No newline at end of file
+PARSE_WORKERS: int = os.cpu_count() or 1  # Worker processes for feed parsing, 0 parses in the event loop
+NEAR_DUP_WINDOW_HOURS: int = 24  # Hours during which AI results are reused for copies of a story
+NEAR_DUP_MAX_DISTANCE: int = 5  # SimHash bit difference up to which two entries count as the same story
+WEBSUB_CALLBACK_URL = os.getenv("WEBSUB_CALLBACK_URL")  # e.g. https://example.org/websub, unset disables push
+WEBSUB_PORT = int(os.getenv("WEBSUB_PORT", "8001"))  # Port the feed service receives WebSub pushes on, apart from WEB_PORT
+WEBSUB_POLL_INTERVAL: int = 6 * 3600  # Safety-net poll interval for feeds receiving WebSub pushes
+AI_CALL_TIMEOUT: int = 45  # Seconds before a single Gemini call is cancelled
+AI_MAX_CONCURRENT_CALLS: int = 4  # Gemini calls allowed in flight at once
+AI_MODE = os.getenv("AI_MODE", "enrich")  # "enrich": one structured call per article, "legacy": separate calls
+AI_ENRICH_MODEL = "gemini-2.0-flash"  # Model for enrich mode, which needs JSON schema support
+AI_BATCH_CALL_TIMEOUT: int = 120  # Seconds before a batched enrich call is cancelled
+AI_BATCH_TOKEN_BUDGET: int = 30000  # Estimated article tokens packed into one batched enrich call
+AI_BATCH_LINGER: float = 2.0  # Seconds the enrich stage waits for a batch to fill
+LLM_CACHE_MAX_ENTRIES: int = 50000  # Model responses kept before least recently used are evicted
+LLM_CACHE_TTL_DAYS: int = 30  # Days a cached model response stays valid
+SCRAPE_CACHE_FRESH_HOURS: int = 6  # Hours a scraped article is reused without asking the publisher
+SCRAPE_CACHE_TTL_DAYS: int = 7  # Days a scraped article is kept for conditional revalidation
+SCRAPE_CACHE_MAX_ENTRIES: int = 20000  # Scraped articles kept before least recently used are evicted
+EXTRACT_WORKERS: int = max(1, (os.cpu_count() or 2) // 2)  # Worker processes for article extraction, 0 extracts in a thread
+EXTRACT_MAX_JOBS_PER_WORKER: int = 200  # Pages per extraction worker before the worker pool is replaced
+EXTRACT_MAX_WORKER_RSS_MB: int = 1024  # Hard ceiling on extraction worker memory in MB, well above a worker's steady state
+EXTRACT_QUEUE_SIZE: int = 32  # Pages queued or extracting at once before scrapers wait
+SCRAPE_MAX_CONCURRENT: int = 16  # Article downloads in flight at once across all publishers
+SCRAPE_DOMAIN_DELAY: float = 3.0  # Seconds between requests to a publisher before it has answered any
+SCRAPE_MIN_DOMAIN_DELAY: float = 0.5  # Shortest spacing a fast, healthy publisher is brought down to
+SCRAPE_MAX_DOMAIN_DELAY: float = 120.0  # Longest spacing a throttling or failing publisher is backed off to
+SCRAPE_TARGET_LATENCY: float = 2.0  # Response seconds above which a publisher counts as struggling
\ No newline at end of file
@@ -0,0 +1,135 @@
+"""Replay stored publication history to compare poll scheduling strategies."""
+import argparse
+import datetime
+import statistics
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from src.core.poll_predictor import PublishRhythm
+from src.database.models import get_db
+
+class LegacyStrategy:
+    """The fixed-factor adaptive interval used before the predictor."""
+    name = "legacy"
+
+    def __init__(self, min_interval: float, max_interval: float, initial: float = 3600):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = initial
+
+    def after_poll(self, now: datetime.datetime, new: List[datetime.datetime]) -> float:
+        if new:
+            # source_priority was compared as a fraction, so this factor was always 0.2
+            self.interval = max(self.interval * 0.2, self.min_interval)
+        else:
+            self.interval = min(self.interval * 1.2, self.max_interval)
+        return self.interval
+
+class PredictorStrategy:
+    """Poll near the next publication predicted by PublishRhythm."""
+    name = "predictor"
+
+    def __init__(self, min_interval: float, max_interval: float, min_observations: int = 5,
+                 poll_fraction: float = 0.25):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.min_observations = min_observations
+        self.poll_fraction = poll_fraction
+        self.rhythm = PublishRhythm()
+        self.fallback = LegacyStrategy(min_interval, max_interval)
+
+    def after_poll(self, now: datetime.datetime, new: List[datetime.datetime]) -> float:
+        fallback = self.fallback.after_poll(now, new)
+        for published in new:
+            self.rhythm.observe(published)
+        if self.rhythm.observations < self.min_observations:
+            return fallback
+        delay = self.rhythm.next_delay(now, self.poll_fraction)
+        if delay is None:
+            return fallback
+        return min(max(delay, self.min_interval), self.max_interval)
+
+def simulate(times: List[datetime.datetime], strategy) -> Dict[str, float]:
+    """Poll a feed from its first to its last entry and measure detection latency."""
+    now = times[0]
+    requests = 0
+    latencies = []
+    delay = strategy.after_poll(now, [times[0]])
+    pending = 1
+    while pending < len(times):
+        now += datetime.timedelta(seconds=delay)
+        requests += 1
+        new = []
+        while pending < len(times) and times[pending] <= now:
+            latencies.append((now - times[pending]).total_seconds())
+            new.append(times[pending])
+            pending += 1
+        delay = strategy.after_poll(now, new)
+    return {'requests': requests, 'latencies': latencies}
+
+def load_history(feed: Optional[str] = None) -> Dict[str, List[datetime.datetime]]:
+    query = 'SELECT feed_url, pub_date FROM news_entries'
+    params = ()
+    if feed:
+        query += ' WHERE feed_url = ?'
+        params = (feed,)
+    history = defaultdict(list)
+    with get_db() as conn:
+        for feed_url, pub_date in conn.execute(query, params):
+            try:
+                timestamp = datetime.datetime.fromisoformat(pub_date)
+            except (TypeError, ValueError):
+                continue
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+            history[feed_url].append(timestamp.astimezone(datetime.timezone.utc))
+    return {url: sorted(times) for url, times in history.items()}
+
+def report(name: str, requests: int, latencies: List[float]):
+    if not latencies:
+        print(f"{name:<10} {requests:>9} {0:>9}")
+        return
+    ordered = sorted(latencies)
+    p90 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+    print(f"{name:<10} {requests:>9} {len(latencies):>9} {requests / len(latencies):>10.2f} "
+          f"{statistics.mean(latencies) / 60:>10.1f} {statistics.median(latencies) / 60:>10.1f} {p90 / 60:>10.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the poll predictor against stored entry history")
+    parser.add_argument("--feed", help="Only replay this feed URL")
+    parser.add_argument("--min-interval", type=float, default=30, help="Minimum poll interval in seconds")
+    parser.add_argument("--max-interval", type=float, default=1800, help="Maximum poll interval in seconds")
+    parser.add_argument("--poll-fraction", type=float, default=0.25,
+                        help="Expected publications between predictor polls")
+    parser.add_argument("--min-entries", type=int, default=10, help="Skip feeds with fewer stored entries")
+    args = parser.parse_args()
+
+    history = {url: times for url, times in load_history(args.feed).items() if len(times) >= args.min_entries}
+    if not history:
+        print("No feeds with enough stored entries to replay.")
+        return
+
+    totals = {}
+    strategies = {
+        LegacyStrategy.name: lambda: LegacyStrategy(args.min_interval, args.max_interval),
+        PredictorStrategy.name: lambda: PredictorStrategy(
+            args.min_interval, args.max_interval, poll_fraction=args.poll_fraction
+        )
+    }
+    for name, make_strategy in strategies.items():
+        requests = 0
+        latencies = []
+        for times in history.values():
+            result = simulate(times, make_strategy())
+            requests += result['requests']
+            latencies.extend(result['latencies'])
+        totals[name] = (requests, latencies)
+
+    print(f"Replayed {sum(len(t) for t in history.values())} entries from {len(history)} feeds")
+    print(f"{'strategy':<10} {'requests':>9} {'detected':>9} {'req/entry':>10} "
+          f"{'mean min':>10} {'median min':>10} {'p90 min':>10}")
+    for name, (requests, latencies) in totals.items():
+        report(name, requests, latencies)
+
+if __name__ == "__main__":
+    main()
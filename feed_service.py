@@ -1,11 +1,15 @@
 """Stand-alone feed watcher service."""
 import asyncio
 import logging
+import uvicorn
 from src.core.feed_watcher import FeedWatcher, FeedConfiguration
+from src.core.scheduler import FeedScheduler
 from config.settings import (
-    FEED_POLL_INTERVAL, MAX_CONCURRENT_FEEDS,
-    BATCH_SIZE, MAX_ENTRIES_PER_FEED,
-    API_CALLS_PER_MINUTE, API_CALLS_PER_DAY
+    FEED_POLL_INTERVAL, PREDICTOR_MAX_POLL_INTERVAL, MAX_CONCURRENT_FEEDS, FEED_STARTUP_SPREAD,
+    BATCH_SIZE, MAX_ENTRIES_PER_FEED, PARSE_WORKERS,
+    NEAR_DUP_WINDOW_HOURS, NEAR_DUP_MAX_DISTANCE,
+    WEBSUB_CALLBACK_URL, WEBSUB_POLL_INTERVAL, WEBSUB_PORT, WEB_HOST,
+    RPM_LIMIT, RPD_LIMIT, GEMINI_API_KEYS, AI_BATCH_TOKEN_BUDGET, AI_BATCH_LINGER
 )
 from src.database.models import init_db
 
@@ -33,10 +37,19 @@ async def run_feed_watcher():
         max_concurrent_feeds=MAX_CONCURRENT_FEEDS,
         min_poll_interval=FEED_POLL_INTERVAL[0],
         max_poll_interval=FEED_POLL_INTERVAL[1],
+        predictor_max_interval=PREDICTOR_MAX_POLL_INTERVAL,
         connect_timeout=30.0,
         total_timeout=60.0,
         batch_size=BATCH_SIZE,
-        max_entries_per_feed=MAX_ENTRIES_PER_FEED
+        batch_token_budget=AI_BATCH_TOKEN_BUDGET,
+        batch_linger=AI_BATCH_LINGER,
+        max_entries_per_feed=MAX_ENTRIES_PER_FEED,
+        startup_spread=FEED_STARTUP_SPREAD,
+        parse_workers=PARSE_WORKERS,
+        near_dup_window_hours=NEAR_DUP_WINDOW_HOURS,
+        near_dup_max_distance=NEAR_DUP_MAX_DISTANCE,
+        websub_callback_url=WEBSUB_CALLBACK_URL,
+        websub_poll_interval=WEBSUB_POLL_INTERVAL
     )
     
     max_retries = 3
@@ -44,11 +57,11 @@ async def run_feed_watcher():
     
     logger.info("🚀 Starting feed watcher service")
     logger.info(f"""⚙️ Configuration:
-    - Poll interval: {FEED_POLL_INTERVAL[0]}-{FEED_POLL_INTERVAL[1]}s
+    - Poll interval: {FEED_POLL_INTERVAL[0]}-{FEED_POLL_INTERVAL[1]}s, up to {PREDICTOR_MAX_POLL_INTERVAL}s when predicted
     - Max concurrent feeds: {MAX_CONCURRENT_FEEDS}
     - Batch size: {BATCH_SIZE}
     - Max entries per feed: {MAX_ENTRIES_PER_FEED}
-    - API limits: {API_CALLS_PER_MINUTE}/min, {API_CALLS_PER_DAY}/day""")
+    - API limits: {RPM_LIMIT}/min, {RPD_LIMIT}/day per key and model, {len([k for k in GEMINI_API_KEYS if k])} key(s)""")
     
     for attempt in range(max_retries):
         try:
@@ -60,14 +73,20 @@ async def run_feed_watcher():
                 logger.error("❌ No feed URLs loaded. Check feeds.txt file.")
                 return
                 
-            tasks = []
-            for url in feed_urls:
-                task = asyncio.create_task(feed_watcher.watch_feed(url))
-                tasks.append(task)
+            scheduler = FeedScheduler(feed_watcher)
+            scheduler.add_feeds(feed_urls)
             
             logger.info(f"✨ Feed watcher initialized with {len(feed_urls)} feeds")
             logger.info("▶️ Starting feed monitoring...")
-            await asyncio.gather(*tasks)
+            if WEBSUB_CALLBACK_URL:
+                # WebSub callbacks must reach this process, so serve the web app alongside the scheduler
+                from src.web.main import app
+                # On its own port, so it does not clash with web_server.py on WEB_PORT
+                server = uvicorn.Server(uvicorn.Config(app, host=WEB_HOST, port=WEBSUB_PORT))
+                logger.info(f"📮 Accepting WebSub pushes at {WEBSUB_CALLBACK_URL} (port {WEBSUB_PORT})")
+                await asyncio.gather(scheduler.run(), server.serve())
+            else:
+                await scheduler.run()
             return
             
         except Exception as e:
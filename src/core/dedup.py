@@ -0,0 +1,222 @@
+"""Bounded-memory duplicate detection for processed entries."""
+import datetime
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import time
+from typing import List, Optional
+
+from ..database.models import (
+    PROJECT_ROOT, content_hash, entry_exists, load_recent_dedup_keys
+)
+
+logger = logging.getLogger(__name__)
+
+DEDUP_DIR = os.path.join(PROJECT_ROOT, 'data', 'dedup')
+
+class BloomFilter:
+    """Fixed-size Bloom filter stored in a memory-mapped file.
+
+    File layout: magic, number of bits, number of hashes, item count and
+    creation time, followed by the bit array.
+    """
+
+    MAGIC = b'GMBLOOM1'
+    HEADER = struct.Struct('<8sQIId')
+
+    def __init__(self, path: str, capacity: int = 50000, error_rate: float = 0.001):
+        self.path = path
+        if os.path.exists(path):
+            self._file = open(path, 'r+b')
+            self._mm = mmap.mmap(self._file.fileno(), 0)
+            magic, self.num_bits, self.num_hashes, self.count, self.created = self.HEADER.unpack_from(self._mm)
+            if magic != self.MAGIC:
+                self.close()
+                raise ValueError(f"Not a bloom filter file: {path}")
+        else:
+            self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+            self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+            self.count = 0
+            self.created = time.time()
+            self._file = open(path, 'w+b')
+            self._file.truncate(self.HEADER.size + (self.num_bits + 7) // 8)
+            self._mm = mmap.mmap(self._file.fileno(), 0)
+            self._write_header()
+        self.capacity = int(self.num_bits * (math.log(2) ** 2) / -math.log(error_rate))
+
+    def _write_header(self):
+        self.HEADER.pack_into(self._mm, 0, self.MAGIC, self.num_bits, self.num_hashes, self.count, self.created)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str):
+        offset = self.HEADER.size
+        for position in self._positions(key):
+            self._mm[offset + (position >> 3)] |= 1 << (position & 7)
+        self.count += 1
+        self._write_header()
+
+    def __contains__(self, key: str) -> bool:
+        offset = self.HEADER.size
+        return all(
+            self._mm[offset + (position >> 3)] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def flush(self):
+        self._mm.flush()
+
+    def close(self):
+        if not self._mm.closed:
+            self._mm.flush()
+            self._mm.close()
+        self._file.close()
+
+class DedupIndex:
+    """Time-windowed Bloom filter index backed by exact database lookups.
+
+    Keys are added to the newest generation file. A new generation starts
+    every ``generation_hours`` or once the current one reaches capacity, and
+    generations older than ``window_days`` are deleted, so memory and disk
+    use stay bounded. A Bloom hit is confirmed against the matching indexed
+    column of news_entries; a miss needs no database access at all.
+    """
+
+    def __init__(self, directory: str = DEDUP_DIR, window_days: int = 14,
+                 generation_hours: int = 24, capacity: int = 50000, error_rate: float = 0.001):
+        self.directory = directory
+        self.window = datetime.timedelta(days=window_days)
+        self.generation_seconds = generation_hours * 3600
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.generations: List[BloomFilter] = []
+        self.checks = 0
+        self.filter_hits = 0
+        self.confirmed = 0
+
+    def load(self):
+        """Open persisted generations, rebuilding from the database if none exist."""
+        os.makedirs(self.directory, exist_ok=True)
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith('.bloom'):
+                continue
+            try:
+                self.generations.append(BloomFilter(os.path.join(self.directory, name)))
+            except (OSError, ValueError, struct.error) as e:
+                logger.warning(f"Discarding unreadable dedup generation {name}: {e}")
+                os.remove(os.path.join(self.directory, name))
+        self.generations.sort(key=lambda generation: generation.created)
+        self._evict()
+        if not self.generations:
+            self._rebuild()
+        logger.info(f"🧬 Dedup index loaded: {len(self.generations)} generations, {len(self)} keys")
+
+    def _rebuild(self):
+        """Seed a generation with entries from the current window."""
+        since = (datetime.datetime.now(datetime.timezone.utc) - self.window).isoformat()
+        rows = load_recent_dedup_keys(since)
+        generation = self._new_generation(capacity=max(self.capacity, int(len(rows) * 1.25)))
+        for link, message_hash, feed_url, guid, entry_hash in rows:
+            for key in self._keys(link, message_hash, feed_url, guid, entry_hash):
+                generation.add(key)
+        logger.info(f"🧬 Rebuilt dedup index from {len(rows)} recent entries")
+
+    def _new_generation(self, capacity: Optional[int] = None) -> BloomFilter:
+        path = os.path.join(self.directory, f"gen-{time.time():.6f}.bloom")
+        generation = BloomFilter(path, capacity or self.capacity, self.error_rate)
+        self.generations.append(generation)
+        return generation
+
+    def _evict(self):
+        """Delete generations that fell out of the window."""
+        cutoff = time.time() - self.window.total_seconds()
+        for generation in [g for g in self.generations if g.created < cutoff]:
+            generation.close()
+            os.remove(generation.path)
+            self.generations.remove(generation)
+
+    def _current(self) -> BloomFilter:
+        current = self.generations[-1] if self.generations else None
+        if current is None or current.full or time.time() - current.created >= self.generation_seconds:
+            self._evict()
+            current = self._new_generation()
+        return current
+
+    @staticmethod
+    def _keys(link=None, message_hash=None, feed_url=None, guid=None, entry_hash=None) -> dict:
+        """Map each available identifier to its filter key."""
+        keys = {}
+        if link:
+            keys[f"link:{link}"] = 'link'
+        if message_hash:
+            keys[f"content:{message_hash}"] = 'message_hash'
+        if feed_url and guid:
+            # GUIDs are only unique within a feed
+            keys[f"guid:{feed_url}|{guid}"] = 'guid'
+        if entry_hash:
+            keys[f"entry:{entry_hash}"] = 'entry_hash'
+        return keys
+
+    def _might_contain(self, key: str) -> bool:
+        return any(key in generation for generation in self.generations)
+
+    def seen(self, link: Optional[str] = None, message: Optional[str] = None,
+             feed_url: Optional[str] = None, guid: Optional[str] = None,
+             entry_hash: Optional[str] = None) -> bool:
+        """Check whether an entry matching any of the given identifiers was already stored."""
+        self.checks += 1
+        message_hash = content_hash(message) if message else None
+        identifiers = {'link': link, 'message_hash': message_hash, 'feed_url': feed_url,
+                       'guid': guid, 'entry_hash': entry_hash}
+        hits = {
+            name for key, name in self._keys(link, message_hash, feed_url, guid, entry_hash).items()
+            if self._might_contain(key)
+        }
+        if not hits:
+            return False
+        self.filter_hits += 1
+        # Only confirm the identifiers the filter matched
+        confirm = {name: value for name, value in identifiers.items() if name in hits}
+        if 'guid' in hits:
+            confirm['feed_url'] = feed_url
+        if entry_exists(**confirm):
+            self.confirmed += 1
+            return True
+        return False
+
+    def add(self, link: Optional[str] = None, message: Optional[str] = None,
+            feed_url: Optional[str] = None, guid: Optional[str] = None,
+            entry_hash: Optional[str] = None):
+        """Record a stored entry."""
+        current = self._current()
+        message_hash = content_hash(message) if message else None
+        for key in self._keys(link, message_hash, feed_url, guid, entry_hash):
+            current.add(key)
+
+    def __len__(self) -> int:
+        return sum(generation.count for generation in self.generations)
+
+    def close(self):
+        for generation in self.generations:
+            generation.close()
+        self.generations = []
+
+def entry_fingerprint(title: str, description: str) -> str:
+    """Hash a cleaned title and description to identify an entry before AI processing.
+
+    The description is included so recurring headlines such as "Live updates"
+    are not mistaken for each other.
+    """
+    return content_hash(f"{title}\n{description}")
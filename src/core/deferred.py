@@ -0,0 +1,109 @@
+"""Durable queue of entries whose AI processing waits for API quota."""
+import asyncio
+import datetime
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from .processor import EntryRecord
+from ..database.models import (
+    defer_entries, claim_deferred_entries, delete_deferred_entries, deferred_backlog
+)
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class DeferredEntry:
+    """A parked feed entry, with the article scraped before it was parked."""
+    record: EntryRecord
+    entry_time: datetime.datetime
+    feed_url: str
+    article_data: Optional[Dict[str, Any]]
+    # Times the entry was parked
+    attempts: int = 1
+
+class DeferredQueue:
+    """Parks entries in the deferred_entries table until API quota returns.
+
+    Entries that hit an exhausted quota are parked instead of holding a
+    worker while the quota refills, and survive restarts. Stored entries
+    whose scrape or enrichment failed are parked for a retry as well. claim() leases
+    due entries rather than removing them; done() removes them once their
+    processing finished, so entries claimed before a crash are retried
+    when their lease runs out. track() holds stored entries the same way
+    while they are still on their way to being enriched.
+    """
+
+    def __init__(self, lease: float = 600.0):
+        self.lease = lease
+
+    def park(self, entries: Iterable[Any], delay: float = 0.0, attempts: int = 1):
+        """Park feed entries until at least ``delay`` seconds from now."""
+        now = time.time()
+        defer_entries([
+            (
+                entry.entry.link,
+                entry.feed_url,
+                entry.entry_time.isoformat(),
+                json.dumps(entry.entry._asdict()),
+                json.dumps(entry.article_data, default=str) if entry.article_data is not None else None,
+                attempts,
+                now,
+                now + delay
+            )
+            for entry in entries
+        ])
+
+    def track(self, entries: Iterable[Any]):
+        """Lease entries that are in the pipeline, so a crash before they are persisted leaves them parked.
+
+        Tracking is not an attempt; parking a tracked entry later counts its first.
+        """
+        self.park(entries, self.lease, attempts=0)
+
+    def claim(self, limit: int) -> List[DeferredEntry]:
+        """Lease up to ``limit`` due entries, oldest first."""
+        return [
+            DeferredEntry(
+                record=EntryRecord(**json.loads(record)),
+                entry_time=datetime.datetime.fromisoformat(entry_time),
+                feed_url=feed_url,
+                article_data=json.loads(article_data) if article_data is not None else None,
+                attempts=attempts
+            )
+            for _, feed_url, entry_time, record, article_data, attempts
+            in claim_deferred_entries(time.time(), limit, self.lease)
+        ]
+
+    def done(self, links: List[str]):
+        delete_deferred_entries(links)
+
+    def stats(self) -> Dict[str, float]:
+        """Number of parked entries and the age in seconds of the oldest."""
+        backlog, oldest = deferred_backlog()
+        return {
+            'backlog': backlog,
+            'oldest_age': time.time() - oldest if oldest is not None else 0.0
+        }
+
+    async def run_retrier(self, interval: float, limit: int, quota_wait: Callable[[], float],
+                          resubmit: Callable[[DeferredEntry], Awaitable[None]]):
+        """Hand due entries to ``resubmit`` on an interval while ``quota_wait()`` reports quota.
+
+        Tracked entries whose lease ran out, left by a crash, are handed over too.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            stats = self.stats()
+            wait = quota_wait()
+            if stats['backlog']:
+                logger.info(
+                    f"⏳ Deferred queue: {stats['backlog']} entries waiting for API quota, "
+                    f"oldest for {stats['oldest_age'] / 60:.0f} min, quota back in {wait:.0f}s"
+                )
+            if wait > 0:
+                continue
+            for entry in self.claim(limit):
+                await resubmit(entry)
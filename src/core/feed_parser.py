@@ -0,0 +1,324 @@
+"""Feed parsing with a streaming lxml fast path and feedparser fallback."""
+import datetime
+import logging
+import re
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, List, Optional, Set, Tuple, Union
+
+import feedparser
+from feedparser import FeedParserDict
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+CONTENT_NS = '{http://purl.org/rss/1.0/modules/content/}'
+MEDIA_NS = '{http://search.yahoo.com/mrss/}'
+DC_NS = '{http://purl.org/dc/elements/1.1/}'
+
+_XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+class ParsedFeed:
+    """Entries newer than the watermark, plus parse diagnostics."""
+    def __init__(self):
+        self.entries: List[Tuple[Any, datetime.datetime]] = []
+        # Positions in entries of those without a date, which were given the parse time
+        self.undated: Set[int] = set()
+        self.total_entries = 0
+        self.malformed = False
+        self.truncated = False
+        self.stopped_early = False
+        # Only the start of the body was parsed, and the caller parses all of it
+        self.partial = False
+        # WebSub hub and canonical topic URL advertised by the feed
+        self.hub: Optional[str] = None
+        self.self_url: Optional[str] = None
+
+def _aware(value: Optional[datetime.datetime]) -> Optional[datetime.datetime]:
+    """Ensure a datetime carries timezone info, assuming UTC."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+def parse_date(value: Optional[str]) -> Optional[datetime.datetime]:
+    """Parse an RFC 822 or ISO 8601 feed date."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return _aware(parsedate_to_datetime(value))
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        return _aware(datetime.datetime.fromisoformat(value.replace('Z', '+00:00')))
+    except ValueError:
+        return None
+
+def entry_date(entry: Any) -> Optional[datetime.datetime]:
+    """Get the publication date of a feedparser entry."""
+    # Try standard RSS date formats with error handling
+    for field in ('published', 'updated'):
+        value = getattr(entry, field, None)
+        if value:
+            try:
+                return _aware(parsedate_to_datetime(value))
+            except (TypeError, ValueError, AttributeError):
+                pass
+
+    # Try parsed tuples from feedparser
+    for field in ('published_parsed', 'updated_parsed'):
+        value = getattr(entry, field, None)
+        if value:
+            try:
+                return datetime.datetime(*value[:6]).replace(tzinfo=timezone.utc)
+            except (TypeError, ValueError, AttributeError):
+                pass
+    return None
+
+def _text(element) -> str:
+    """Get the text of an element, serialising any inline XHTML children."""
+    if element is None:
+        return ''
+    if len(element) == 0:
+        return (element.text or '').strip()
+    inner = ''.join(etree.tostring(child, encoding='unicode') for child in element)
+    return ((element.text or '') + inner).strip()
+
+class StreamingFeedParser:
+    """Incremental RSS 2.0/Atom parser fed with raw response chunks.
+
+    Entries are built as soon as their closing tag arrives and the parsed
+    element is discarded, so memory stays flat regardless of feed size.
+    Parsing stops after ``stale_limit`` consecutive entries that are not
+    newer than the watermark. Anything other than well-formed RSS 2.0 or
+    Atom is flagged as malformed so the caller can fall back to feedparser.
+    """
+
+    def __init__(self, watermark: Optional[datetime.datetime] = None, stale_limit: int = 3):
+        self.watermark = _aware(watermark)
+        self.stale_limit = stale_limit
+        self.result = ParsedFeed()
+        self.done = False
+        self._parser = etree.XMLPullParser(
+            events=('start', 'end'), resolve_entities=False, no_network=True
+        )
+        self._format: Optional[str] = None
+        self._started = False
+        self._stale_run = 0
+
+    def feed(self, data: bytes) -> bool:
+        """Feed a chunk of the document. Returns True once no more input is needed."""
+        if self.done or self.result.malformed:
+            return self.done
+        if not self._started:
+            data = data.lstrip()
+            if not data:
+                return False
+            self._started = True
+        try:
+            self._parser.feed(data)
+            self._read_events()
+        except etree.XMLSyntaxError:
+            self.result.malformed = True
+        return self.done
+
+    def close(self) -> ParsedFeed:
+        """Finish parsing and return the result."""
+        if not self.done and not self.result.malformed:
+            try:
+                self._parser.close()
+                self._read_events()
+            except etree.XMLSyntaxError:
+                # A truncated body still yields every entry that was complete
+                if not self.result.truncated:
+                    self.result.malformed = True
+        if self._format is None:
+            self.result.malformed = True
+        return self.result
+
+    def _read_events(self):
+        for event, element in self._parser.read_events():
+            if self.done or self.result.malformed:
+                return
+            if event == 'start':
+                if self._format is None:
+                    if element.tag == 'rss':
+                        self._format = 'rss'
+                    elif element.tag == f'{ATOM_NS}feed':
+                        self._format = 'atom'
+                    else:
+                        self.result.malformed = True
+                continue
+
+            if self._format == 'rss' and element.tag == 'item':
+                self._add_entry(self._rss_entry(element))
+            elif self._format == 'atom' and element.tag == f'{ATOM_NS}entry':
+                self._add_entry(self._atom_entry(element))
+            elif element.tag == f'{ATOM_NS}link' and element.getparent() is not None \
+                    and element.getparent().tag in ('channel', f'{ATOM_NS}feed'):
+                self._feed_link(element)
+                continue
+            else:
+                continue
+
+            # Drop the finished entry and its already-processed siblings
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+    def _feed_link(self, element):
+        rel, href = element.get('rel'), element.get('href')
+        if rel == 'hub' and href and self.result.hub is None:
+            self.result.hub = href
+        elif rel == 'self' and href:
+            self.result.self_url = href
+
+    def _add_entry(self, entry: FeedParserDict):
+        self.result.total_entries += 1
+        pub_date = parse_date(entry.get('published') or entry.get('updated'))
+        if pub_date is not None and self.watermark is not None and pub_date <= self.watermark:
+            self._stale_run += 1
+            if self._stale_run >= self.stale_limit:
+                self.done = True
+                self.result.stopped_early = True
+            return
+        self._stale_run = 0
+        if pub_date is None:
+            pub_date = datetime.datetime.now(timezone.utc)
+            logger.warning(f"No valid date found for entry {entry.get('link', '')}, using current time")
+            self.result.undated.add(len(self.result.entries))
+        self.result.entries.append((entry, pub_date))
+
+    @staticmethod
+    def _media(element, entry: FeedParserDict):
+        thumbnails = [t.get('url') for t in element.iter(f'{MEDIA_NS}thumbnail') if t.get('url')]
+        contents = [c.get('url') for c in element.iter(f'{MEDIA_NS}content') if c.get('url')]
+        if thumbnails:
+            entry['media_thumbnail'] = [{'url': url} for url in thumbnails]
+        if contents:
+            entry['media_content'] = [{'url': url} for url in contents]
+
+    def _rss_entry(self, item) -> FeedParserDict:
+        entry = FeedParserDict()
+        enclosures = []
+        for child in item:
+            tag = child.tag
+            if not isinstance(tag, str):
+                continue
+            if tag == 'title':
+                entry['title'] = _text(child)
+            elif tag == 'link':
+                entry['link'] = _text(child)
+            elif tag == 'description':
+                entry['description'] = entry['summary'] = _text(child)
+            elif tag == 'guid':
+                entry['id'] = _text(child)
+            elif tag == 'pubDate':
+                entry['published'] = _text(child)
+            elif tag == f'{DC_NS}date' and 'published' not in entry:
+                entry['published'] = _text(child)
+            elif tag == f'{CONTENT_NS}encoded':
+                entry['content'] = [{'value': _text(child)}]
+            elif tag == 'enclosure' and child.get('url'):
+                enclosures.append({'href': child.get('url'), 'type': child.get('type', '')})
+            elif tag == f'{ATOM_NS}link' and 'link' not in entry and child.get('href'):
+                entry['link'] = child.get('href')
+        if 'description' not in entry and 'content' in entry:
+            entry['description'] = entry['summary'] = entry['content'][0]['value']
+        if enclosures:
+            entry['enclosures'] = enclosures
+        self._media(item, entry)
+        return entry
+
+    def _atom_entry(self, element) -> FeedParserDict:
+        entry = FeedParserDict()
+        for child in element:
+            tag = child.tag
+            if not isinstance(tag, str):
+                continue
+            if tag == f'{ATOM_NS}title':
+                entry['title'] = _text(child)
+            elif tag == f'{ATOM_NS}link':
+                rel = child.get('rel', 'alternate')
+                if rel == 'alternate' and child.get('href'):
+                    entry['link'] = child.get('href')
+                elif rel == 'enclosure' and child.get('href'):
+                    entry.setdefault('enclosures', []).append(
+                        {'href': child.get('href'), 'type': child.get('type', '')}
+                    )
+            elif tag == f'{ATOM_NS}summary':
+                entry['description'] = entry['summary'] = _text(child)
+            elif tag == f'{ATOM_NS}content':
+                entry['content'] = [{'value': _text(child)}]
+            elif tag == f'{ATOM_NS}id':
+                entry['id'] = _text(child)
+            elif tag == f'{ATOM_NS}published':
+                entry['published'] = _text(child)
+            elif tag == f'{ATOM_NS}updated':
+                entry['updated'] = _text(child)
+        if 'description' not in entry and 'content' in entry:
+            entry['description'] = entry['summary'] = entry['content'][0]['value']
+        self._media(element, entry)
+        return entry
+
+def parse_with_feedparser(content: Union[str, bytes], watermark: Optional[datetime.datetime] = None) -> ParsedFeed:
+    """Parse a feed with feedparser, keeping entries newer than the watermark."""
+    watermark = _aware(watermark)
+    result = ParsedFeed()
+    feed = feedparser.parse(content)
+    for link in feed.feed.get('links', []):
+        if link.get('rel') == 'hub' and result.hub is None:
+            result.hub = link.get('href')
+        elif link.get('rel') == 'self':
+            result.self_url = link.get('href')
+    for entry in feed.entries:
+        result.total_entries += 1
+        pub_date = entry_date(entry)
+        undated = pub_date is None
+        if undated:
+            pub_date = datetime.datetime.now(timezone.utc)
+            logger.warning(f"No valid date found for entry {entry.get('link', '')}, using current time")
+        if watermark is None or pub_date > watermark:
+            if undated:
+                result.undated.add(len(result.entries))
+            result.entries.append((entry, pub_date))
+    return result
+
+def parse_feed(content: Union[str, bytes], watermark: Optional[datetime.datetime] = None,
+               stale_limit: int = 3, truncated: bool = False) -> ParsedFeed:
+    """Parse a complete feed document, falling back to feedparser if malformed.
+
+    A ``truncated`` body was cut off at a size limit, so its unclosed
+    elements are not taken as malformed.
+    """
+    if isinstance(content, str):
+        # lxml rejects str input that carries an encoding declaration
+        data = _XML_DECLARATION.sub('', content, count=1).encode('utf-8')
+    else:
+        data = content
+    parser = StreamingFeedParser(watermark, stale_limit)
+    parser.result.truncated = truncated
+    parser.feed(data)
+    result = parser.close()
+    if result.malformed:
+        logger.debug("Fast feed parser could not handle document, falling back to feedparser")
+        return parse_with_feedparser(content, watermark)
+    return result
+
+def parse_entry_records(content: Union[str, bytes], watermark: Optional[datetime.datetime] = None,
+                        stale_limit: int = 3, truncated: bool = False) -> ParsedFeed:
+    """Parse a feed and reduce its new entries to compact EntryRecords.
+
+    Intended to run in a worker process: the result holds only picklable
+    records with images extracted and HTML already cleaned.
+    """
+    result = parse_feed(content, watermark, stale_limit, truncated)
+    result.entries = prepare_entry_records(result.entries)
+    return result
+
+def prepare_entry_records(entries: List[Tuple[Any, datetime.datetime]]) -> List[Tuple[Any, datetime.datetime]]:
+    """Reduce already parsed entries to EntryRecords, e.g. in a worker process."""
+    # Imported here so the parser module stays free of the AI client dependency
+    from .processor import ArticleProcessor
+    return [(ArticleProcessor.prepare_entry(entry), pub_date) for entry, pub_date in entries]
@@ -0,0 +1,179 @@
+"""Per-feed polling state shared by the feed watcher."""
+import asyncio
+import collections
+import datetime
+import logging
+from dataclasses import dataclass, asdict
+from typing import Deque, Dict, Iterator, Optional, Set
+
+from ..database.models import (
+    load_feed_cache, update_feed_cache_batch, load_recent_entry_times
+)
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class FeedState:
+    """Conditional-GET validators and polling metrics for one feed."""
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_type: Optional[str] = None
+    last_check: Optional[datetime.datetime] = None
+    update_frequency: int = 3600
+    last_success_time: Optional[datetime.datetime] = None
+    consecutive_failures: int = 0
+    source_priority: int = 100
+    last_response_size: int = 0
+    total_bytes: int = 0
+    fetch_count: int = 0
+    not_modified_count: int = 0
+    duplicate_skips: int = 0
+    hub_url: Optional[str] = None
+    topic_url: Optional[str] = None
+
+    @property
+    def not_modified_ratio(self) -> float:
+        """Fraction of fetches answered with 304 Not Modified."""
+        return self.not_modified_count / self.fetch_count if self.fetch_count else 0.0
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Build conditional-GET request headers from stored validators."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data.pop('url')
+        return data
+
+class FeedStateStore:
+    """Holds FeedState for every feed, backed by the feed_cache table.
+
+    All reads and updates happen in memory. Changed feeds are marked dirty
+    and written back to SQLite in batches by flush(), which run_flusher()
+    calls on an interval.
+    """
+
+    # Window used for the recent-entry count behind source priority
+    PRIORITY_WINDOW = datetime.timedelta(days=1)
+
+    def __init__(self):
+        self._states: Dict[str, FeedState] = {}
+        self._dirty: Set[str] = set()
+        self._recent_entries: Dict[str, Deque[datetime.datetime]] = collections.defaultdict(collections.deque)
+
+    def load(self):
+        """Warm the store from the feed_cache and news_entries tables."""
+        fields = set(FeedState.__dataclass_fields__) - {'url'}
+        for url, row in load_feed_cache().items():
+            self._states[url] = FeedState(url=url, **{k: v for k, v in row.items() if k in fields})
+
+        # pub_date carries mixed UTC offsets, so over-fetch by a day and filter precisely here
+        now = datetime.datetime.now(datetime.timezone.utc)
+        since = (now - 2 * self.PRIORITY_WINDOW).isoformat()
+        recent = collections.defaultdict(list)
+        for feed_url, pub_date in load_recent_entry_times(since):
+            try:
+                timestamp = datetime.datetime.fromisoformat(pub_date)
+            except (TypeError, ValueError):
+                continue
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=datetime.timezone.utc)
+            if timestamp > now - self.PRIORITY_WINDOW:
+                recent[feed_url].append(timestamp)
+        for feed_url, timestamps in recent.items():
+            self._recent_entries[feed_url] = collections.deque(sorted(timestamps))
+        logger.info(f"🗂️ Loaded state for {len(self._states)} feeds")
+
+    def get(self, url: str) -> FeedState:
+        """Get the state for a feed, creating it if needed."""
+        state = self._states.get(url)
+        if state is None:
+            state = self._states[url] = FeedState(url=url)
+        return state
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._states
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __iter__(self) -> Iterator[FeedState]:
+        return iter(list(self._states.values()))
+
+    def record_response(self, url: str, status: int, size: int = 0,
+                        etag: Optional[str] = None, last_modified: Optional[str] = None,
+                        content_type: Optional[str] = None) -> FeedState:
+        """Record the outcome of a feed fetch."""
+        state = self.get(url)
+        state.fetch_count += 1
+        if status == 304:
+            state.not_modified_count += 1
+        else:
+            state.etag = etag
+            state.last_modified = last_modified
+            state.content_type = content_type
+            state.last_response_size = size
+            state.total_bytes += size
+        self.mark_dirty(url)
+        return state
+
+    def record_duplicate(self, url: str):
+        """Count an entry skipped by the dedup gate before any scraping or AI work."""
+        self.get(url).duplicate_skips += 1
+        self.mark_dirty(url)
+
+    def record_entry(self, url: str, pub_date: datetime.datetime):
+        """Count a newly stored entry towards the feed's source priority."""
+        if pub_date.tzinfo is None:
+            pub_date = pub_date.replace(tzinfo=datetime.timezone.utc)
+        self._recent_entries[url].append(pub_date)
+
+    def source_priority(self, url: str) -> int:
+        """Current priority score for a feed source.
+        Lower numbers mean the source has been logged more recently/frequently."""
+        entries = self._recent_entries.get(url)
+        count = 0
+        if entries:
+            cutoff = datetime.datetime.now(datetime.timezone.utc) - self.PRIORITY_WINDOW
+            # Entries arrive roughly in order; drop expired ones from the front
+            while entries and entries[0] <= cutoff:
+                entries.popleft()
+            count = sum(1 for timestamp in entries if timestamp > cutoff)
+        # Base priority of 100, subtract 5 for each recent entry, minimum 10
+        return max(100 - (count * 5), 10)
+
+    def mark_dirty(self, url: str):
+        """Queue a feed's state for the next flush."""
+        self._dirty.add(url)
+
+    @property
+    def dirty_count(self) -> int:
+        return len(self._dirty)
+
+    def flush(self):
+        """Write all dirty feed states to the database in one batch."""
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        try:
+            update_feed_cache_batch({url: self._states[url].to_dict() for url in dirty if url in self._states})
+        except Exception as e:
+            self._dirty |= dirty
+            logger.error(f"❌ Error flushing feed state: {e}")
+            return
+        logger.debug(f"💾 Flushed state for {len(dirty)} feeds")
+
+    async def run_flusher(self, interval: float):
+        """Flush dirty feed states every ``interval`` seconds until cancelled."""
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                self.flush()
+        finally:
+            self.flush()
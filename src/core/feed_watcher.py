@@ -1,22 +1,36 @@
 """Feed watching and processing module."""
-import feedparser
 import asyncio
 import random
 import datetime
-from datetime import timezone
+import functools
+import time
 import aiohttp
 import logging
 import traceback
-from typing import Set, Dict, Any, Optional, List, Callable
-from email.utils import parsedate_to_datetime
-from .processor import process_article
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, List, Callable, Tuple
+from .processor import (
+    process_articles, preview_result, quota_wait, ArticleProcessor, EntryRecord, ProcessedContent
+)
+from .feed_state import FeedStateStore
+from .dedup import DedupIndex, entry_fingerprint
+from .near_dup import NearDuplicateIndex
+from .websub import WebSubManager, websub_manager
+from .poll_predictor import PollPredictor
+from .pipeline import Pipeline
+from .deferred import DeferredEntry, DeferredQueue
+from .priority import EnrichmentPrioritizer, FAST
+from .feed_parser import ParsedFeed, StreamingFeedParser, parse_feed, parse_entry_records, prepare_entry_records
 from ..database.models import (
-    get_db, load_feed_cache, update_feed_cache, 
-    get_feed_metrics, exists_in_db, get_source_priority,
-    add_tag, tag_article
+    get_db, add_tag, tag_article, content_hash, load_recent_entry_times
 )
 from ..utils.text import clean_url
-from ..web.websocket_manager import broadcast_news_update
+from ..utils.http import http_client
+from ..utils.ai import estimate_tokens
+from ..utils.quota import QuotaExhausted
+from ..utils.scraper import scrape_article
+from ..utils.extraction import extraction_pool
+from ..web.websocket_manager import broadcast_news_update, broadcast_news_enriched
 
 # Enhanced logging configuration with colored output
 logging.basicConfig(
@@ -25,50 +39,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class RateLimiter:
-    """Rate limiter for API calls."""
-    def __init__(self, calls_per_minute: int = 15, calls_per_day: int = 1500):
-        self.calls_per_minute = calls_per_minute
-        self.calls_per_day = calls_per_day
-        self.minute_calls = 0
-        self.daily_calls = 0
-        self.last_minute_reset = datetime.datetime.now()
-        self.last_daily_reset = datetime.datetime.now()
-        self._lock = asyncio.Lock()
-    
-    async def acquire(self):
-        """Try to acquire a rate limit token."""
-        async with self._lock:
-            now = datetime.datetime.now()
-            
-            # Reset counters if needed
-            if (now - self.last_minute_reset).total_seconds() >= 60:
-                self.minute_calls = 0
-                self.last_minute_reset = now
-                
-            if (now - self.last_daily_reset).total_seconds() >= 86400:
-                self.daily_calls = 0
-                self.last_daily_reset = now
-            
-            # Check limits
-            if self.minute_calls >= self.calls_per_minute:
-                delay = 60 - (now - self.last_minute_reset).total_seconds()
-                if delay > 0:
-                    logger.warning(f"⏳ Rate limit reached. Waiting {delay:.1f}s")
-                    await asyncio.sleep(delay)
-                    self.minute_calls = 0
-                    self.last_minute_reset = datetime.datetime.now()
-            
-            if self.daily_calls >= self.calls_per_day:
-                delay = 86400 - (now - self.last_daily_reset).total_seconds()
-                if delay > 0:
-                    logger.error(f"❌ Daily limit reached. Waiting {delay:.1f}s")
-                    await asyncio.sleep(delay)
-                    self.daily_calls = 0
-                    self.last_daily_reset = now
-            
-            self.minute_calls += 1
-            self.daily_calls += 1
+# Scraping and enrichment wait on the network; storing and persisting stay serial for SQLite
+DEFAULT_STAGE_WORKERS = {
+    'parse': 2,
+    'dedup': 1,
+    'store': 1,
+    'scrape': 8,
+    'enrich': 4,
+    'persist': 1,
+    'publish': 1
+}
 
 class FeedConfiguration:
     """Configuration for feed watcher."""
@@ -80,8 +60,31 @@ class FeedConfiguration:
                  process_timeout: int = 100,
                  connect_timeout: float = 60.0,
                  total_timeout: float = 120.0,
-                 batch_size: int = 10,          # Increased from 5
-                 max_entries_per_feed: int = 50): # Increased from 20
+                 batch_size: int = 10,          # Most entries enriched in one model call
+                 batch_token_budget: int = 30000,  # Estimated article tokens per enrich batch
+                 batch_linger: float = 2.0,  # Seconds the enrich stage waits for a batch to fill
+                 max_entries_per_feed: int = 50, # Increased from 20
+                 startup_spread: float = 60.0,  # Window over which first polls are staggered
+                 state_flush_interval: float = 30.0,  # Seconds between feed state write-backs
+                 max_feed_bytes: int = 5 * 1024 * 1024,  # Feed bodies are truncated beyond this
+                 parse_workers: int = 0,  # Worker processes for feed parsing, 0 parses in-loop
+                 stream_check_entries: int = 25,  # Entries parsed in-loop to find already seen ones when parse workers are on
+                 dedup_window_days: int = 14,  # How long stored entries stay in the dedup filter
+                 near_dup_window_hours: float = 24,  # How long AI results are offered for reuse
+                 near_dup_max_distance: int = 5,  # SimHash bits two texts may differ by to count as one story
+                 websub_callback_url: Optional[str] = None,  # Public base URL of the WebSub callback route
+                 websub_poll_interval: int = 6 * 3600,  # Safety-net poll interval for push-enabled feeds
+                 predictor_history_days: int = 14,  # Days of stored entries the poll predictor learns from
+                 predictor_max_interval: float = 1800.0,  # Longest poll delay the predictor may schedule
+                 stage_workers: Optional[Dict[str, int]] = None,  # Worker count per ingestion stage
+                 stage_queue_size: int = 50,  # Items each stage may have queued before upstream waits
+                 pipeline_report_interval: float = 300.0,  # Seconds between pipeline stats log lines
+                 quota_defer_after: float = 30.0,  # Entries are parked when API quota is further off than this
+                 deferred_retry_interval: float = 30.0,  # Seconds between checks for parked entries to retry
+                 failed_retry_delay: float = 900.0,  # Seconds before a stored entry whose enrichment failed is retried
+                 max_enrich_attempts: int = 5,  # Parks after which a failing stored entry stays a preview
+                 fast_lane_threshold: float = 0.6,  # Priority score from which entries take the fast lane
+                 priority_recency_horizon: float = 6 * 3600):  # Entry age in seconds at which recency stops counting
         self.max_concurrent_feeds = max_concurrent_feeds
         self.min_poll_interval = min_poll_interval
         self.max_poll_interval = max_poll_interval
@@ -90,7 +93,30 @@ class FeedConfiguration:
         self.connect_timeout = connect_timeout
         self.total_timeout = total_timeout
         self.batch_size = batch_size
+        self.batch_token_budget = batch_token_budget
+        self.batch_linger = batch_linger
         self.max_entries_per_feed = max_entries_per_feed
+        self.startup_spread = startup_spread
+        self.state_flush_interval = state_flush_interval
+        self.max_feed_bytes = max_feed_bytes
+        self.parse_workers = parse_workers
+        self.stream_check_entries = stream_check_entries
+        self.dedup_window_days = dedup_window_days
+        self.near_dup_window_hours = near_dup_window_hours
+        self.near_dup_max_distance = near_dup_max_distance
+        self.websub_callback_url = websub_callback_url
+        self.websub_poll_interval = websub_poll_interval
+        self.predictor_history_days = predictor_history_days
+        self.predictor_max_interval = predictor_max_interval
+        self.stage_workers = {**DEFAULT_STAGE_WORKERS, **(stage_workers or {})}
+        self.stage_queue_size = stage_queue_size
+        self.pipeline_report_interval = pipeline_report_interval
+        self.quota_defer_after = quota_defer_after
+        self.deferred_retry_interval = deferred_retry_interval
+        self.failed_retry_delay = failed_retry_delay
+        self.max_enrich_attempts = max_enrich_attempts
+        self.fast_lane_threshold = fast_lane_threshold
+        self.priority_recency_horizon = priority_recency_horizon
 
 class FeedEntry:
     """Represents a processed feed entry."""
@@ -99,21 +125,77 @@ class FeedEntry:
         self.entry_time = entry_time
         self.feed_url = feed_url
         self.processed_result: Optional[Dict] = None
+        self.article_data: Optional[Dict] = None
+        # Set for entries taken back from the deferred queue, with the times they were parked
+        self.deferred = False
+        self.attempts = 0
+        # Set once the raw entry is stored, so enrichment updates its row
+        self.stored = False
+        self.article_id: Optional[int] = None
+        # Enrichment priority, set by the dedup stage
+        self.score = 0.0
+        self.lane = FAST
+        self.queued = time.monotonic()
 
 class FeedWatcher:
     """Watches RSS feeds for updates and processes new entries."""
     
     def __init__(self, config: Optional[FeedConfiguration] = None):
         self.config = config or FeedConfiguration()
-        self.feeds: Dict[str, Dict[str, Any]] = {}
+        self.state = FeedStateStore()
+        self.http = http_client
         self.session: Optional[aiohttp.ClientSession] = None
-        self.logged_entries: Set[str] = set()
-        self.logged_urls: Set[str] = set()
-        self.semaphore = asyncio.Semaphore(self.config.max_concurrent_feeds)
-        self.rate_limiter = RateLimiter()
+        self.dedup = DedupIndex(window_days=self.config.dedup_window_days)
+        self.near_dups = NearDuplicateIndex(
+            window_hours=self.config.near_dup_window_hours,
+            max_distance=self.config.near_dup_max_distance
+        )
+        self._flush_task: Optional[asyncio.Task] = None
+        self.websub: Optional[WebSubManager] = None
+        self.predictor = PollPredictor(self.config.min_poll_interval, self.config.predictor_max_interval)
+        self.cpu_executor: Optional[ProcessPoolExecutor] = None
+        self.pipeline = self._build_pipeline()
+        self._report_task: Optional[asyncio.Task] = None
+        self.deferred = DeferredQueue()
+        self.prioritizer = EnrichmentPrioritizer(self.config.fast_lane_threshold, self.config.priority_recency_horizon)
+        self._retry_task: Optional[asyncio.Task] = None
         self._on_entry_processed_callbacks: List[Callable] = []
         logger.info("🚀 Initializing FeedWatcher")
 
+    def _build_pipeline(self) -> Pipeline:
+        """Wire the ingestion stages: fetch → parse → dedup → store → scrape → enrich → persist → publish.
+
+        Fetching is driven by the scheduler's workers through poll_feed.
+        New entries are stored and broadcast raw by the store stage, then
+        updated in place once enriched.
+        """
+        pipeline = Pipeline()
+        pipeline.add_stage('fetch')
+        handlers = {
+            'parse': self._parse_stage,
+            'dedup': self._dedup_stage,
+            'store': self._store_stage,
+            'scrape': self._scrape_stage,
+            'enrich': self._enrich_stage,
+            'persist': self._persist_stage,
+            'publish': self._publish_stage
+        }
+        # Scraping and enrichment serve the highest scoring entries first
+        options = {
+            'scrape': {'priority': self._entry_priority},
+            'enrich': {
+                'batch_size': self.config.batch_size,
+                'batch_linger': self.config.batch_linger,
+                'weigh': self._enrich_weight,
+                'batch_budget': self.config.batch_token_budget,
+                'priority': self._entry_priority
+            }
+        }
+        for name, handler in handlers.items():
+            pipeline.add_stage(name, handler, self.config.stage_workers[name], self.config.stage_queue_size,
+                               **options.get(name, {}))
+        return pipeline
+
     def add_entry_processed_callback(self, callback: Callable):
         """Add a callback to be called when an entry is processed."""
         self._on_entry_processed_callbacks.append(callback)
@@ -127,78 +209,120 @@ class FeedWatcher:
                 logger.error(f"Error in entry processed callback: {e}")
 
     async def init(self):
-        """Initialize aiohttp session and logged entries."""
-        if not self.session:
-            # Create a connector with SSL verification disabled
-            connector = aiohttp.TCPConnector(ssl=False)
-            self.session = aiohttp.ClientSession(connector=connector)
-            logger.info("📡 HTTP session initialized with SSL verification disabled")
-        await self._load_logged_entries()
-        logger.info(f"🗄️ Loaded {len(self.logged_entries)} cached entries")
-        
-    async def _load_logged_entries(self):
-        """Load previously processed entries from database."""
-        with get_db() as conn:
-            # Load both messages and URLs
-            cursor = conn.execute('SELECT message, link FROM news_entries')
-            for row in cursor:
-                if row[0]: self.logged_entries.add(row[0])
-                if row[1]: self.logged_urls.add(clean_url(row[1]))
+        """Initialize the shared HTTP session, feed state and dedup index."""
+        self.session = await self.http.session()
+        self.state.load()
+        since = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=self.config.predictor_history_days)
+        self.predictor.load(load_recent_entry_times(since.isoformat()))
+        if self.config.parse_workers and self.cpu_executor is None:
+            self.cpu_executor = ProcessPoolExecutor(max_workers=self.config.parse_workers)
+            logger.info(f"🧮 Feed parsing offloaded to {self.config.parse_workers} worker processes")
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(
+                self.state.run_flusher(self.config.state_flush_interval)
+            )
+        if not self.dedup.generations:
+            self.dedup.load()
+        self.pipeline.start()
+        if self._report_task is None:
+            self._report_task = asyncio.create_task(
+                self.pipeline.run_reporter(self.config.pipeline_report_interval, self.prioritizer.report)
+            )
+        if self._retry_task is None:
+            self._retry_task = asyncio.create_task(self.deferred.run_retrier(
+                self.config.deferred_retry_interval, self.config.batch_size, quota_wait, self._resubmit_deferred
+            ))
+        if self.config.websub_callback_url and self.websub is None:
+            self.websub = websub_manager
+            self.websub.attach(self, self.config.websub_callback_url)
+            await self.websub.start()
 
     async def close(self):
         """Cleanup resources."""
-        if self.session and not self.session.closed:
-            await self.session.close()
-            self.session = None
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        if self.websub:
+            await self.websub.stop()
+            self.websub = None
+        if self._report_task:
+            self._report_task.cancel()
+            self._report_task = None
+        if self._retry_task:
+            self._retry_task.cancel()
+            self._retry_task = None
+        await self.pipeline.stop()
+        self.state.flush()
+        self.dedup.close()
+        if self.cpu_executor:
+            self.cpu_executor.shutdown(wait=False, cancel_futures=True)
+            self.cpu_executor = None
+        extraction_pool.shutdown()
+        await self.http.close()
+        self.session = None
 
     def _update_feed_metrics(self, feed_url: str, had_updates: bool, error: bool = False):
         """Update feed metrics based on check results and source priority."""
-        metrics = get_feed_metrics(feed_url)
+        state = self.state.get(feed_url)
         current_time = datetime.datetime.now(datetime.timezone.utc)
-        source_priority = get_source_priority(feed_url)
+        source_priority = self.state.source_priority(feed_url)
+        priority = source_priority / 100.0  # source_priority ranges from 10 to 100
         
         if error:
-            metrics['consecutive_failures'] += 1
-            metrics['update_frequency'] = min(
-                metrics['update_frequency'] * 2,
+            state.consecutive_failures += 1
+            state.update_frequency = min(
+                state.update_frequency * 2,
                 self.config.max_poll_interval
             )
         else:
             if had_updates:
                 # High priority sources get more frequent updates
-                priority_factor = max(0.2, 1 - (source_priority * 0.2))
-                metrics['update_frequency'] = max(
-                    int(metrics['update_frequency'] * priority_factor),
+                priority_factor = max(0.2, 1 - (priority * 0.2))
+                state.update_frequency = max(
+                    int(state.update_frequency * priority_factor),
                     self.config.min_poll_interval
                 )
-                metrics['consecutive_failures'] = 0
-                metrics['last_success_time'] = current_time
+                state.consecutive_failures = 0
+                state.last_success_time = current_time
             else:
                 # Slower increase for high priority sources
-                increase_factor = 1.2 if source_priority > 0.8 else 1.5
-                metrics['update_frequency'] = min(
-                    int(metrics['update_frequency'] * increase_factor),
+                increase_factor = 1.2 if priority > 0.8 else 1.5
+                state.update_frequency = min(
+                    int(state.update_frequency * increase_factor),
                     self.config.max_poll_interval
                 )
-                metrics['consecutive_failures'] = 0
+                state.consecutive_failures = 0
 
-        metrics['source_priority'] = source_priority
-        update_feed_cache(feed_url, metrics)
-        return metrics['update_frequency']
+        state.source_priority = source_priority
+        self.state.mark_dirty(feed_url)
+        return state.update_frequency
 
     async def check_feed_headers(self, feed_url: str) -> str:
         """Check feed headers for changes using conditional GET."""
+        content, _ = await self.fetch_feed(feed_url)
+        return content
+
+    async def fetch_feed(self, feed_url: str) -> Tuple[str, Optional[ParsedFeed]]:
+        """Fetch a feed with conditional GET, parsing it while the body streams in.
+
+        Reading stops once the parser reaches entries older than the feed's
+        last check or the body exceeds ``max_feed_bytes``. With parse workers
+        on, the event loop only parses the first ``stream_check_entries``
+        entries looking for that stop. Past them the rest of the body is
+        read unparsed and the result is marked partial, for the parse stage
+        to parse in a worker. Returns the body read so far and the parse
+        result, or an empty string if unchanged.
+        """
         if not self.session:
             raise FeedError("Session not initialized")
             
         logger.info(f"🔍 Checking feed: {feed_url}")
-        headers = {}
-        feed_info = self.feeds.get(feed_url, {})
-        
-        if 'etag' in feed_info:
-            headers['If-None-Match'] = feed_info['etag']
-        if 'last_modified' in feed_info:
-            headers['If-Modified-Since'] = feed_info['last_modified']
+        state = self.state.get(feed_url)
+        headers = state.conditional_headers()
 
         max_retries = 3
         retry_delay = 5
@@ -209,23 +333,55 @@ class FeedWatcher:
                     connect=self.config.connect_timeout,
                     total=self.config.total_timeout
                 )
-                async with self.session.get(feed_url, headers=headers, timeout=timeout) as response:
+                # Feeds are fetched without certificate verification, as many publishers misconfigure TLS
+                async with self.http.request('GET', feed_url, headers=headers,
+                                             timeout=timeout, ssl=False) as response:
                     if response.status == 304:  # Not modified
+                        self.state.record_response(feed_url, 304)
                         logger.info(f"📭 No changes in feed: {feed_url}")
-                        return ""
+                        return "", None
                         
                     logger.info(f"📬 Retrieved feed content: {feed_url} (Status: {response.status})")
-                    self.feeds[feed_url] = {
-                        'etag': response.headers.get('ETag'),
-                        'last_modified': response.headers.get('Last-Modified'),
-                        'content_type': response.headers.get('Content-Type', '')
-                    }
+                    # Parsed while streaming, so reading stops at the first already seen entries
+                    parser = StreamingFeedParser(state.last_check)
+                    checking = True
+                    chunks = []
+                    size = 0
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        if size + len(chunk) > self.config.max_feed_bytes:
+                            chunk = chunk[:self.config.max_feed_bytes - size]
+                            parser.result.truncated = True
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if checking and parser.feed(chunk):
+                            logger.info(f"⏹️ Reached previously seen entries after {size} bytes: {feed_url}")
+                            break
+                        if checking and self.cpu_executor is not None \
+                                and parser.result.total_entries >= self.config.stream_check_entries:
+                            # Mostly new entries, so a worker parses the whole body instead
+                            checking = False
+                            parser.result.partial = True
+                        if size >= self.config.max_feed_bytes:
+                            logger.warning(f"✂️ Feed body exceeds {self.config.max_feed_bytes} bytes, truncating: {feed_url}")
+                            break
+                    body = b''.join(chunks)
+                    self.state.record_response(
+                        feed_url,
+                        response.status,
+                        size=len(body),
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified'),
+                        content_type=response.headers.get('Content-Type', '')
+                    )
                     
-                    text = await response.text()
+                    try:
+                        text = body.decode(response.charset or 'utf-8', errors='replace')
+                    except LookupError:
+                        text = body.decode('utf-8', errors='replace')
                     # Check if content was actually received
                     if not text:
                         raise ValueError("Empty response received")
-                    return text
+                    return text, parser.close() if checking else parser.result
                     
             except aiohttp.ClientError as e:
                 if attempt < max_retries - 1:
@@ -235,74 +391,79 @@ class FeedWatcher:
                 else:
                     logger.error(f"Network error checking feed {feed_url} after {max_retries} attempts: {str(e)}")
                     self._update_feed_metrics(feed_url, had_updates=False, error=True)
-                    return ""
+                    return "", None
             except Exception as e:
                 logger.error(f"Unexpected error checking feed {feed_url}: {str(e)}")
                 self._update_feed_metrics(feed_url, had_updates=False, error=True)
-                return ""
+                return "", None
 
-        return ""
+        return "", None
 
-    async def process_entry(self, entry: FeedEntry) -> Optional[datetime.datetime]:
-        """Process a single feed entry."""
-        async with self.semaphore:
-            try:
-                logger.info(f"🔄 Processing entry from: {entry.feed_url}")
-                result = await asyncio.wait_for(
-                    process_article(entry.entry), 
-                    timeout=self.config.process_timeout
-                )
-                
-                if result:
-                    # Check both content and URL for duplicates, including in database
-                    clean_link = clean_url(result.link)
-                    is_duplicate = (
-                        result.combined in self.logged_entries or 
-                        (clean_link and (clean_link in self.logged_urls or exists_in_db(clean_link)))
-                    )
-                    
-                    if not is_duplicate:
-                        logger.info(f"📝 New unique entry found: {result.title}")
-                        await self._store_entry(entry, result)
-                        await self._notify_entry_processed(entry, result)
-                        self.logged_entries.add(result.combined)
-                        if clean_link:
-                            self.logged_urls.add(clean_link)
-                        
-                        # Broadcast update to web clients
-                        news_item = {
-                            'title': result.title,
-                            'description': result.description,
-                            'link': result.link,
-                            'image_url': result.image_url,
-                            'timestamp': entry.entry_time.isoformat(),
-                            'emoji1': result.emoji1,
-                            'emoji2': result.emoji2,
-                            'feed_url': entry.feed_url
-                        }
-                        await broadcast_news_update(news_item)
-                        
-                        return entry.entry_time
-                    else:
-                        logger.info(f"🔄 Duplicate entry skipped: {result.title}")
-                return None
-            except asyncio.TimeoutError:
-                logger.warning(f"⚠️ Timeout processing entry from {entry.feed_url}")
-                return None
-            except Exception as e:
-                logger.error(f"❌ Error processing entry: {e}\nTraceback:\n{traceback.format_exc()}")
-                return None
+    def _entry_identity(self, entry: FeedEntry) -> Dict[str, str]:
+        """Identifiers of a raw entry used by the pre-AI dedup gate."""
+        if not isinstance(entry.entry, EntryRecord):
+            entry.entry = ArticleProcessor.prepare_entry(entry.entry)
+        record = entry.entry
+        return {
+            'link': clean_url(record.link),
+            'feed_url': entry.feed_url,
+            'guid': record.guid,
+            'entry_hash': entry_fingerprint(record.title, record.description)
+        }
+
+    def _is_known_entry(self, entry: FeedEntry) -> bool:
+        """Check a raw entry against the dedup index before any scraping or AI work."""
+        if self.dedup.seen(**self._entry_identity(entry)):
+            self.state.record_duplicate(entry.feed_url)
+            logger.info(f"⏭️ Skipping already stored entry: {entry.entry.title}")
+            return True
+        return False
+
+    def _remember_entry(self, entry: FeedEntry, result):
+        """Add a stored entry's identifiers to the dedup index."""
+        identity = self._entry_identity(entry)
+        identity['link'] = clean_url(result.link) or identity['link']
+        self.dedup.add(message=result.message, **identity)
+
+    @staticmethod
+    def _story_text(entry: FeedEntry) -> str:
+        return f"{entry.entry.title}\n{entry.entry.description}"
+
+    def _reuse_near_duplicate(self, entry: FeedEntry) -> Optional[ProcessedContent]:
+        """Reuse the AI results of a recently processed copy of the same story."""
+        previous = self.near_dups.find(self._story_text(entry))
+        if previous is None:
+            return None
+        logger.info(
+            f"♻️ Reusing AI results of near-duplicate story: {entry.entry.title} "
+            f"(hit rate {self.near_dups.hit_rate:.0%})"
+        )
+        return ArticleProcessor.reuse_result(entry.entry, previous)
 
-    async def _store_entry(self, entry: FeedEntry, result):
-        """Store processed entry in database."""
+    async def _process_with_ai(self, entries: List[FeedEntry]) -> List[Optional[ProcessedContent]]:
+        # Backlog batches only get quota that fast lane calls leave over
+        priority = 0 if any(entry.lane == FAST for entry in entries) else 1
+        results = await asyncio.wait_for(
+            process_articles([(entry.entry, entry.article_data) for entry in entries], priority),
+            timeout=self.config.process_timeout * len(entries)
+        )
+        for entry, result in zip(entries, results):
+            if result:
+                self.near_dups.add(self._story_text(entry), result)
+        return results
+
+    async def _store_entry(self, entry: FeedEntry, result) -> int:
+        """Store an entry in the database and return its article id."""
+        identity = self._entry_identity(entry)
         try:
             with get_db() as conn:
                 # Insert article
                 cursor = conn.execute('''
                     INSERT INTO news_entries 
                     (message, pub_date, processed_date, feed_url, title, description, 
-                     link, image_url, content, emoji1, emoji2, sentiment_score, bias_category, bias_score)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                     link, image_url, content, emoji1, emoji2, sentiment_score, bias_category, bias_score,
+                     content_hash, guid, entry_hash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ''', (
                     result.message,
                     entry.entry_time.isoformat(),
@@ -317,94 +478,103 @@ class FeedWatcher:
                     result.emoji2,
                     result.sentiment_score,
                     result.bias_category,
-                    result.bias_score
+                    result.bias_score,
+                    content_hash(result.message),
+                    identity['guid'] or None,
+                    identity['entry_hash']
                 ))
                 article_id = cursor.lastrowid
-
-                # Add tags
-                for tag in result.topic_tags:
-                    tag_id = add_tag(tag, 'topic')
-                    tag_article(article_id, [tag_id])
-                    
-                for tag in result.geography_tags:
-                    tag_id = add_tag(tag, 'geography')
-                    tag_article(article_id, [tag_id])
-                    
-                for tag in result.event_tags:
-                    tag_id = add_tag(tag, 'event')
-                    tag_article(article_id, [tag_id])
+                self._tag_entry(article_id, result)
                 
                 conn.commit()
+                self.state.record_entry(entry.feed_url, entry.entry_time)
                 logger.info(f"✅ Stored entry: {result.title}")
+                return article_id
                 
         except Exception as e:
             logger.error(f"❌ Error storing entry: {e}\nTraceback:\n{traceback.format_exc()}")
             raise
 
-    async def process_entry_batch(self, entries: List[FeedEntry]) -> List[Optional[datetime.datetime]]:
-        """Process a batch of feed entries with rate limiting."""
-        results = []
-        for entry in entries:
-            try:
-                await self.rate_limiter.acquire()
-                logger.info(f"🔄 Processing entry from: {entry.feed_url}")
-                
-                result = await asyncio.wait_for(
-                    process_article(entry.entry),
-                    timeout=self.config.process_timeout
-                )
-                
-                if not result:
-                    logger.warning(f"❌ Entry processing failed or returned None: {getattr(entry.entry, 'title', 'Unknown title')}")
-                    results.append(None)
-                    continue
-                
-                clean_link = clean_url(result.link)
-                is_content_duplicate = result.combined in self.logged_entries
-                is_url_duplicate = clean_link and (clean_link in self.logged_urls or exists_in_db(clean_link))
-                
-                if is_content_duplicate:
-                    logger.info(f"🔄 Duplicate content detected: {result.title}")
-                    results.append(None)
-                elif is_url_duplicate:
-                    logger.info(f"🔄 Duplicate URL detected: {result.link}")
-                    results.append(None)
-                else:
-                    logger.info(f"📝 New unique entry found: {result.title}")
-                    await self._store_entry(entry, result)
-                    await self._notify_entry_processed(entry, result)
-                    self.logged_entries.add(result.combined)
-                    if clean_link:
-                        self.logged_urls.add(clean_link)
-                    results.append(entry.entry_time)
-                    
-            except asyncio.TimeoutError:
-                logger.warning(f"⚠️ Timeout processing entry from {entry.feed_url}")
-                results.append(None)
-            except Exception as e:
-                logger.error(f"❌ Error processing entry from {entry.feed_url}: {str(e)}")
-                results.append(None)
-                
-        return results
+    async def _update_entry(self, entry: FeedEntry, result: ProcessedContent) -> Optional[int]:
+        """Fill a stored raw entry in with its AI results. Returns its article id, or None if it is not stored."""
+        try:
+            with get_db() as conn:
+                conn.execute('''
+                    UPDATE news_entries SET
+                    message = ?, processed_date = ?, title = ?, description = ?, emoji1 = ?, emoji2 = ?,
+                    sentiment_score = ?, bias_category = ?, bias_score = ?, content_hash = ?
+                    WHERE link = ?
+                ''', (
+                    result.message,
+                    datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                    result.title,
+                    result.description,
+                    result.emoji1,
+                    result.emoji2,
+                    result.sentiment_score,
+                    result.bias_category,
+                    result.bias_score,
+                    content_hash(result.message),
+                    result.link
+                ))
+                row = conn.execute('SELECT id FROM news_entries WHERE link = ?', (result.link,)).fetchone()
+                if row is None:
+                    return None
+                self._tag_entry(row[0], result)
+                conn.commit()
+                logger.info(f"✨ Enriched entry: {result.title}")
+                return row[0]
 
-    async def process_feed_content(self, feed_url: str, content: str) -> None:
-        """Process feed content if it has changed."""
+        except Exception as e:
+            logger.error(f"❌ Error updating entry: {e}\nTraceback:\n{traceback.format_exc()}")
+            raise
+
+    @staticmethod
+    def _tag_entry(article_id: int, result: ProcessedContent):
+        for tag in result.topic_tags:
+            tag_id = add_tag(tag, 'topic')
+            tag_article(article_id, [tag_id])
+            
+        for tag in result.geography_tags:
+            tag_id = add_tag(tag, 'geography')
+            tag_article(article_id, [tag_id])
+            
+        for tag in result.event_tags:
+            tag_id = add_tag(tag, 'event')
+            tag_article(article_id, [tag_id])
+
+    async def process_feed_content(self, feed_url: str, content: str,
+                                   parsed: Optional[ParsedFeed] = None) -> None:
+        """Queue fetched or pushed feed content for ingestion."""
         if not content:
             self._update_feed_metrics(feed_url, had_updates=False)
             return
-            
+        await self.pipeline.put('parse', (feed_url, content, parsed))
+
+    async def _parse_stage(self, item: Tuple[str, str, Optional[ParsedFeed]]):
+        """Parse feed content and queue entries newer than the last check."""
+        feed_url, content, parsed = item
         logger.info(f"📋 Processing content from: {feed_url}")
-        feed = feedparser.parse(content)
-        if not feed.entries:
+        state = self.state.get(feed_url)
+        if parsed is None or parsed.malformed or parsed.partial:
+            parsed = await self._parse_content(content, state.last_check, parsed is not None and parsed.truncated)
+        elif self.cpu_executor is not None:
+            # The stream stopped early or the feed is short, so only the entry cleaning runs in a worker
+            parsed.entries = await asyncio.get_running_loop().run_in_executor(
+                self.cpu_executor, prepare_entry_records, parsed.entries
+            )
+        if self.websub:
+            self.websub.discover(feed_url, parsed)
+        # Undated entries carry the parse time, which says nothing about the feed's rhythm
+        self.predictor.observe_many(feed_url, [
+            pub_date for i, (_, pub_date) in enumerate(parsed.entries) if i not in parsed.undated
+        ])
+        if not parsed.total_entries:
             logger.info(f"📭 No entries found in feed: {feed_url}")
             self._update_feed_metrics(feed_url, had_updates=False)
             return
-            
-        cache = load_feed_cache()
-        feed_info = cache.get(feed_url, {})
-        last_check = feed_info.get('last_check', datetime.datetime.min.replace(tzinfo=datetime.timezone.utc))
         
-        new_entries = self._get_new_entries(feed, last_check, feed_url)
+        new_entries = [FeedEntry(entry, entry_time, feed_url) for entry, entry_time in parsed.entries]
         if not new_entries:
             logger.info(f"📭 No new entries since last check: {feed_url}")
             self._update_feed_metrics(feed_url, had_updates=False)
@@ -414,142 +584,251 @@ class FeedWatcher:
         new_entries.sort(key=lambda x: x.entry_time, reverse=True)
         new_entries = new_entries[:self.config.max_entries_per_feed]
         
-        logger.info(f"📰 Processing {len(new_entries)} new entries from: {feed_url}")
-        processed_entries = 0
-        new_entry_times = []
-        
-        # Process entries in batches with minimal delay
-        for i in range(0, len(new_entries), self.config.batch_size):
-            batch = new_entries[i:i + self.config.batch_size]
-            results = await self.process_entry_batch(batch)
-            processed_entries += sum(1 for r in results if r is not None)
-            new_entry_times.extend([t for t in results if t is not None])
-            
-            # Reduced delay between batches to 0.5 seconds
-            if i + self.config.batch_size < len(new_entries):
-                await asyncio.sleep(0.5)
-        
-        if new_entry_times:
-            latest = max(new_entry_times)
-            logger.info(f"✅ Successfully processed {processed_entries} entries from: {feed_url}")
-            update_feed_cache(feed_url, {
-                'last_check': latest,
-                'etag': self.feeds.get(feed_url, {}).get('etag'),
-                'last_modified': self.feeds.get(feed_url, {}).get('last_modified')
-            })
-            self._update_feed_metrics(feed_url, had_updates=True)
-
-    def _get_new_entries(self, feed: Any, last_check: datetime.datetime, feed_url: str) -> List[FeedEntry]:
-        """Get new entries from feed that haven't been processed yet."""
-        new_entries = []
-        
-        # Validate and ensure last_check has timezone info
-        if last_check is None:
-            last_check = datetime.datetime.min.replace(tzinfo=timezone.utc)
-        elif last_check.tzinfo is None:
-            last_check = last_check.replace(tzinfo=timezone.utc)
-        
-        for entry in feed.entries:
-            try:
-                # Try different date fields in order of preference
-                pub_date = None
-                
-                # Try standard RSS date formats with error handling
-                if hasattr(entry, 'published') and entry.published:
-                    try:
-                        pub_date = parsedate_to_datetime(entry.published)
-                    except (TypeError, ValueError, AttributeError):
-                        pass
-                
-                if pub_date is None and hasattr(entry, 'updated') and entry.updated:
-                    try:
-                        pub_date = parsedate_to_datetime(entry.updated)
-                    except (TypeError, ValueError, AttributeError):
-                        pass
-                
-                # Try parsed tuples from feedparser
-                if pub_date is None and hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    try:
-                        timestamp = datetime.datetime(*entry.published_parsed[:6])
-                        pub_date = timestamp.replace(tzinfo=timezone.utc)
-                    except (TypeError, ValueError, AttributeError):
-                        pass
-                
-                if pub_date is None and hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    try:
-                        timestamp = datetime.datetime(*entry.updated_parsed[:6])
-                        pub_date = timestamp.replace(tzinfo=timezone.utc)
-                    except (TypeError, ValueError, AttributeError):
-                        pass
-                
-                # If no valid date found, use current time as fallback
-                if pub_date is None:
-                    pub_date = datetime.datetime.now(timezone.utc)
-                    logger.warning(f"No valid date found for entry from {feed_url}, using current time")
-                elif pub_date.tzinfo is None:
-                    # Ensure pub_date has timezone info
-                    pub_date = pub_date.replace(tzinfo=timezone.utc)
-                
-                # Double check we have a valid datetime before comparing
-                if isinstance(pub_date, datetime.datetime) and isinstance(last_check, datetime.datetime):
-                    if pub_date > last_check:
-                        new_entries.append(FeedEntry(entry, pub_date, feed_url))
-                else:
-                    logger.warning(f"Invalid date comparison skipped for {feed_url}: pub_date={pub_date}, last_check={last_check}")
-                    
-            except Exception as e:
-                logger.warning(f"Error parsing entry date from {feed_url}: {e}")
+        logger.info(f"📰 Queueing {len(new_entries)} new entries from: {feed_url}")
+        state.last_check = new_entries[0].entry_time
+        self._update_feed_metrics(feed_url, had_updates=True)
+        for entry in new_entries:
+            await self.pipeline.put('dedup', entry)
+
+    async def _dedup_stage(self, entry: FeedEntry):
+        """Drop stored entries and short-cut near-duplicates of processed stories."""
+        if self._is_known_entry(entry):
+            return
+        self._prioritize(entry)
+        result = self._reuse_near_duplicate(entry)
+        if result is not None:
+            await self.pipeline.put('persist', (entry, result))
+        else:
+            await self.pipeline.put('store', entry)
+
+    async def _store_stage(self, entry: FeedEntry):
+        """Store and broadcast the raw entry so it is visible before any scraping or AI work."""
+        if self._is_known_entry(entry):
+            return
+        preview = preview_result(entry.entry)
+        # Until persisted, the entry is leased in the deferred queue so a restart picks it up again
+        self.deferred.track([entry])
+        entry.article_id = await self._store_entry(entry, preview)
+        entry.stored = True
+        self._remember_entry(entry, preview)
+        await broadcast_news_update(self._news_item(entry, preview))
+        await self.pipeline.put('scrape', entry)
+
+    async def _scrape_stage(self, entry: FeedEntry):
+        """Fetch the full article ahead of the model call."""
+        try:
+            # An empty dict marks a failed scrape so enrichment does not retry it
+            entry.article_data = await scrape_article(entry.entry.link) or {}
+        except Exception as e:
+            logger.error(f"Error scraping {entry.entry.link}: {e}")
+            self._retry_failed([entry])
+            return
+        await self.pipeline.put('enrich', entry)
+
+    def _prioritize(self, entry: FeedEntry):
+        """Score an entry for enrichment by recency, source priority and breaking-news keywords."""
+        entry.score = self.prioritizer.score(
+            entry.entry.title, entry.entry.description, entry.entry_time,
+            self.state.source_priority(entry.feed_url)
+        )
+        entry.lane = self.prioritizer.lane(entry.score)
+
+    @staticmethod
+    def _entry_priority(entry: FeedEntry) -> float:
+        return -entry.score
+
+    @staticmethod
+    def _enrich_weight(entry: FeedEntry) -> int:
+        """Estimated prompt tokens an entry adds to an enrich batch."""
+        text = (entry.article_data or {}).get('text') or entry.entry.description
+        return estimate_tokens(text)
+
+    async def _enrich_stage(self, entries: List[FeedEntry]):
+        """Run AI processing for a batch of entries, highest scoring first.
+
+        Short quota waits are awaited per model call. When quota is further
+        off, the API reports it exhausted or the batch times out, the batch
+        is parked in the deferred queue and the worker moves on.
+        """
+        wait = quota_wait()
+        if wait > self.config.quota_defer_after:
+            self._defer(entries, wait)
+            return
+        logger.info(f"🔄 Processing {len(entries)} entries from: {', '.join({e.feed_url for e in entries})}")
+        try:
+            results = await self._process_with_ai(entries)
+        except QuotaExhausted:
+            self._defer(entries, quota_wait())
+            return
+        except asyncio.TimeoutError:
+            # Usually workers queued behind the quota limiter, so the batch is kept for later
+            logger.warning(f"⚠️ Timeout processing {len(entries)} entries")
+            self._defer(entries, quota_wait())
+            return
+        except Exception as e:
+            logger.error(f"Error processing {len(entries)} entries: {e}")
+            self._retry_failed(entries)
+            return
+        now = time.monotonic()
+        failed = []
+        for entry, result in zip(entries, results):
+            if not result:
+                logger.warning(f"❌ Entry processing failed or returned None: {entry.entry.title}")
+                failed.append(entry)
                 continue
-                
-        return new_entries
+            self.prioritizer.record(entry.lane, now - entry.queued)
+            await self.pipeline.put('persist', (entry, result))
+        self._retry_failed(failed)
+
+    def _defer(self, entries: List[FeedEntry], wait: float):
+        """Park entries until API quota is available again."""
+        self.deferred.park(entries, wait)
+        logger.warning(f"⏳ Out of API quota for {wait:.0f}s, parked {len(entries)} entries for later")
+
+    def _retry_failed(self, entries: List[FeedEntry]):
+        """Park stored entries whose scrape or enrichment failed, so their preview row is enriched later.
+
+        Parks for lack of quota count towards ``max_enrich_attempts`` too.
+        Past it, an entry is given up on and its row stays a preview.
+        """
+        entries = [entry for entry in entries if entry.stored]
+        retry = [entry for entry in entries if entry.attempts < self.config.max_enrich_attempts]
+        given_up = [entry for entry in entries if entry.attempts >= self.config.max_enrich_attempts]
+        if retry:
+            self.deferred.park(retry, self.config.failed_retry_delay)
+            logger.warning(
+                f"🔁 Enrichment of {len(retry)} stored entries failed, "
+                f"retrying in {self.config.failed_retry_delay / 60:.0f} min"
+            )
+        if given_up:
+            self.deferred.done([entry.entry.link for entry in given_up])
+            for entry in given_up:
+                logger.error(f"❌ Giving up on enriching after {entry.attempts} attempts: {entry.entry.title}")
+
+    async def _resubmit_deferred(self, parked: DeferredEntry):
+        """Queue a parked entry for enrichment again, scraping it first if it never was."""
+        entry = FeedEntry(parked.record, parked.entry_time, parked.feed_url)
+        entry.article_data = parked.article_data
+        entry.deferred = True
+        entry.attempts = parked.attempts
+        entry.stored = True
+        self._prioritize(entry)
+        await self.pipeline.put('enrich' if entry.article_data is not None else 'scrape', entry)
 
-    async def watch_feed(self, feed_url: str) -> None:
-        """Watch a single feed for updates."""
-        consecutive_errors = 0
+    async def _persist_stage(self, item: Tuple[FeedEntry, ProcessedContent]):
+        """Update a stored raw entry with its AI results, or store an entry not stored yet.
+
+        Entries that skipped the store stage are stored unless an
+        equivalent one was stored meanwhile. Stored or parked entries then
+        leave the deferred queue.
+        """
+        entry, result = item
+        tracked = entry.stored or entry.deferred
+        if entry.stored:
+            entry.article_id = await self._update_entry(entry, result)
+            # An entry parked before it was stored has no row to update
+            entry.stored = entry.article_id is not None
+        if not entry.stored:
+            # Check both content and URL for duplicates
+            if self._is_known_entry(entry) or self.dedup.seen(link=clean_url(result.link), message=result.message):
+                logger.info(f"🔄 Duplicate entry skipped: {result.title}")
+                if tracked:
+                    self.deferred.done([entry.entry.link])
+                return
+            logger.info(f"📝 New unique entry found: {result.title}")
+            entry.article_id = await self._store_entry(entry, result)
+        if tracked:
+            self.deferred.done([entry.entry.link])
+        self._remember_entry(entry, result)
+        await self.pipeline.put('publish', (entry, result))
+
+    async def _publish_stage(self, item: Tuple[FeedEntry, ProcessedContent]):
+        """Notify callbacks and web clients of a stored or enriched entry.
+
+        Clients already showing the raw entry get only the enriched fields.
+        """
+        entry, result = item
+        await self._notify_entry_processed(entry, result)
+        if not entry.stored:
+            await broadcast_news_update(self._news_item(entry, result))
+            return
+        await broadcast_news_enriched({
+            'link': result.link,
+            'title': result.title,
+            'description': result.description,
+            'emoji1': result.emoji1,
+            'emoji2': result.emoji2,
+            'sentiment_score': result.sentiment_score,
+            'bias_category': result.bias_category,
+            'bias_score': result.bias_score
+        }, entry.article_id)
+
+    @staticmethod
+    def _news_item(entry: FeedEntry, result: ProcessedContent) -> Dict[str, Any]:
+        return {
+            'title': result.title,
+            'description': result.description,
+            'link': result.link,
+            'image_url': result.image_url,
+            'timestamp': entry.entry_time.isoformat(),
+            'emoji1': result.emoji1,
+            'emoji2': result.emoji2,
+            'feed_url': entry.feed_url
+        }
+
+    async def _parse_content(self, content: str, watermark: Optional[datetime.datetime],
+                             truncated: bool = False) -> ParsedFeed:
+        """Parse feed content, in a worker process when a CPU executor is configured."""
+        if self.cpu_executor is None:
+            return parse_feed(content, watermark=watermark, truncated=truncated)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.cpu_executor, functools.partial(parse_entry_records, content, watermark, truncated=truncated)
+        )
+
+    async def poll_feed(self, feed_url: str) -> bool:
+        """Fetch a feed and hand it to the parse stage. Returns True if content was retrieved.
+
+        Waits while the parse stage is full, which slows fetching when
+        downstream stages fall behind.
+        """
+        async with self.pipeline.track('fetch'):
+            content, parsed = await self.fetch_feed(feed_url)
+        if not content:
+            return False
+        await self.process_feed_content(feed_url, content, parsed)
+        return True
+
+    def next_poll_delay(self, feed_url: str, consecutive_errors: int = 0) -> float:
+        """Compute the delay before the next poll of a feed."""
+        if self.websub and self.websub.is_active(feed_url):
+            # Pushed updates arrive through WebSub; polling is only a safety net
+            return self.config.websub_poll_interval
         max_consecutive_errors = 5
+        state = self.state.get(feed_url)
+        source_priority = state.source_priority
+        poll_interval = state.update_frequency
+        priority_delay = 0.0
+
+        predicted = self.predictor.next_delay(feed_url)
+        if predicted is not None:
+            # Poll around the feed's next expected publication
+            sleep_time = predicted
+        else:
+            # Add priority-based jitter
+            # Higher priority (less frequent source) = less jitter
+            priority_factor = source_priority / 100.0  # Will be between 0.1 and 1.0
+            jitter = random.uniform(-0.3, 0.3) * (1 - priority_factor)  # More jitter for lower priority
+            sleep_time = poll_interval * (1 + jitter)
+
+            # Add priority-based delay
+            # Lower priority = longer delay between checks
+            priority_delay = (100 - source_priority) * 0.01 * poll_interval  # Up to 90% additional delay for lowest priority
         
-        while True:
-            try:
-                # Get current metrics including source priority
-                metrics = get_feed_metrics(feed_url)
-                source_priority = metrics.get('source_priority', 100)
-                
-                content = await self.check_feed_headers(feed_url)
-                
-                if content:
-                    await self.process_feed_content(feed_url, content)
-                    consecutive_errors = 0
-                else:
-                    consecutive_errors += 1
-                
-                # Get updated poll interval
-                metrics = get_feed_metrics(feed_url)
-                poll_interval = metrics['update_frequency']
-                
-                # Add priority-based jitter
-                # Higher priority (less frequent source) = less jitter
-                priority_factor = source_priority / 100.0  # Will be between 0.1 and 1.0
-                jitter = random.uniform(-0.3, 0.3) * (1 - priority_factor)  # More jitter for lower priority
-                sleep_time = poll_interval * (1 + jitter)
-                
-                # Apply exponential backoff for errors
-                if consecutive_errors > max_consecutive_errors:
-                    backoff_multiplier = min(2 ** (consecutive_errors - max_consecutive_errors), 8)
-                    sleep_time *= backoff_multiplier
-                    logger.warning(f"Feed {feed_url} experiencing repeated errors. Backing off for {sleep_time:.1f}s")
-                
-                # Add priority-based delay
-                # Lower priority = longer delay between checks
-                priority_delay = (100 - source_priority) * 0.01 * poll_interval  # Up to 90% additional delay for lowest priority
-                sleep_time += priority_delay
-                
-                await asyncio.sleep(sleep_time)
-                
-            except asyncio.CancelledError:
-                logger.info(f"Feed watcher for {feed_url} cancelled")
-                raise
-            except Exception as e:
-                logger.error(f"Error watching feed {feed_url}: {str(e)}")
-                consecutive_errors += 1
-                backoff_time = self.config.error_backoff_delay * min(2 ** (consecutive_errors - 1), 8)
-                await asyncio.sleep(backoff_time)
\ No newline at end of file
+        # Apply exponential backoff for errors
+        if consecutive_errors > max_consecutive_errors:
+            backoff_multiplier = min(2 ** (consecutive_errors - max_consecutive_errors), 8)
+            sleep_time *= backoff_multiplier
+            logger.warning(f"Feed {feed_url} experiencing repeated errors. Backing off for {sleep_time:.1f}s")
+        
+        return sleep_time + priority_delay
@@ -0,0 +1,117 @@
+"""SimHash index for spotting the same story syndicated across feeds."""
+import hashlib
+import re
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+_WORD = re.compile(r'\w+')
+
+def simhash(text: str, bits: int = 64) -> Tuple[int, int]:
+    """Compute the SimHash of a text over overlapping word pairs.
+
+    Returns the fingerprint and the number of features it was built from.
+    """
+    words = _WORD.findall(text.lower())
+    features = [' '.join(pair) for pair in zip(words, words[1:])] or words
+    weights = [0] * bits
+    for feature in features:
+        value = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=bits // 8).digest(), 'little')
+        for i in range(bits):
+            weights[i] += 1 if value >> i & 1 else -1
+    fingerprint = sum(1 << i for i, weight in enumerate(weights) if weight > 0)
+    return fingerprint, len(features)
+
+class NearDuplicateIndex:
+    """Recent SimHash fingerprints mapped to the AI results they produced.
+
+    Fingerprints are split into ``max_distance + 1`` bands; two fingerprints
+    within ``max_distance`` bits of each other must agree on at least one
+    band, so only entries sharing a band are compared. Entries older than
+    ``window_hours`` are dropped.
+    """
+
+    BITS = 64
+
+    def __init__(self, window_hours: float = 24, max_distance: int = 5, min_features: int = 8):
+        self.window = window_hours * 3600
+        self.max_distance = max_distance
+        self.min_features = min_features
+        bands = max_distance + 1
+        width = self.BITS // bands
+        self._bands = [
+            (i * width, width if i < bands - 1 else self.BITS - i * width) for i in range(bands)
+        ]
+        self._entries: Deque[Tuple[float, int, int, Any]] = deque()
+        self._buckets: Dict[Tuple[int, int], List[int]] = {}
+        self._results: Dict[int, Tuple[int, Any]] = {}
+        self._next_id = 0
+        self.lookups = 0
+        self.hits = 0
+
+    def _band_keys(self, fingerprint: int):
+        for index, (shift, width) in enumerate(self._bands):
+            yield index, fingerprint >> shift & ((1 << width) - 1)
+
+    def _fingerprint(self, text: str) -> Optional[int]:
+        fingerprint, features = simhash(text, self.BITS)
+        # Very short texts give unstable fingerprints
+        return fingerprint if features >= self.min_features else None
+
+    def _evict(self):
+        cutoff = time.time() - self.window
+        while self._entries and self._entries[0][0] < cutoff:
+            _, entry_id, fingerprint, _ = self._entries.popleft()
+            del self._results[entry_id]
+            for key in self._band_keys(fingerprint):
+                bucket = self._buckets.get(key)
+                if bucket:
+                    bucket.remove(entry_id)
+                    if not bucket:
+                        del self._buckets[key]
+
+    def find(self, text: str) -> Optional[Any]:
+        """Return the result stored for the closest recent near-duplicate of a text."""
+        fingerprint = self._fingerprint(text)
+        if fingerprint is None:
+            return None
+        self._evict()
+        self.lookups += 1
+        best, best_distance = None, self.max_distance + 1
+        for key in self._band_keys(fingerprint):
+            for entry_id in self._buckets.get(key, ()):
+                candidate, result = self._results[entry_id]
+                distance = bin(candidate ^ fingerprint).count('1')
+                if distance < best_distance:
+                    best, best_distance = result, distance
+        if best is not None:
+            self.hits += 1
+        return best
+
+    def add(self, text: str, result: Any):
+        """Remember the result produced for a text."""
+        fingerprint = self._fingerprint(text)
+        if fingerprint is None:
+            return
+        self._evict()
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries.append((time.time(), entry_id, fingerprint, result))
+        self._results[entry_id] = (fingerprint, result)
+        for key in self._band_keys(fingerprint):
+            self._buckets.setdefault(key, []).append(entry_id)
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'entries': len(self),
+            'lookups': self.lookups,
+            'hits': self.hits,
+            'hit_rate': self.hit_rate
+        }
@@ -0,0 +1,180 @@
+"""Staged ingestion pipeline connected by bounded queues."""
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Any], Awaitable[None]]
+
+class Stage:
+    """One pipeline stage: a bounded input queue drained by its own workers.
+
+    Handlers pass work on by putting items into the next stage, so a full
+    downstream queue blocks them and backpressure travels upstream. A stage
+    with no handler is driven externally and only tracked through track().
+
+    With ``batch_size`` above one the handler receives lists of items.
+    A worker waits up to ``batch_linger`` seconds for a batch to fill and
+    stops adding items once their ``weigh`` total would pass ``batch_budget``.
+
+    With a ``priority`` function the queue hands out the item with the
+    lowest priority value first, and items of equal priority in order.
+    """
+
+    def __init__(self, name: str, handler: Optional[Handler] = None, workers: int = 1, queue_size: int = 100,
+                 batch_size: int = 1, batch_linger: float = 0.0,
+                 weigh: Optional[Callable[[Any], float]] = None, batch_budget: Optional[float] = None,
+                 priority: Optional[Callable[[Any], float]] = None):
+        self.name = name
+        self.handler = handler
+        self.workers = workers if handler else 0
+        self.priority = priority
+        self.queue: asyncio.Queue = (asyncio.PriorityQueue if priority else asyncio.Queue)(maxsize=queue_size)
+        self._seq = itertools.count()
+        self.batch_size = batch_size
+        self.batch_linger = batch_linger
+        self.weigh = weigh
+        self.batch_budget = batch_budget
+        self.active = 0
+        self.processed = 0
+        self.errors = 0
+        self.busy_time = 0.0
+
+    @asynccontextmanager
+    async def track(self, count: int = 1):
+        """Count ``count`` units of work done in this stage."""
+        self.active += 1
+        started = time.monotonic()
+        try:
+            yield
+            self.processed += count
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.errors += count
+            raise
+        finally:
+            self.busy_time += time.monotonic() - started
+            self.active -= 1
+
+    async def put(self, item: Any):
+        if self.priority:
+            item = (self.priority(item), next(self._seq), item)
+        await self.queue.put(item)
+
+    async def get(self) -> Any:
+        item = await self.queue.get()
+        return item[2] if self.priority else item
+
+    def get_nowait(self) -> Any:
+        item = self.queue.get_nowait()
+        return item[2] if self.priority else item
+
+    async def _fill_batch(self, first: Any) -> Tuple[List[Any], List[Any]]:
+        """Collect a batch starting with ``first``. Returns the batch and any item held over."""
+        if self.queue.qsize() < self.batch_size - 1 and self.batch_linger:
+            await asyncio.sleep(self.batch_linger)
+        batch = [first]
+        weight = self.weigh(first) if self.weigh else 0.0
+        while len(batch) < self.batch_size:
+            try:
+                item = self.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            item_weight = self.weigh(item) if self.weigh else 0.0
+            if self.batch_budget is not None and weight + item_weight > self.batch_budget:
+                return batch, [item]
+            batch.append(item)
+            weight += item_weight
+        return batch, []
+
+    async def _worker(self):
+        held: List[Any] = []
+        while True:
+            item = held.pop() if held else await self.get()
+            count = 1
+            if self.batch_size > 1:
+                item, held = await self._fill_batch(item)
+                count = len(item)
+            try:
+                async with self.track(count):
+                    await self.handler(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Error in {self.name} stage: {e}")
+            finally:
+                for _ in range(count):
+                    self.queue.task_done()
+
+    def stats(self, uptime: float) -> Dict[str, float]:
+        return {
+            'workers': self.workers,
+            'queue_depth': self.queue.qsize(),
+            'queue_size': self.queue.maxsize,
+            'active': self.active,
+            'processed': self.processed,
+            'errors': self.errors,
+            'throughput': self.processed / uptime if uptime else 0.0,
+            'utilization': self.busy_time / (uptime * max(self.workers, 1)) if uptime else 0.0
+        }
+
+class Pipeline:
+    """Ordered set of stages, each with its own worker count and queue bound."""
+
+    def __init__(self):
+        self.stages: Dict[str, Stage] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._started: Optional[float] = None
+
+    def add_stage(self, name: str, handler: Optional[Handler] = None, workers: int = 1,
+                  queue_size: int = 100, **batching) -> Stage:
+        stage = self.stages[name] = Stage(name, handler, workers, queue_size, **batching)
+        return stage
+
+    def start(self):
+        """Start every stage's workers on the running loop."""
+        if self._tasks:
+            return
+        self._started = time.monotonic()
+        for stage in self.stages.values():
+            for _ in range(stage.workers):
+                self._tasks.append(asyncio.create_task(stage._worker()))
+
+    async def put(self, name: str, item: Any):
+        """Queue an item for a stage, waiting while that stage is full."""
+        await self.stages[name].put(item)
+
+    def track(self, name: str):
+        return self.stages[name].track()
+
+    async def join(self):
+        """Wait until every queued item has passed through all stages."""
+        for stage in self.stages.values():
+            await stage.queue.join()
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        uptime = time.monotonic() - self._started if self._started else 0.0
+        return {name: stage.stats(uptime) for name, stage in self.stages.items()}
+
+    async def run_reporter(self, interval: float, *extras: Callable[[], str]):
+        """Log a one-line summary of every stage on an interval, then a line from each of ``extras``."""
+        while True:
+            await asyncio.sleep(interval)
+            summary = ', '.join(
+                f"{name} {stats['processed']} done/{stats['queue_depth']} queued/{stats['throughput'] * 60:.1f} per min"
+                for name, stats in self.stats().items()
+            )
+            logger.info(f"🚦 Pipeline: {summary}")
+            for extra in extras:
+                logger.info(f"🚦 {extra()}")
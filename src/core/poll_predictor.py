@@ -0,0 +1,131 @@
+"""Predicts when feeds publish next so polls can be timed to match."""
+import datetime
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HOUR = datetime.timedelta(hours=1)
+
+def _utc(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc)
+
+class PublishRhythm:
+    """Publication rhythm of one feed.
+
+    Tracks an EWMA of the gap between publications and a decaying
+    histogram of the UTC hour they happen in. The histogram scales the
+    EWMA rate, so a feed that is quiet at night is expected to publish
+    later when its last entry came in the evening.
+    """
+
+    def __init__(self, alpha: float = 0.2, decay: float = 0.98, prior: float = 1.0):
+        self.alpha = alpha
+        self.decay = decay
+        self.prior = prior
+        self.mean_gap: Optional[float] = None
+        self.last_publish: Optional[datetime.datetime] = None
+        self.hours = [0.0] * 24
+        self.observations = 0
+
+    def observe(self, published: datetime.datetime):
+        """Record a publication. Timestamps must arrive in ascending order."""
+        published = _utc(published)
+        if self.last_publish is not None:
+            # Entries sharing a timestamp are one publication event
+            if published <= self.last_publish:
+                return
+            gap = (published - self.last_publish).total_seconds()
+            if self.mean_gap is None:
+                self.mean_gap = gap
+            else:
+                self.mean_gap = self.alpha * gap + (1 - self.alpha) * self.mean_gap
+        self.last_publish = published
+        self.hours = [count * self.decay for count in self.hours]
+        self.hours[published.hour] += 1
+        self.observations += 1
+
+    def hour_weight(self, hour: int) -> float:
+        """Relative publication rate during an hour of the day, averaging 1."""
+        return 24 * (self.hours[hour] + self.prior) / (sum(self.hours) + 24 * self.prior)
+
+    def predict_after(self, start: datetime.datetime, expected: float = 1.0) -> Optional[datetime.datetime]:
+        """Time by which ``expected`` publications are due after ``start``."""
+        if not self.mean_gap:
+            return None
+        rate = 1 / self.mean_gap
+        remaining = expected
+        moment = _utc(start)
+        # Walk hour by hour, accumulating the expected number of publications
+        for _ in range(24 * 30):
+            boundary = moment.replace(minute=0, second=0, microsecond=0) + HOUR
+            hourly_rate = rate * self.hour_weight(moment.hour)
+            in_hour = hourly_rate * (boundary - moment).total_seconds()
+            if in_hour >= remaining:
+                return moment + datetime.timedelta(seconds=remaining / hourly_rate)
+            remaining -= in_hour
+            moment = boundary
+        return moment
+
+    def next_delay(self, now: datetime.datetime, fraction: float = 1.0) -> Optional[float]:
+        """Seconds from ``now`` until the next poll.
+
+        Polls are spaced ``fraction`` of an expected publication apart, so
+        a lower fraction trades requests for detection latency.
+        """
+        predicted = self.predict_after(self.last_publish, fraction) if self.last_publish else None
+        if predicted is None:
+            return None
+        now = _utc(now)
+        if predicted <= now:
+            # Nothing new yet: keep polling at the same spacing from now
+            predicted = self.predict_after(now, fraction)
+        return (predicted - now).total_seconds()
+
+class PollPredictor:
+    """Publication rhythms for all feeds, turned into poll delays."""
+
+    def __init__(self, min_interval: float, max_interval: float, min_observations: int = 5,
+                 poll_fraction: float = 0.25, alpha: float = 0.2, decay: float = 0.98):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.min_observations = min_observations
+        self.poll_fraction = poll_fraction
+        self.alpha = alpha
+        self.decay = decay
+        self._rhythms: Dict[str, PublishRhythm] = {}
+
+    def rhythm(self, feed_url: str) -> PublishRhythm:
+        rhythm = self._rhythms.get(feed_url)
+        if rhythm is None:
+            rhythm = self._rhythms[feed_url] = PublishRhythm(self.alpha, self.decay)
+        return rhythm
+
+    def load(self, rows: Iterable[Tuple[str, str]]):
+        """Learn from stored (feed_url, pub_date) pairs."""
+        history: Dict[str, List[datetime.datetime]] = {}
+        for feed_url, pub_date in rows:
+            try:
+                history.setdefault(feed_url, []).append(_utc(datetime.datetime.fromisoformat(pub_date)))
+            except (TypeError, ValueError):
+                continue
+        for feed_url, timestamps in history.items():
+            self.observe_many(feed_url, timestamps)
+        logger.info(f"⏱️ Learned publication rhythm for {len(history)} feeds")
+
+    def observe_many(self, feed_url: str, timestamps: Iterable[datetime.datetime]):
+        rhythm = self.rhythm(feed_url)
+        for timestamp in sorted(_utc(t) for t in timestamps):
+            rhythm.observe(timestamp)
+
+    def next_delay(self, feed_url: str, now: Optional[datetime.datetime] = None) -> Optional[float]:
+        """Poll delay for a feed, or None while too little history is known."""
+        rhythm = self._rhythms.get(feed_url)
+        if rhythm is None or rhythm.observations < self.min_observations:
+            return None
+        delay = rhythm.next_delay(now or datetime.datetime.now(datetime.timezone.utc), self.poll_fraction)
+        if delay is None:
+            return None
+        return min(max(delay, self.min_interval), self.max_interval)
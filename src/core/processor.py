@@ -1,7 +1,7 @@
 """Core news processing functionality."""
 from datetime import datetime
 import logging
-from typing import Dict, Any, Optional, List, NamedTuple
+from typing import Dict, Any, Optional, List, NamedTuple, Tuple
 import re
 import html
 import urllib.parse
@@ -10,6 +10,8 @@ import feedparser
 from ..database.models import get_db, add_tag, tag_article
 from ..utils.text import clean_text, clean_url
 from ..utils.ai import ContentProcessor
+from ..utils.quota import QuotaExhausted
+from config.settings import AI_MODE
 
 # Configure logging
 logging.basicConfig(
@@ -37,6 +39,15 @@ class ProcessedContent(NamedTuple):
     bias_category: str
     bias_score: float
 
+class EntryRecord(NamedTuple):
+    """Compact, picklable form of a feed entry with its CPU-heavy fields precomputed."""
+    guid: str
+    link: str
+    title: str
+    description: str
+    content: str
+    images: List[str]
+
 class ImageExtractor:
     """Handles extraction of images from feed entries."""
     
@@ -101,32 +112,87 @@ class ImageExtractor:
 class ArticleProcessor:
     """Processes articles from feed entries."""
     
-    def __init__(self):
+    def __init__(self, mode: str = AI_MODE):
         self.image_extractor = ImageExtractor()
         self.content_processor = ContentProcessor()
+        # "enrich" makes one structured model call per article, "legacy" the separate calls
+        self.mode = mode
     
-    async def process_article(self, entry: Any) -> Optional[ProcessedContent]:
-        """Process an article by extracting and formatting information."""
+    @staticmethod
+    def prepare_entry(entry: Any) -> EntryRecord:
+        """Extract images and clean text from a raw feed entry.
+
+        This is the CPU-bound part of article processing and is safe to run
+        in a worker process.
+        """
+        return EntryRecord(
+            guid=getattr(entry, 'id', '') or '',
+            link=clean_url(getattr(entry, 'link', '')),
+            title=ArticleProcessor._clean_html(getattr(entry, 'title', 'Untitled')),
+            description=ArticleProcessor._clean_html(getattr(entry, 'description', '')),
+            content=getattr(entry, 'description', ''),
+            images=ImageExtractor.extract_images(entry)
+        )
+
+    @staticmethod
+    def reuse_result(record: EntryRecord, previous: ProcessedContent) -> ProcessedContent:
+        """Build a result for an entry from the AI output of a near-duplicate story.
+
+        The summary, emojis, tags, sentiment and bias are taken over; the
+        title, link, images and content stay those of the entry itself.
+        """
+        message = f"{previous.emoji1}{previous.emoji2}: {record.title}"
+        combined = (
+            f"{previous.emoji1}{previous.emoji2}: **{record.title}**\n\n"
+            f"{previous.description}\n\n"
+            f"[Read More]({record.link})"
+        )
+        return previous._replace(
+            message=message,
+            title=record.title,
+            link=record.link,
+            images=record.images,
+            combined=combined,
+            image_url=record.images[0] if record.images else None,
+            content=record.content
+        )
+
+    def preview_result(self, record: EntryRecord) -> ProcessedContent:
+        """Result for an entry before AI processing, from its cleaned feed text.
+
+        Emojis are guessed from the title; tags are empty and the sentiment
+        and bias fields stay None until enrichment fills them in.
+        """
+        return self._build_result(record, record.title, record.description, '', '', [], [], [], None, None, None)
+
+    async def process_article(self, entry: Any, article_data: Optional[Dict[str, Any]] = None) -> Optional[ProcessedContent]:
+        """Process an article from a raw feed entry or a prepared EntryRecord.
+
+        ``article_data`` is the already scraped article, if a scrape stage ran ahead.
+        Raises QuotaExhausted if the API is out of quota, so the caller can retry later.
+        """
         try:
-            # Extract images with improved method
-            images = self.image_extractor.extract_images(entry)
+            record = entry if isinstance(entry, EntryRecord) else self.prepare_entry(entry)
             
-           # Get article link
-            link = clean_url(getattr(entry, 'link', ''))
+            # Get article link
+            link = record.link
             if not link:
                 logger.error("No valid link found in entry")
                 return None
             
-            # Initial cleaning
-            title_cleaned = self._clean_html(getattr(entry, 'title', 'Untitled'))
-            description_cleaned = self._clean_html(getattr(entry, 'description', ''))
+            title_cleaned = record.title
+            description_cleaned = record.description
+
+            if self.mode == 'enrich':
+                return await self._process_enriched(record, article_data)
             
             # Process with AI and get tags
             emojis, description_processed, topics, geography, events = await self.content_processor.process_content_with_tags(
                 description_cleaned, 
                 url=link,
                 is_title=False,
-                instruction="Summarize in clear English, focusing on key points."
+                instruction="Summarize in clear English, focusing on key points.",
+                article_data=article_data
             )
 
             # Process title and get additional tags
@@ -134,7 +200,8 @@ class ArticleProcessor:
                 title_cleaned,
                 url=link,
                 is_title=True,
-                instruction="Translate to clear English title if needed."
+                instruction="Translate to clear English title if needed.",
+                article_data=article_data
             )
 
             # Get sentiment and bias analysis
@@ -145,46 +212,105 @@ class ArticleProcessor:
             geography_tags = list(set(geography + title_geo))
             event_tags = list(set(events + title_events))
 
-            # Process emojis and content
-            content = getattr(entry, 'description', '')
             emoji1, emoji2 = self._split_emojis(emojis)
-            if not emoji1 or len(emoji1) > 4:
-                emoji1 = self._detect_location(title_cleaned) or '🌎'
-            if not emoji2 or len(emoji2) > 4:
-                emoji2 = self._detect_topic(title_cleaned) or '📰'
-
-            # Format for output
-            message = f"{emoji1}{emoji2}: {title_processed}"
-            combined = (
-                f"{emoji1}{emoji2}: **{title_processed}**\n\n"
-                f"{description_processed}\n\n"
-                f"[Read More]({link})"
-            )
-
-            return ProcessedContent(
-                message=message,
-                title=title_processed,
-                description=description_processed,
-                link=link,
-                images=images,
-                combined=combined,
-                emoji1=emoji1,
-                emoji2=emoji2,
-                image_url=images[0] if images else None,
-                content=content,
-                topic_tags=topic_tags,
-                geography_tags=geography_tags,
-                event_tags=event_tags,
-                sentiment_score=sentiment_score,
-                bias_category=bias_category,
-                bias_score=bias_score
+            return self._build_result(
+                record, title_processed, description_processed, emoji1, emoji2,
+                topic_tags, geography_tags, event_tags, sentiment_score, bias_category, bias_score
             )
             
+        except QuotaExhausted:
+            raise
         except Exception as e:
             logger.error(f"Error processing article: {e}")
             return None
 
-    def _clean_html(self, text: str) -> str:
+    async def process_articles(self, items: List[Tuple[Any, Optional[Dict[str, Any]]]],
+                               priority: int = 0) -> List[Optional[ProcessedContent]]:
+        """Process several (entry, article_data) pairs, sharing one model call in enrich mode.
+
+        In enrich mode ``priority`` orders the model call's wait for quota, lower first.
+        """
+        if self.mode != 'enrich':
+            return [await self.process_article(entry, article_data) for entry, article_data in items]
+        records = [entry if isinstance(entry, EntryRecord) else self.prepare_entry(entry) for entry, _ in items]
+        batch = [i for i, record in enumerate(records) if record.link]
+        results: List[Optional[ProcessedContent]] = [None] * len(items)
+        enriched = await self.content_processor.enrich_batch([
+            {
+                'title': records[i].title,
+                'description': records[i].description,
+                'url': records[i].link,
+                'article_data': items[i][1]
+            }
+            for i in batch
+        ], priority) if batch else []
+        for i, fields in zip(batch, enriched):
+            if fields is not None:
+                results[i] = self._from_enrichment(records[i], fields)
+        return results
+
+    def quota_wait(self) -> float:
+        """Seconds until the model this processor calls has API quota again."""
+        content_processor = self.content_processor
+        return content_processor.quota.wait_time(
+            content_processor.enrich_model if self.mode == 'enrich' else content_processor.model
+        )
+
+    async def _process_enriched(self, record: EntryRecord, article_data: Optional[Dict[str, Any]]) -> Optional[ProcessedContent]:
+        """Process an article with a single structured enrich call."""
+        enriched = await self.content_processor.enrich(
+            record.title, record.description, record.link, article_data
+        )
+        if enriched is None:
+            return None
+        return self._from_enrichment(record, enriched)
+
+    def _from_enrichment(self, record: EntryRecord, enriched: Dict[str, Any]) -> ProcessedContent:
+        return self._build_result(
+            record, enriched['title'], enriched['summary'],
+            enriched['emoji_location'], enriched['emoji_topic'],
+            enriched['topics'], enriched['geography'], enriched['events'],
+            enriched['sentiment'], enriched['bias_category'], enriched['bias_score']
+        )
+
+    def _build_result(self, record: EntryRecord, title: str, description: str, emoji1: str, emoji2: str,
+                      topic_tags: List[str], geography_tags: List[str], event_tags: List[str],
+                      sentiment_score: float, bias_category: str, bias_score: float) -> ProcessedContent:
+        """Assemble the output of AI processing into a ProcessedContent."""
+        if not emoji1 or len(emoji1) > 4:
+            emoji1 = self._detect_location(record.title) or '🌎'
+        if not emoji2 or len(emoji2) > 4:
+            emoji2 = self._detect_topic(record.title) or '📰'
+
+        # Format for output
+        message = f"{emoji1}{emoji2}: {title}"
+        combined = (
+            f"{emoji1}{emoji2}: **{title}**\n\n"
+            f"{description}\n\n"
+            f"[Read More]({record.link})"
+        )
+
+        return ProcessedContent(
+            message=message,
+            title=title,
+            description=description,
+            link=record.link,
+            images=record.images,
+            combined=combined,
+            emoji1=emoji1,
+            emoji2=emoji2,
+            image_url=record.images[0] if record.images else None,
+            content=record.content,
+            topic_tags=topic_tags,
+            geography_tags=geography_tags,
+            event_tags=event_tags,
+            sentiment_score=sentiment_score,
+            bias_category=bias_category,
+            bias_score=bias_score
+        )
+
+    @staticmethod
+    def _clean_html(text: str) -> str:
         """Deep clean HTML while preserving certain entities."""
         if not text:
             return ""
@@ -267,4 +393,7 @@ class ArticleProcessor:
 
 # Create singleton instance
 processor = ArticleProcessor()
-process_article = processor.process_article
\ No newline at end of file
+process_article = processor.process_article
+process_articles = processor.process_articles
+preview_result = processor.preview_result
+quota_wait = processor.quota_wait
\ No newline at end of file
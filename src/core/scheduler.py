@@ -0,0 +1,149 @@
+"""Central poll scheduler for feed watching."""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class FeedScheduler:
+    """Drives feed polling from a single heap keyed by next-due time.
+
+    A dispatcher pops feeds as they become due and hands them to a bounded
+    pool of fetch workers, so global fetch concurrency is capped at
+    ``max_workers`` no matter how many feeds are registered.
+    """
+
+    def __init__(self, watcher, max_workers: Optional[int] = None, startup_spread: Optional[float] = None):
+        self.watcher = watcher
+        self.max_workers = max_workers or watcher.config.max_concurrent_feeds
+        self.startup_spread = (
+            startup_spread if startup_spread is not None else watcher.config.startup_spread
+        )
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._counter = itertools.count()
+        self._errors: Dict[str, int] = {}
+        # Registration each feed is on; heap entries from an earlier one are stale
+        self._generations: Dict[str, int] = {}
+        self._ready: Optional[asyncio.Queue] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.in_flight = 0
+        self.polls_completed = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def add_feed(self, feed_url: str, delay: float = 0.0):
+        """Register a feed and schedule its first poll after ``delay`` seconds."""
+        if feed_url in self._errors:
+            return
+        self._errors[feed_url] = 0
+        self._generations[feed_url] = next(self._counter)
+        self.schedule(feed_url, delay)
+
+    def add_feeds(self, feed_urls: Iterable[str]):
+        """Register feeds with first polls spread evenly over the startup window."""
+        urls = [url for url in dict.fromkeys(feed_urls) if url not in self._errors]
+        for i, url in enumerate(urls):
+            self.add_feed(url, delay=self.startup_spread * i / max(len(urls), 1))
+
+    def remove_feed(self, feed_url: str):
+        """Stop polling a feed. Its pending heap entry is dropped lazily."""
+        self._errors.pop(feed_url, None)
+        self._generations.pop(feed_url, None)
+
+    def schedule(self, feed_url: str, delay: float):
+        """Schedule the next poll of a feed ``delay`` seconds from now."""
+        due = time.monotonic() + max(delay, 0.0)
+        heapq.heappush(self._heap, (due, next(self._counter), feed_url, self._generations[feed_url]))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def stats(self) -> Dict[str, float]:
+        """Return queue depth and lag figures for monitoring."""
+        now = time.monotonic()
+        overdue = sum(1 for due, *_ in self._heap if due <= now)
+        ready = self._ready.qsize() if self._ready is not None else 0
+        return {
+            'feeds': len(self._errors),
+            'scheduled': len(self._heap),
+            'queue_depth': overdue + ready,
+            'in_flight': self.in_flight,
+            'polls_completed': self.polls_completed,
+            'last_lag': self.last_lag,
+            'max_lag': self.max_lag
+        }
+
+    async def run(self):
+        """Run the dispatcher and worker pool until cancelled."""
+        self._ready = asyncio.Queue(maxsize=self.max_workers)
+        self._wakeup = asyncio.Event()
+        workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+        logger.info(f"⏱️ Scheduler started: {len(self._errors)} feeds, {self.max_workers} workers")
+        try:
+            await self._dispatch()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _dispatch(self):
+        """Pop due feeds off the heap and hand them to the workers."""
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            due, _, feed_url, generation = self._heap[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            if not self._is_current(feed_url, generation):
+                continue
+            # Blocks while all workers are busy, so the heap absorbs the backlog
+            await self._ready.put((due, feed_url, generation))
+
+    async def _worker(self):
+        """Poll feeds handed over by the dispatcher and reschedule them."""
+        while True:
+            due, feed_url, generation = await self._ready.get()
+            self.last_lag = max(time.monotonic() - due, 0.0)
+            self.max_lag = max(self.max_lag, self.last_lag)
+            self.in_flight += 1
+            try:
+                delay = await self._poll(feed_url, generation)
+            finally:
+                self.in_flight -= 1
+                self.polls_completed += 1
+                self._ready.task_done()
+            if self._is_current(feed_url, generation):
+                self.schedule(feed_url, delay)
+
+    def _is_current(self, feed_url: str, generation: int) -> bool:
+        """Whether a feed is still registered under the given registration."""
+        return self._generations.get(feed_url) == generation
+
+    async def _poll(self, feed_url: str, generation: int) -> float:
+        """Poll a feed once and return the delay until its next poll."""
+        errors = self._errors.get(feed_url, 0)
+        try:
+            errors = 0 if await self.watcher.poll_feed(feed_url) else errors + 1
+            return self.watcher.next_poll_delay(feed_url, errors)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error polling feed {feed_url}: {str(e)}")
+            errors += 1
+            return self.watcher.config.error_backoff_delay * min(2 ** (errors - 1), 8)
+        finally:
+            if self._is_current(feed_url, generation):
+                self._errors[feed_url] = errors
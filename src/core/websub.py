@@ -0,0 +1,206 @@
+"""WebSub (PubSubHubbub) subscriptions for push delivery of hub-enabled feeds."""
+import asyncio
+import hashlib
+import hmac
+import logging
+import secrets
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Set
+from urllib.parse import quote
+
+import aiohttp
+
+from ..utils.http import http_client
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Subscription:
+    """A subscription to one feed topic at its hub."""
+    feed_url: str
+    hub: str
+    topic: str
+    token: str
+    secret: str
+    state: str = 'pending'  # pending, active, denied or failed
+    requested: float = 0.0
+    lease_expires: float = 0.0
+    deliveries: int = 0
+
+class WebSubManager:
+    """Subscribes hub-enabled feeds and hands pushed content to the feed watcher.
+
+    A subscription is requested when a fetched feed advertises a hub and
+    becomes active once the hub verifies the callback. The watcher polls
+    active feeds only at its safety-net interval. Hubs discovered in earlier
+    runs are resubscribed on start, and leases are renewed before expiry.
+    """
+
+    # Seconds before retrying a subscription that was never verified
+    RETRY_AFTER = 3600
+    # Seconds before lease expiry at which a subscription is renewed
+    RENEW_MARGIN = 3600
+
+    def __init__(self, lease_seconds: int = 86400 * 5, renew_interval: float = 300.0):
+        self.lease_seconds = lease_seconds
+        self.renew_interval = renew_interval
+        self.http = http_client
+        self.watcher: Any = None
+        self.callback_url: Optional[str] = None
+        self._subscriptions: Dict[str, Subscription] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._renew_task: Optional[asyncio.Task] = None
+
+    def attach(self, watcher: Any, callback_url: str):
+        """Deliver pushed content to ``watcher``, with callbacks under ``callback_url``."""
+        self.watcher = watcher
+        self.callback_url = callback_url.rstrip('/')
+
+    async def start(self):
+        """Resubscribe feeds with a known hub and start lease renewal."""
+        for state in self.watcher.state:
+            if state.hub_url:
+                self._spawn(self.subscribe(state.url, state.hub_url, state.topic_url or state.url))
+        if self._renew_task is None:
+            self._renew_task = asyncio.create_task(self.run_renewals())
+
+    async def stop(self):
+        tasks = list(self._tasks)
+        if self._renew_task:
+            tasks.append(self._renew_task)
+            self._renew_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _spawn(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    def token(feed_url: str) -> str:
+        """Stable callback token for a feed, so callbacks survive restarts."""
+        return hashlib.sha256(feed_url.encode('utf-8')).hexdigest()[:32]
+
+    def callback_for(self, token: str) -> str:
+        return f"{self.callback_url}/{quote(token)}"
+
+    def discover(self, feed_url: str, parsed) -> None:
+        """Record the hub advertised by a parsed feed and subscribe if needed."""
+        if not parsed.hub or not self.callback_url:
+            return
+        topic = parsed.self_url or feed_url
+        state = self.watcher.state.get(feed_url)
+        if state.hub_url != parsed.hub or state.topic_url != topic:
+            state.hub_url = parsed.hub
+            state.topic_url = topic
+            self.watcher.state.mark_dirty(feed_url)
+        subscription = self._subscriptions.get(self.token(feed_url))
+        if subscription and subscription.hub == parsed.hub and subscription.topic == topic and (
+            subscription.state == 'active' or time.time() - subscription.requested < self.RETRY_AFTER
+        ):
+            return
+        self._spawn(self.subscribe(feed_url, parsed.hub, topic))
+
+    async def subscribe(self, feed_url: str, hub: str, topic: str) -> bool:
+        """Send a subscription request to a hub. Returns True if the hub accepted it."""
+        token = self.token(feed_url)
+        subscription = self._subscriptions.get(token)
+        if subscription is None or subscription.hub != hub or subscription.topic != topic:
+            subscription = self._subscriptions[token] = Subscription(
+                feed_url=feed_url, hub=hub, topic=topic, token=token, secret=secrets.token_hex(20)
+            )
+        subscription.requested = time.time()
+        data = {
+            'hub.mode': 'subscribe',
+            'hub.topic': topic,
+            'hub.callback': self.callback_for(token),
+            'hub.secret': subscription.secret,
+            'hub.lease_seconds': str(self.lease_seconds)
+        }
+        try:
+            async with self.http.request('POST', hub, data=data) as response:
+                if response.status in (202, 204):
+                    logger.info(f"📮 Requested WebSub subscription for {feed_url} at {hub}")
+                    return True
+                logger.warning(f"WebSub hub {hub} rejected subscription for {feed_url} (Status: {response.status})")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"WebSub subscription request for {feed_url} failed: {e}")
+        if subscription.state != 'active':
+            subscription.state = 'failed'
+        return False
+
+    def verify(self, token: str, mode: str, topic: str, challenge: Optional[str] = None,
+               lease_seconds: Optional[str] = None) -> Optional[str]:
+        """Answer a hub's intent verification. Returns the response body, or None to refuse."""
+        subscription = self._subscriptions.get(token)
+        if subscription is None or topic != subscription.topic:
+            return None
+        if mode == 'subscribe' and challenge:
+            try:
+                lease = int(lease_seconds) if lease_seconds else self.lease_seconds
+            except ValueError:
+                lease = self.lease_seconds
+            subscription.state = 'active'
+            subscription.lease_expires = time.time() + lease
+            logger.info(f"📬 WebSub subscription active for {subscription.feed_url} ({lease}s lease)")
+            return challenge
+        if mode == 'unsubscribe' and challenge:
+            del self._subscriptions[token]
+            return challenge
+        if mode == 'denied':
+            subscription.state = 'denied'
+            logger.warning(f"WebSub hub denied subscription for {subscription.feed_url}")
+            return ''
+        return None
+
+    @staticmethod
+    def _valid_signature(subscription: Subscription, body: bytes, signature: Optional[str]) -> bool:
+        method, _, digest = (signature or '').partition('=')
+        if method not in ('sha1', 'sha256', 'sha384', 'sha512'):
+            return False
+        expected = hmac.new(subscription.secret.encode('utf-8'), body, method).hexdigest()
+        return hmac.compare_digest(expected, digest)
+
+    def deliver(self, token: str, body: bytes, signature: Optional[str] = None) -> bool:
+        """Accept a pushed feed body. Returns False for an unknown subscription."""
+        subscription = self._subscriptions.get(token)
+        if subscription is None:
+            return False
+        # Unsigned or forged content is acknowledged but dropped, as the spec requires
+        if not self._valid_signature(subscription, body, signature):
+            logger.warning(f"Discarding WebSub delivery with a bad signature for {subscription.feed_url}")
+            return True
+        subscription.deliveries += 1
+        logger.info(f"📨 WebSub delivery for {subscription.feed_url} ({len(body)} bytes)")
+        self._spawn(self.watcher.process_feed_content(
+            subscription.feed_url, body.decode('utf-8', errors='replace')
+        ))
+        return True
+
+    def is_active(self, feed_url: str) -> bool:
+        """Whether a feed currently receives pushed updates."""
+        subscription = self._subscriptions.get(self.token(feed_url))
+        return (subscription is not None and subscription.state == 'active'
+                and subscription.lease_expires > time.time())
+
+    async def run_renewals(self):
+        """Renew active subscriptions shortly before their leases expire."""
+        while True:
+            await asyncio.sleep(self.renew_interval)
+            cutoff = time.time() + self.RENEW_MARGIN
+            for subscription in list(self._subscriptions.values()):
+                if subscription.state == 'active' and subscription.lease_expires < cutoff:
+                    await self.subscribe(subscription.feed_url, subscription.hub, subscription.topic)
+
+    def stats(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for subscription in self._subscriptions.values():
+            counts[subscription.state] = counts.get(subscription.state, 0) + 1
+        counts['deliveries'] = sum(s.deliveries for s in self._subscriptions.values())
+        return counts
+
+# Shared instance used by the feed watcher and the web callback route
+websub_manager = WebSubManager()
@@ -1,5 +1,6 @@
 """Database models and initialization."""
 import sqlite3
+import hashlib
 from contextlib import contextmanager
 from datetime import datetime
 import os
@@ -50,7 +51,17 @@ def init_db(connection=None):
 
     conn.execute('''\n        CREATE TABLE IF NOT EXISTS news_entries (\n            id INTEGER PRIMARY KEY AUTOINCREMENT,\n            message TEXT,\n            pub_date TEXT,\n            processed_date TEXT,\n            feed_url TEXT,\n            title TEXT,\n            description TEXT,\n            link TEXT UNIQUE,\n            image_url TEXT,\n            content TEXT,\n            emoji1 TEXT,\n            emoji2 TEXT,\n            source_priority INTEGER DEFAULT 100,\n            sentiment_score REAL,\n            bias_category TEXT,\n            bias_score REAL\n        )\n    ''')
     
+    _ensure_columns(conn, 'news_entries', {
+        'content_hash': 'TEXT',
+        'guid': 'TEXT',
+        'entry_hash': 'TEXT'
+    })
+    _backfill_content_hashes(conn)
+    
     conn.execute('CREATE INDEX IF NOT EXISTS idx_link ON news_entries(link)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_content_hash ON news_entries(content_hash)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_feed_guid ON news_entries(feed_url, guid)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_entry_hash ON news_entries(entry_hash)')
     conn.execute('CREATE INDEX IF NOT EXISTS idx_feed_url ON news_entries(feed_url)')
     conn.execute('CREATE INDEX IF NOT EXISTS idx_pub_date ON news_entries(pub_date)')
     
@@ -66,6 +77,31 @@ def init_db(connection=None):
             source_priority INTEGER DEFAULT 100
         )
     ''')
+    _ensure_columns(conn, 'feed_cache', {
+        'content_type': 'TEXT',
+        'last_response_size': 'INTEGER DEFAULT 0',
+        'total_bytes': 'INTEGER DEFAULT 0',
+        'fetch_count': 'INTEGER DEFAULT 0',
+        'not_modified_count': 'INTEGER DEFAULT 0',
+        'duplicate_skips': 'INTEGER DEFAULT 0',
+        'hub_url': 'TEXT',
+        'topic_url': 'TEXT'
+    })
+
+    # Entries whose AI processing was refused for lack of API quota
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS deferred_entries (
+            link TEXT PRIMARY KEY,
+            feed_url TEXT,
+            entry_time TEXT,
+            record TEXT,
+            article_data TEXT,
+            attempts INTEGER DEFAULT 1,
+            deferred_at REAL,
+            retry_at REAL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_deferred_retry_at ON deferred_entries(retry_at)')
 
     # Create indices for tag tables
     conn.execute('CREATE INDEX IF NOT EXISTS idx_tag_name ON tags(name)')
@@ -80,6 +116,55 @@ def init_db(connection=None):
     if not connection:
         conn.close()
 
+def _ensure_columns(conn, table: str, columns: dict):
+    """Add any missing columns to an existing table."""
+    existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+    for name, definition in columns.items():
+        if name not in existing:
+            conn.execute(f'ALTER TABLE {table} ADD COLUMN {name} {definition}')
+
+def content_hash(text: str) -> str:
+    """Hash normalised text for exact duplicate checks."""
+    normalized = ' '.join((text or '').lower().split())
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+def _backfill_content_hashes(conn):
+    """Fill content_hash for rows stored before the column existed."""
+    rows = conn.execute(
+        'SELECT id, message FROM news_entries WHERE content_hash IS NULL AND message IS NOT NULL'
+    ).fetchall()
+    if rows:
+        conn.executemany(
+            'UPDATE news_entries SET content_hash = ? WHERE id = ?',
+            [(content_hash(message), row_id) for row_id, message in rows]
+        )
+
+def entry_exists(link: str = None, message_hash: str = None, feed_url: str = None,
+                 guid: str = None, entry_hash: str = None) -> bool:
+    """Check if an entry matching any of the given identifiers already exists."""
+    checks = []
+    if link:
+        checks.append(('SELECT 1 FROM news_entries WHERE link = ? LIMIT 1', (link,)))
+    if message_hash:
+        checks.append(('SELECT 1 FROM news_entries WHERE content_hash = ? LIMIT 1', (message_hash,)))
+    if feed_url and guid:
+        checks.append(('SELECT 1 FROM news_entries WHERE feed_url = ? AND guid = ? LIMIT 1', (feed_url, guid)))
+    if entry_hash:
+        checks.append(('SELECT 1 FROM news_entries WHERE entry_hash = ? LIMIT 1', (entry_hash,)))
+    with get_db() as conn:
+        return any(conn.execute(query, params).fetchone() for query, params in checks)
+
+def load_recent_dedup_keys(since: str) -> list[tuple]:
+    """Load dedup identifiers for entries processed since an ISO timestamp.
+
+    Returns (link, content_hash, feed_url, guid, entry_hash) tuples."""
+    with get_db() as conn:
+        cursor = conn.execute('''
+            SELECT link, content_hash, feed_url, guid, entry_hash
+            FROM news_entries WHERE processed_date >= ?
+        ''', (since,))
+        return cursor.fetchall()
+
 def exists_in_db(link: str) -> bool:
     """Check if an entry with this link already exists in the database."""
     with get_db() as conn:
@@ -127,92 +212,160 @@ def cleanup_db():
 # Register cleanup function to run on program exit
 atexit.register(cleanup_db)
 
+def _parse_timestamp(value):
+    """Parse an ISO timestamp stored in the database."""
+    return datetime.fromisoformat(value) if value else None
+
 def load_feed_cache():
     """Load feed cache from database."""
     with get_db() as conn:
         cursor = conn.execute('''
-            SELECT url, last_check, etag, last_modified, update_frequency 
+            SELECT url, last_check, etag, last_modified, update_frequency,
+                   last_success_time, consecutive_failures, source_priority,
+                   content_type, last_response_size, total_bytes,
+                   fetch_count, not_modified_count, duplicate_skips,
+                   hub_url, topic_url
             FROM feed_cache
         ''')
         cache = {}
         for row in cursor:
             try:
                 cache[row[0]] = {
-                    'last_check': datetime.fromisoformat(row[1]) if row[1] else None,
+                    'last_check': _parse_timestamp(row[1]),
                     'etag': row[2],
                     'last_modified': row[3],
-                    'update_frequency': row[4] or 3600
+                    'update_frequency': row[4] or 3600,
+                    'last_success_time': _parse_timestamp(row[5]),
+                    'consecutive_failures': row[6] or 0,
+                    'source_priority': row[7] if row[7] is not None else 100,
+                    'content_type': row[8],
+                    'last_response_size': row[9] or 0,
+                    'total_bytes': row[10] or 0,
+                    'fetch_count': row[11] or 0,
+                    'not_modified_count': row[12] or 0,
+                    'duplicate_skips': row[13] or 0,
+                    'hub_url': row[14],
+                    'topic_url': row[15]
                 }
             except (ValueError, TypeError):
                 continue
         return cache
 
+def _feed_cache_row(url: str, data: dict) -> tuple:
+    """Build a feed_cache row from a metrics dictionary."""
+    def _isoformat(value):
+        return value.isoformat() if hasattr(value, 'isoformat') else value
+
+    return (
+        url,
+        _isoformat(data.get('last_check')),
+        data.get('etag'),
+        data.get('last_modified'),
+        data.get('update_frequency', 3600),
+        _isoformat(data.get('last_success_time')),
+        data.get('consecutive_failures', 0),
+        data.get('source_priority', 100),
+        data.get('content_type'),
+        data.get('last_response_size', 0),
+        data.get('total_bytes', 0),
+        data.get('fetch_count', 0),
+        data.get('not_modified_count', 0),
+        data.get('duplicate_skips', 0),
+        data.get('hub_url'),
+        data.get('topic_url')
+    )
+
 def update_feed_cache(url: str, data: dict):
     """Update feed cache with new metrics."""
     with get_db() as conn:
         conn.execute('''
             INSERT OR REPLACE INTO feed_cache 
             (url, last_check, etag, last_modified, update_frequency, 
-             last_success_time, consecutive_failures, source_priority)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            url,
-            data.get('last_check', '').isoformat() if data.get('last_check') else None,
-            data.get('etag'),
-            data.get('last_modified'),
-            data.get('update_frequency', 3600),
-            data.get('last_success_time', '').isoformat() if data.get('last_success_time') else None,
-            data.get('consecutive_failures', 0),
-            data.get('source_priority', 100)
-        ))
+             last_success_time, consecutive_failures, source_priority,
+             content_type, last_response_size, total_bytes,
+             fetch_count, not_modified_count, duplicate_skips,
+             hub_url, topic_url)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', _feed_cache_row(url, data))
         conn.commit()
 
-def get_feed_metrics(url: str) -> dict:
-    """Get feed metrics for adaptive polling."""
+def update_feed_cache_batch(rows: dict):
+    """Write metrics for several feeds in a single transaction."""
+    if not rows:
+        return
     with get_db() as conn:
-        cursor = conn.execute('''
-            SELECT update_frequency, last_success_time, consecutive_failures
-            FROM feed_cache WHERE url = ?
-        ''', (url,))
-        row = cursor.fetchone()
-        if row:
-            return {
-                'update_frequency': row[0] or 3600,
-                'last_success_time': row[1],
-                'consecutive_failures': row[2] or 0
-            }
-        return {
-            'update_frequency': 3600,
-            'last_success_time': None,
-            'consecutive_failures': 0
-        }
-
-def get_source_priority(feed_url: str) -> int:
-    """Get current priority score for a feed source.
-    Lower numbers mean the source has been logged more recently/frequently."""
+        conn.executemany('''
+            INSERT OR REPLACE INTO feed_cache 
+            (url, last_check, etag, last_modified, update_frequency, 
+             last_success_time, consecutive_failures, source_priority,
+             content_type, last_response_size, total_bytes,
+             fetch_count, not_modified_count, duplicate_skips,
+             hub_url, topic_url)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [_feed_cache_row(url, data) for url, data in rows.items()])
+        conn.commit()
+
+def load_recent_entry_times(since: str) -> list[tuple]:
+    """Load (feed_url, pub_date) pairs for entries published since an ISO timestamp."""
     with get_db() as conn:
-        # Look at the last 24 hours of entries
         cursor = conn.execute('''
-            SELECT COUNT(*) as entry_count 
-            FROM news_entries 
-            WHERE feed_url = ? 
-            AND datetime(pub_date) > datetime('now', '-1 day')
-        ''', (feed_url,))
-        count = cursor.fetchone()[0]
-        
-        # Calculate priority - more entries means lower priority
-        # Base priority of 100, subtract 5 for each recent entry, minimum 10
-        priority = max(100 - (count * 5), 10)
-        
-        # Update the cache
-        conn.execute('''
-            UPDATE feed_cache 
-            SET source_priority = ? 
-            WHERE url = ?
-        ''', (priority, feed_url))
+            SELECT feed_url, pub_date FROM news_entries WHERE pub_date >= ?
+        ''', (since,))
+        return cursor.fetchall()
+
+def defer_entries(rows: list[tuple]):
+    """Park (link, feed_url, entry_time, record, article_data, attempts, deferred_at, retry_at) rows.
+
+    An entry parked again keeps its first deferral time and counts another attempt.
+    """
+    if not rows:
+        return
+    with get_db() as conn:
+        conn.executemany('''
+            INSERT INTO deferred_entries
+            (link, feed_url, entry_time, record, article_data, attempts, deferred_at, retry_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(link) DO UPDATE SET
+                attempts = attempts + 1,
+                article_data = excluded.article_data,
+                retry_at = excluded.retry_at
+        ''', rows)
         conn.commit()
-        
-        return priority
+
+def claim_deferred_entries(now: float, limit: int, lease: float) -> list[tuple]:
+    """Take up to ``limit`` parked entries due for a retry, oldest first.
+
+    Claimed entries stay parked but are not due again for ``lease`` seconds,
+    so they are retried after a crash. Returns (link, feed_url, entry_time,
+    record, article_data, attempts) tuples.
+    """
+    with get_db() as conn:
+        rows = conn.execute('''
+            SELECT link, feed_url, entry_time, record, article_data, attempts FROM deferred_entries
+            WHERE retry_at <= ? ORDER BY deferred_at LIMIT ?
+        ''', (now, limit)).fetchall()
+        conn.executemany('UPDATE deferred_entries SET retry_at = ? WHERE link = ?',
+                         [(now + lease, row[0]) for row in rows])
+        conn.commit()
+        return rows
+
+def delete_deferred_entries(links: list[str]):
+    """Remove entries from the deferred queue."""
+    if not links:
+        return
+    with get_db() as conn:
+        conn.executemany('DELETE FROM deferred_entries WHERE link = ?', [(link,) for link in links])
+        conn.commit()
+
+def deferred_backlog() -> tuple:
+    """Return the number of parked entries and the earliest deferral time, or None.
+
+    Entries only tracked while in flight, with no attempts yet, are not counted.
+    """
+    with get_db() as conn:
+        return conn.execute(
+            'SELECT COUNT(*), MIN(deferred_at) FROM deferred_entries WHERE attempts > 0'
+        ).fetchone()
 
 # Add new functions for tag operations
 def add_tag(name: str, category: str) -> int:
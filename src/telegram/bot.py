@@ -3,8 +3,8 @@ import os
 import re
 import json
 import asyncio
-import aiohttp
 from typing import List, Optional
+from ..utils.http import http_client
 
 # Load Telegram credentials from environment
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
@@ -35,10 +35,11 @@ def escape_markdown_v2(text: str, exclude_urls: bool = False) -> str:
     
     return escaped_text
 
-async def make_telegram_request(session: aiohttp.ClientSession, endpoint: str, data: dict, retry_count: int = 0) -> bool:
+async def make_telegram_request(endpoint: str, data: dict, retry_count: int = 0) -> bool:
     """Make a request to Telegram API with retry and rate limit handling"""
     try:
-        async with session.post(
+        async with http_client.request(
+            'POST',
             f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/{endpoint}",
             data=data
         ) as response:
@@ -54,7 +55,7 @@ async def make_telegram_request(session: aiohttp.ClientSession, endpoint: str, d
                 print(f"Rate limited. Waiting {retry_after} seconds...")
                 await asyncio.sleep(retry_after)
                 if retry_count < 3:
-                    return await make_telegram_request(session, endpoint, data, retry_count + 1)
+                    return await make_telegram_request(endpoint, data, retry_count + 1)
                 return False
             
             return response.status == 200
@@ -75,58 +76,57 @@ async def send_message(text: str, image_urls: Optional[List[str]] = None) -> Non
     max_text_length = 4096
     truncated_text = escaped_text[:max_text_length]
     
-    async with aiohttp.ClientSession() as session:
-        if image_urls and image_urls[0]:
-            # Send first image with caption
-            first_image = image_urls[0]
-            caption = truncated_text[:max_caption_length]
-            data_photo = {
-                'chat_id': TELEGRAM_CHANNEL_ID,
-                'photo': first_image,
-                'caption': caption,
-                'parse_mode': 'MarkdownV2',
-                'disable_web_page_preview': True
-            }
-            
-            success = await make_telegram_request(session, "sendPhoto", data_photo)
-            if success:
-                print(f"✅ Sent photo message to Telegram: {text[:50]}...")
-            
-            if not success:
-                print("Failed to send photo, falling back to text-only message")
-                data_text = {
-                    'chat_id': TELEGRAM_CHANNEL_ID,
-                    'text': truncated_text,
-                    'parse_mode': 'MarkdownV2',
-                    'disable_web_page_preview': False
-                }
-                success = await make_telegram_request(session, "sendMessage", data_text)
-                if success:
-                    print(f"✅ Sent fallback text message to Telegram: {text[:50]}...")
-            else:
-                # Send remaining images if any
-                remaining_images = image_urls[1:]
-                if remaining_images:
-                    media = [{'type': 'photo', 'media': img} for img in remaining_images[:9]]
-                    media_group_data = {
-                        'chat_id': TELEGRAM_CHANNEL_ID,
-                        'media': json.dumps(media),
-                        'disable_notification': True
-                    }
-                    success = await make_telegram_request(session, "sendMediaGroup", media_group_data)
-                    if success:
-                        print(f"✅ Sent {len(remaining_images)} additional images to Telegram")
-        else:
-            # Text-only message
+    if image_urls and image_urls[0]:
+        # Send first image with caption
+        first_image = image_urls[0]
+        caption = truncated_text[:max_caption_length]
+        data_photo = {
+            'chat_id': TELEGRAM_CHANNEL_ID,
+            'photo': first_image,
+            'caption': caption,
+            'parse_mode': 'MarkdownV2',
+            'disable_web_page_preview': True
+        }
+        
+        success = await make_telegram_request("sendPhoto", data_photo)
+        if success:
+            print(f"✅ Sent photo message to Telegram: {text[:50]}...")
+        
+        if not success:
+            print("Failed to send photo, falling back to text-only message")
             data_text = {
                 'chat_id': TELEGRAM_CHANNEL_ID,
                 'text': truncated_text,
                 'parse_mode': 'MarkdownV2',
                 'disable_web_page_preview': False
             }
-            success = await make_telegram_request(session, "sendMessage", data_text)
+            success = await make_telegram_request("sendMessage", data_text)
             if success:
-                print(f"✅ Sent text message to Telegram: {text[:50]}...")
-        
-        # Add delay between messages
-        await asyncio.sleep(2)
\ No newline at end of file
+                print(f"✅ Sent fallback text message to Telegram: {text[:50]}...")
+        else:
+            # Send remaining images if any
+            remaining_images = image_urls[1:]
+            if remaining_images:
+                media = [{'type': 'photo', 'media': img} for img in remaining_images[:9]]
+                media_group_data = {
+                    'chat_id': TELEGRAM_CHANNEL_ID,
+                    'media': json.dumps(media),
+                    'disable_notification': True
+                }
+                success = await make_telegram_request("sendMediaGroup", media_group_data)
+                if success:
+                    print(f"✅ Sent {len(remaining_images)} additional images to Telegram")
+    else:
+        # Text-only message
+        data_text = {
+            'chat_id': TELEGRAM_CHANNEL_ID,
+            'text': truncated_text,
+            'parse_mode': 'MarkdownV2',
+            'disable_web_page_preview': False
+        }
+        success = await make_telegram_request("sendMessage", data_text)
+        if success:
+            print(f"✅ Sent text message to Telegram: {text[:50]}...")
+    
+    # Add delay between messages
+    await asyncio.sleep(2)
\ No newline at end of file
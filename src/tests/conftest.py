@@ -4,6 +4,12 @@ import os
 import tempfile
 import sqlite3
 from ..database.models import init_db
+from ..utils import ai, scraper
+from ..utils.llm_cache import LLMCache
+from ..utils.scrape_cache import ScrapeCache
+from ..utils.extraction import ExtractionPool
+from ..utils.quota import QuotaScheduler
+from ..utils.politeness import PolitenessScheduler
 
 @pytest.fixture(scope="session")
 def test_db():
@@ -45,4 +51,44 @@ def setup_test_env(test_db):
     # Reset environment
     del os.environ["TELEGRAM_TOKEN"]
     del os.environ["TELEGRAM_CHANNEL_ID"]
-    del os.environ["TESTING"]
\ No newline at end of file
+    del os.environ["TESTING"]
+
+@pytest.fixture(autouse=True)
+def llm_cache(tmp_path, monkeypatch):
+    """Keep model responses cached during tests out of the real cache file."""
+    cache = LLMCache(str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(ai, "llm_cache", cache)
+    monkeypatch.setattr(ai.content_processor, "cache", cache)
+    yield cache
+    cache.close()
+
+@pytest.fixture(autouse=True)
+def quota(monkeypatch):
+    """Give each test fresh API quota, so rate-limit tests do not hold keys back for others."""
+    scheduler = QuotaScheduler(["test-key"], per_minute=60, per_day=1500)
+    monkeypatch.setattr(ai, "quota_scheduler", scheduler)
+    monkeypatch.setattr(ai.content_processor, "quota", scheduler)
+    yield scheduler
+
+@pytest.fixture(autouse=True)
+def scrape_cache(tmp_path, monkeypatch):
+    """Keep articles scraped during tests out of the real cache file."""
+    cache = ScrapeCache(str(tmp_path / "scrape_cache.db"))
+    monkeypatch.setattr(scraper.article_scraper, "cache", cache)
+    yield cache
+    cache.close()
+
+@pytest.fixture(autouse=True)
+def extraction(monkeypatch):
+    """Extract articles in a thread, so tests do not start worker processes."""
+    pool = ExtractionPool(workers=0)
+    monkeypatch.setattr(scraper.article_scraper, "extraction", pool)
+    yield pool
+
+@pytest.fixture(autouse=True)
+def politeness(monkeypatch):
+    """Give each test its own scheduler, with no spacing between requests."""
+    scheduler = PolitenessScheduler(initial_delay=0.0, min_delay=0.0)
+    monkeypatch.setattr(scraper, "politeness_scheduler", scheduler)
+    monkeypatch.setattr(scraper.article_scraper, "politeness", scheduler)
+    yield scheduler
@@ -1,8 +1,11 @@
 """Tests for AI processing utilities."""
 import pytest
 import asyncio
-from unittest.mock import Mock, patch
-from src.utils.ai import ContentProcessor
+from unittest.mock import AsyncMock, Mock, patch
+import json
+from src.utils.ai import ContentProcessor, parse_enrichment
+from src.core.processor import ArticleProcessor, EntryRecord
+from src.utils.quota import QuotaExhausted
 
 @pytest.fixture
 def content_processor():
@@ -35,7 +38,7 @@ async def test_analyze_sentiment_and_bias(content_processor):
     ]
 
     for case in test_cases:
-        with patch.object(content_processor.client.models, 'generate_content') as mock_generate:
+        with patch.object(content_processor.client.aio.models, 'generate_content', new_callable=AsyncMock) as mock_generate:
             mock_response = Mock()
             mock_response.text = f"SENTIMENT: {case['sentiment_range'][0]}\nBIAS_CATEGORY: {case['expected_bias_category']}\nBIAS_SCORE: {case['bias_range'][0]}"
             mock_generate.return_value = mock_response
@@ -57,7 +60,7 @@ async def test_analyze_sentiment_and_bias(content_processor):
 @pytest.mark.asyncio
 async def test_analyze_sentiment_and_bias_error_handling(content_processor):
     """Test error handling during analysis."""
-    with patch.object(content_processor.client.models, 'generate_content', side_effect=Exception('Test error')):
+    with patch.object(content_processor.client.aio.models, 'generate_content', new_callable=AsyncMock, side_effect=Exception('Test error')):
         sentiment_score, bias_category, bias_score = await content_processor.analyze_sentiment_and_bias('test text')
         assert sentiment_score == 0.0
         assert bias_category == 'neutral'
@@ -66,7 +69,7 @@ async def test_analyze_sentiment_and_bias_error_handling(content_processor):
 @pytest.mark.asyncio
 async def test_analyze_sentiment_and_bias_api_error(content_processor):
     """Test handling of API errors during analysis."""
-    with patch.object(content_processor.client.models, 'generate_content', side_effect=Exception('API Error')):
+    with patch.object(content_processor.client.aio.models, 'generate_content', new_callable=AsyncMock, side_effect=Exception('API Error')):
         sentiment_score, bias_category, bias_score = await content_processor.analyze_sentiment_and_bias('test text')
         assert sentiment_score == 0.0
         assert bias_category == 'neutral'
@@ -75,20 +78,125 @@ async def test_analyze_sentiment_and_bias_api_error(content_processor):
 @pytest.mark.asyncio
 async def test_analyze_sentiment_and_bias_rate_limit(content_processor):
     """Test rate limiting behavior."""
-    # Simulate rate limit exceeded
-    with patch.object(content_processor.client.models, 'generate_content',
+    # Simulate rate limit exceeded; the caller defers the work instead of getting defaults
+    with patch.object(content_processor.client.aio.models, 'generate_content', new_callable=AsyncMock,
               side_effect=Exception('RESOURCE_EXHAUSTED: Rate limit exceeded')):
-        sentiment_score, bias_category, bias_score = await content_processor.analyze_sentiment_and_bias('test text')
-        assert sentiment_score == 0.0
-        assert bias_category == 'neutral'
-        assert bias_score == 0.0
+        with pytest.raises(QuotaExhausted):
+            await content_processor.analyze_sentiment_and_bias('test text')
+        assert content_processor.quota.wait_time(content_processor.model) > 0
 
 @pytest.mark.asyncio
 async def test_analyze_sentiment_and_bias_invalid_input(content_processor):
     """Test handling of invalid input."""
-    with patch.object(content_processor.client.models, 'generate_content',
+    with patch.object(content_processor.client.aio.models, 'generate_content', new_callable=AsyncMock,
               side_effect=Exception('INVALID_ARGUMENT: Invalid input')):
         sentiment_score, bias_category, bias_score = await content_processor.analyze_sentiment_and_bias('test text')
         assert sentiment_score == 0.0
         assert bias_category == 'neutral'
-        assert bias_score == 0.0
\ No newline at end of file
+        assert bias_score == 0.0
+
+@pytest.mark.asyncio
+async def test_slow_call_is_cancelled_without_blocking(content_processor):
+    """A call past its deadline is cancelled while the event loop keeps running."""
+    cancelled = asyncio.Event()
+    ticks = []
+
+    async def slow_generate(**kwargs):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def ticker():
+        while True:
+            ticks.append(1)
+            await asyncio.sleep(0.01)
+
+    content_processor.call_timeout = 0.1
+    ticking = asyncio.create_task(ticker())
+    try:
+        with patch.object(content_processor.client.aio.models, 'generate_content', side_effect=slow_generate):
+            sentiment_score, bias_category, bias_score = await content_processor.analyze_sentiment_and_bias('test text')
+    finally:
+        ticking.cancel()
+    assert (sentiment_score, bias_category, bias_score) == (0.0, 'neutral', 0.0)
+    assert cancelled.is_set()
+    assert len(ticks) >= 5
+
+ENRICHED = {
+    'title': 'French Election Enters Final Phase',
+    'summary': 'Polls show a close race.\n\nTurnout is expected to be high.\n\nResults are due Sunday.',
+    'emoji_location': '🇫🇷',
+    'emoji_topic': '🗳️',
+    'topics': ['Politics', 'politics', 'public opinion'],
+    'geography': ['france'],
+    'events': ['election'],
+    'sentiment': 1.7,
+    'bias_category': 'Western',
+    'bias_score': 0.2
+}
+
+def test_parse_enrichment_validates_fields():
+    result = parse_enrichment(json.dumps(ENRICHED))
+    assert result['topics'] == ['politics', 'public-opinion']
+    assert result['sentiment'] == 1.0
+    assert result['bias_category'] == 'western'
+
+    with pytest.raises(ValueError):
+        parse_enrichment(json.dumps({**ENRICHED, 'summary': ''}))
+    with pytest.raises(ValueError):
+        parse_enrichment('not json')
+
+@pytest.mark.asyncio
+async def test_enrich_mode_makes_one_call():
+    processor = ArticleProcessor(mode='enrich')
+    record = EntryRecord(
+        guid='1', link='https://example.com/news/1', title='Élection française',
+        description='Les sondages montrent une course serrée.', content='', images=[]
+    )
+    article_data = {'title': 'Élection française', 'text': 'Les sondages montrent une course serrée. ' * 50}
+    response = Mock(text=json.dumps(ENRICHED), usage_metadata=Mock(total_token_count=900))
+    with patch.object(processor.content_processor.client.aio.models, 'generate_content',
+                      new_callable=AsyncMock, return_value=response) as mock_generate:
+        result = await processor.process_article(record, article_data)
+
+    assert mock_generate.await_count == 1
+    assert mock_generate.await_args.kwargs['config']['response_mime_type'] == 'application/json'
+    assert result.title == ENRICHED['title']
+    assert result.message == '🇫🇷🗳️: French Election Enters Final Phase'
+    assert result.geography_tags == ['france']
+    assert result.bias_category == 'western'
+    savings = processor.content_processor.token_savings()
+    assert savings['articles'] == 1
+    assert savings['tokens_per_article'] == 900
+    assert savings['saved_per_article'] > 0
+
+@pytest.mark.asyncio
+async def test_enrich_batch_falls_back_per_item():
+    processor = ArticleProcessor(mode='enrich')
+    records = [
+        EntryRecord(guid=str(i), link=f'https://example.com/news/{i}', title=f'Story {i}',
+                    description=f'Description {i}', content='', images=[])
+        for i in range(3)
+    ]
+    items = [(record, {'title': record.title, 'text': f'Article body {i}'}) for i, record in enumerate(records)]
+    batch_response = Mock(
+        text=json.dumps({'articles': [
+            {'id': '0', **ENRICHED},
+            {'id': '1', **ENRICHED, 'summary': ''}
+        ]}),
+        usage_metadata=Mock(total_token_count=2000)
+    )
+    single_response = Mock(text=json.dumps({**ENRICHED, 'title': 'Retried'}), usage_metadata=Mock(total_token_count=900))
+    with patch.object(processor.content_processor.client.aio.models, 'generate_content', new_callable=AsyncMock,
+                      side_effect=[batch_response, single_response, single_response]) as mock_generate:
+        results = await processor.process_articles(items)
+
+    # One batched call, then single calls for the malformed and the missing item
+    assert mock_generate.await_count == 3
+    first_prompt = mock_generate.await_args_list[0].kwargs['contents']
+    assert 'ARTICLE 0' in first_prompt and 'ARTICLE 2' in first_prompt
+    assert [result.title for result in results] == [ENRICHED['title'], 'Retried', 'Retried']
+    assert results[2].link == 'https://example.com/news/2'
+    assert processor.content_processor.token_savings()['articles'] == 3
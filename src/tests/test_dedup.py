@@ -0,0 +1,57 @@
+"""Tests for the Bloom filter dedup index."""
+import os
+import time
+from ..core.dedup import BloomFilter, DedupIndex, entry_fingerprint
+
+def test_bloom_filter_persists_via_mmap(tmp_path):
+    path = str(tmp_path / "test.bloom")
+    bloom = BloomFilter(path, capacity=1000)
+    for i in range(500):
+        bloom.add(f"key-{i}")
+    bloom.close()
+
+    reopened = BloomFilter(path)
+    assert reopened.count == 500
+    assert all(f"key-{i}" in reopened for i in range(500))
+    false_positives = sum(f"other-{i}" in reopened for i in range(1000))
+    assert false_positives < 20
+    reopened.close()
+
+def test_dedup_index_confirms_hits_against_database(tmp_path):
+    index = DedupIndex(directory=str(tmp_path))
+    index.load()
+    link = "https://dedup.example.com/never-stored"
+    assert not index.seen(link=link, message="Unseen message")
+
+    index.add(link=link, message="Unseen message")
+    # The filter matches, but the entry was never written to news_entries
+    assert not index.seen(link=link, message="Unseen message")
+    assert index.filter_hits == 1
+    assert index.confirmed == 0
+    index.close()
+
+def test_dedup_index_evicts_old_generations(tmp_path):
+    index = DedupIndex(directory=str(tmp_path), window_days=1)
+    index.load()
+    index.add(link="https://dedup.example.com/old")
+    old = index.generations[-1]
+    old.created = time.time() - 2 * 86400
+    old._write_header()
+    index.close()
+
+    reloaded = DedupIndex(directory=str(tmp_path), window_days=1)
+    reloaded.load()
+    assert not os.path.exists(old.path)
+    assert not reloaded._might_contain("link:https://dedup.example.com/old")
+    reloaded.close()
+
+def test_dedup_index_scopes_guids_to_feed(tmp_path):
+    index = DedupIndex(directory=str(tmp_path))
+    index.load()
+    fingerprint = entry_fingerprint("Live updates", "Ceasefire talks resume")
+    index.add(feed_url="https://a.example.com/feed", guid="item-1", entry_hash=fingerprint)
+    assert index._might_contain("guid:https://a.example.com/feed|item-1")
+    assert not index._might_contain("guid:https://b.example.com/feed|item-1")
+    assert index._might_contain(f"entry:{fingerprint}")
+    assert entry_fingerprint("Live updates", "Markets open lower") != fingerprint
+    index.close()
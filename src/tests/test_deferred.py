@@ -0,0 +1,168 @@
+"""Tests for the deferred enrichment queue."""
+import asyncio
+import pytest
+import sqlite3
+import datetime
+from ..database import models
+from ..core import feed_watcher
+from ..core.deferred import DeferredQueue
+from ..core.feed_watcher import FeedWatcher, FeedEntry
+from ..core.dedup import DedupIndex
+from ..core.processor import EntryRecord, preview_result
+from ..utils.quota import QuotaExhausted
+
+@pytest.fixture
+def db(monkeypatch):
+    """Point the models at an in-memory database."""
+    conn = sqlite3.connect(':memory:')
+    models.init_db(conn)
+    monkeypatch.setattr(models, '_connection', conn)
+    yield conn
+    conn.close()
+
+def make_entry(n: int) -> FeedEntry:
+    record = EntryRecord(f'guid-{n}', f'https://example.com/{n}', f'Title {n}', 'Description', 'Content', [])
+    entry = FeedEntry(record, datetime.datetime(2024, 1, n, tzinfo=datetime.timezone.utc), 'https://example.com/feed')
+    entry.article_data = {'title': f'Title {n}', 'text': 'Body', 'publish_date': datetime.datetime(2024, 1, n)}
+    return entry
+
+def test_parked_entries_are_leased_until_done(db):
+    queue = DeferredQueue(lease=600)
+    queue.park([make_entry(1), make_entry(2)])
+    queue.park([make_entry(3)], delay=3600)
+
+    stats = queue.stats()
+    assert stats['backlog'] == 3
+    assert stats['oldest_age'] >= 0
+
+    claimed = queue.claim(10)
+    assert [e.record.link for e in claimed] == ['https://example.com/1', 'https://example.com/2']
+    assert claimed[0].record == make_entry(1).entry
+    assert claimed[0].entry_time == make_entry(1).entry_time
+    assert claimed[0].article_data['text'] == 'Body'
+    # Leased entries are not handed out twice, but stay parked until done
+    assert queue.claim(10) == []
+    assert queue.stats()['backlog'] == 3
+
+    queue.done([e.record.link for e in claimed])
+    assert queue.stats()['backlog'] == 1
+
+def test_parking_again_counts_attempts(db):
+    queue = DeferredQueue()
+    queue.park([make_entry(1)])
+    queue.park([make_entry(1)])
+    assert db.execute('SELECT attempts FROM deferred_entries').fetchone()[0] == 2
+    assert queue.stats()['backlog'] == 1
+
+@pytest.mark.asyncio
+async def test_enrich_stage_parks_entries_on_exhausted_quota(db, monkeypatch):
+    async def exhausted(items, priority=0):
+        raise QuotaExhausted('RESOURCE_EXHAUSTED')
+
+    monkeypatch.setattr(feed_watcher, 'process_articles', exhausted)
+    monkeypatch.setattr(feed_watcher, 'quota_wait', lambda: 0.0)
+    watcher = FeedWatcher()
+    await watcher._enrich_stage([make_entry(1), make_entry(2)])
+    assert watcher.deferred.stats()['backlog'] == 2
+
+    # A parked entry comes back through the enrich stage and leaves the queue once processed
+    async def one_result(items, priority=0):
+        return ['result'] + [None] * (len(items) - 1)
+
+    monkeypatch.setattr(feed_watcher, 'process_articles', one_result)
+    for parked in watcher.deferred.claim(10):
+        await watcher._resubmit_deferred(parked)
+    queued = [watcher.pipeline.stages['enrich'].get_nowait() for _ in range(2)]
+    assert all(entry.deferred for entry in queued)
+    await watcher._enrich_stage(queued)
+    # Both stay parked until the entry with a result is persisted
+    assert watcher.deferred.stats()['backlog'] == 2
+    entry, result = watcher.pipeline.stages['persist'].get_nowait()
+    assert result == 'result' and entry.entry.link == 'https://example.com/1'
+
+@pytest.mark.asyncio
+async def test_enrich_stage_parks_entries_on_timeout(db, monkeypatch):
+    async def timeout(items, priority=0):
+        raise asyncio.TimeoutError()
+
+    monkeypatch.setattr(feed_watcher, 'process_articles', timeout)
+    monkeypatch.setattr(feed_watcher, 'quota_wait', lambda: 0.0)
+    watcher = FeedWatcher()
+    watcher.deferred.park([make_entry(1)])
+    for parked in watcher.deferred.claim(10):
+        await watcher._resubmit_deferred(parked)
+    queued = [watcher.pipeline.stages['enrich'].get_nowait(), make_entry(2)]
+    await watcher._enrich_stage(queued)
+    assert watcher.deferred.stats()['backlog'] == 2
+    assert len(watcher.deferred.claim(10)) == 2
+
+@pytest.mark.asyncio
+async def test_failed_stored_entries_are_retried_until_the_attempt_cap(db, monkeypatch):
+    async def no_results(items, priority=0):
+        return [None] * len(items)
+
+    monkeypatch.setattr(feed_watcher, 'process_articles', no_results)
+    monkeypatch.setattr(feed_watcher, 'quota_wait', lambda: 0.0)
+    watcher = FeedWatcher()
+    watcher.config.failed_retry_delay = 0
+    watcher.config.max_enrich_attempts = 2
+    entry = make_entry(1)
+    entry.stored = True
+    await watcher._enrich_stage([entry])
+
+    for attempts in (1, 2):
+        parked = watcher.deferred.claim(10)
+        assert [p.attempts for p in parked] == [attempts]
+        await watcher._resubmit_deferred(parked[0])
+        await watcher._enrich_stage([watcher.pipeline.stages['enrich'].get_nowait()])
+    # The second retry reached the cap, so the entry is no longer parked
+    assert watcher.deferred.stats()['backlog'] == 0
+
+@pytest.mark.asyncio
+async def test_failed_scrape_of_stored_entry_is_parked(db, monkeypatch):
+    async def broken(url):
+        raise RuntimeError('parser crashed')
+
+    monkeypatch.setattr(feed_watcher, 'scrape_article', broken)
+    watcher = FeedWatcher()
+    watcher.config.failed_retry_delay = 0
+    stored, unstored = make_entry(1), make_entry(2)
+    stored.stored = True
+    await watcher._scrape_stage(stored)
+    await watcher._scrape_stage(unstored)
+    parked = watcher.deferred.claim(10)
+    assert [p.record.link for p in parked] == ['https://example.com/1']
+    assert parked[0].article_data['text'] == 'Body'
+
+@pytest.mark.asyncio
+async def test_stored_entry_is_picked_up_after_a_restart(db, monkeypatch, tmp_path):
+    async def broadcast(item, article_id=None):
+        pass
+
+    monkeypatch.setattr(feed_watcher, 'broadcast_news_update', broadcast)
+    watcher = FeedWatcher()
+    watcher.dedup = DedupIndex(directory=str(tmp_path))
+    watcher.deferred.lease = 0
+    entry = make_entry(1)
+    entry.article_data = None
+    await watcher._store_stage(entry)
+    # In flight, so not counted as waiting for quota
+    assert watcher.deferred.stats()['backlog'] == 0
+    watcher.dedup.close()
+
+    # The process dies before the entry is enriched; the next one finds it and scrapes it again
+    restarted = FeedWatcher()
+    restarted.dedup = DedupIndex(directory=str(tmp_path))
+    parked = restarted.deferred.claim(10)
+    assert [(p.record.link, p.attempts) for p in parked] == [('https://example.com/1', 0)]
+    await restarted._resubmit_deferred(parked[0])
+    recovered = restarted.pipeline.stages['scrape'].get_nowait()
+    assert recovered.stored
+
+    enriched = preview_result(recovered.entry)._replace(
+        title='Enriched title', description='Summary', sentiment_score=0.5, bias_category='neutral', bias_score=0.1
+    )
+    await restarted._persist_stage((recovered, enriched))
+    assert db.execute('SELECT COUNT(*), sentiment_score FROM news_entries').fetchone() == (1, 0.5)
+    assert db.execute('SELECT COUNT(*) FROM deferred_entries').fetchone()[0] == 0
+    restarted.dedup.close()
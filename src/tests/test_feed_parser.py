@@ -0,0 +1,117 @@
+"""Tests for the streaming feed parser."""
+import datetime
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timezone
+from ..core.feed_parser import StreamingFeedParser, parse_feed, parse_entry_records, prepare_entry_records
+from ..core.processor import EntryRecord
+
+RSS_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/">
+    <channel>
+        <title>Test Feed</title>
+        <item>
+            <title>Newest</title>
+            <link>https://example.com/news/3</link>
+            <description>&lt;p&gt;Third story&lt;/p&gt;</description>
+            <guid>news-3</guid>
+            <pubDate>Wed, 03 Jan 2024 00:00:00 GMT</pubDate>
+            <media:thumbnail url="https://example.com/3.jpg"/>
+        </item>
+        <item>
+            <title>Middle</title>
+            <link>https://example.com/news/2</link>
+            <description>Second story</description>
+            <pubDate>Tue, 02 Jan 2024 00:00:00 GMT</pubDate>
+        </item>
+        <item>
+            <title>Oldest</title>
+            <link>https://example.com/news/1</link>
+            <description>First story</description>
+            <pubDate>Mon, 01 Jan 2024 00:00:00 GMT</pubDate>
+        </item>
+    </channel>
+</rss>
+"""
+
+ATOM_FEED = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+    <title>Atom Feed</title>
+    <entry>
+        <title>Atom story</title>
+        <link rel="alternate" href="https://example.com/atom/1"/>
+        <id>urn:atom:1</id>
+        <updated>2024-01-02T10:00:00Z</updated>
+        <summary>Atom summary</summary>
+    </entry>
+</feed>
+"""
+
+def test_parse_rss_entries():
+    result = parse_feed(RSS_FEED)
+    assert not result.malformed
+    assert result.total_entries == 3
+    entry, pub_date = result.entries[0]
+    assert entry.title == "Newest"
+    assert entry.link == "https://example.com/news/3"
+    assert entry.description == "<p>Third story</p>"
+    assert entry.id == "news-3"
+    assert entry.media_thumbnail == [{'url': "https://example.com/3.jpg"}]
+    assert pub_date == datetime.datetime(2024, 1, 3, tzinfo=timezone.utc)
+
+def test_parse_atom_entries():
+    result = parse_feed(ATOM_FEED)
+    assert not result.malformed
+    entry, pub_date = result.entries[0]
+    assert entry.link == "https://example.com/atom/1"
+    assert entry.summary == "Atom summary"
+    assert pub_date == datetime.datetime(2024, 1, 2, 10, tzinfo=timezone.utc)
+
+def test_streaming_stops_at_watermark():
+    watermark = datetime.datetime(2024, 1, 2, tzinfo=timezone.utc)
+    parser = StreamingFeedParser(watermark, stale_limit=1)
+    data = RSS_FEED.encode('utf-8')
+    done = False
+    consumed = 0
+    for i in range(0, len(data), 64):
+        consumed = i + 64
+        if parser.feed(data[i:i + 64]):
+            done = True
+            break
+    result = parser.close()
+    assert done and result.stopped_early
+    assert consumed < len(data)
+    assert [entry.title for entry, _ in result.entries] == ["Newest"]
+
+def test_malformed_feed_falls_back_to_feedparser():
+    broken = RSS_FEED.replace("</channel>", "")
+    result = parse_feed(broken)
+    assert not result.malformed
+    assert result.total_entries == 3
+    assert {entry.link for entry, _ in result.entries} == {
+        "https://example.com/news/1", "https://example.com/news/2", "https://example.com/news/3"
+    }
+
+def test_parse_entry_records_in_worker_process():
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        result = executor.submit(parse_entry_records, RSS_FEED.encode('utf-8')).result()
+    record, _ = result.entries[0]
+    assert isinstance(record, EntryRecord)
+    assert record.guid == "news-3"
+    assert record.description == "Third story"
+    assert record.images == ["https://example.com/3.jpg"]
+
+def test_streamed_entries_are_prepared_in_worker_process():
+    parser = StreamingFeedParser()
+    parser.feed(RSS_FEED.encode('utf-8'))
+    result = parser.close()
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        entries = executor.submit(prepare_entry_records, result.entries).result()
+    assert [record.guid for record, _ in entries] == [entry.get('id', '') for entry, _ in result.entries]
+    assert all(isinstance(record, EntryRecord) for record, _ in entries)
+
+def test_undated_entries_are_marked():
+    feed = RSS_FEED.replace("<pubDate>", "<!--", 1).replace("</pubDate>", "-->", 1)
+    result = parse_feed(feed)
+    assert len(result.undated) == 1
+    entry, _ = result.entries[next(iter(result.undated))]
+    assert 'published' not in entry
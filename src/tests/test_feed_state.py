@@ -0,0 +1,61 @@
+"""Tests for the feed state store."""
+import pytest
+import datetime
+from ..core.feed_state import FeedStateStore
+from ..database.models import get_db
+
+TEST_FEED = "https://state.example.com/feed"
+
+@pytest.fixture
+def clean_feed_cache():
+    yield
+    with get_db() as conn:
+        conn.execute('DELETE FROM feed_cache WHERE url = ?', (TEST_FEED,))
+        conn.commit()
+
+def test_validators_survive_reload(clean_feed_cache):
+    store = FeedStateStore()
+    store.record_response(TEST_FEED, 200, size=2048, etag='"abc"',
+                          last_modified='Wed, 01 Jan 2025 00:00:00 GMT',
+                          content_type='application/rss+xml')
+    store.record_response(TEST_FEED, 304)
+    assert store.dirty_count == 1
+    store.flush()
+    assert store.dirty_count == 0
+
+    reloaded = FeedStateStore()
+    reloaded.load()
+    state = reloaded.get(TEST_FEED)
+    assert state.conditional_headers() == {
+        'If-None-Match': '"abc"',
+        'If-Modified-Since': 'Wed, 01 Jan 2025 00:00:00 GMT'
+    }
+    assert state.last_response_size == 2048
+    assert state.fetch_count == 2
+    assert state.not_modified_ratio == 0.5
+
+def test_not_modified_keeps_validators(clean_feed_cache):
+    store = FeedStateStore()
+    store.record_response(TEST_FEED, 200, size=10, etag='"v1"')
+    store.record_response(TEST_FEED, 304)
+    assert store.get(TEST_FEED).etag == '"v1"'
+    assert store.get(TEST_FEED).total_bytes == 10
+
+def test_source_priority_counts_recent_entries():
+    store = FeedStateStore()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    store.record_entry(TEST_FEED, now - datetime.timedelta(days=2))
+    for _ in range(3):
+        store.record_entry(TEST_FEED, now)
+    assert store.source_priority(TEST_FEED) == 85
+    assert store.source_priority("https://other.example.com/feed") == 100
+
+def test_duplicate_skips_survive_reload(clean_feed_cache):
+    store = FeedStateStore()
+    store.record_duplicate(TEST_FEED)
+    store.record_duplicate(TEST_FEED)
+    store.flush()
+
+    reloaded = FeedStateStore()
+    reloaded.load()
+    assert reloaded.get(TEST_FEED).duplicate_skips == 2
@@ -2,10 +2,17 @@
 import pytest
 import pytest_asyncio
 import asyncio
+import sqlite3
 from datetime import datetime, timedelta
-from ..core.feed_watcher import FeedWatcher, FeedConfiguration
-from ..core.processor import process_article
+from ..core import feed_watcher as watcher_module
+from ..core.feed_watcher import FeedWatcher, FeedConfiguration, FeedEntry
+from ..core.processor import process_article, preview_result, EntryRecord
+from ..core.dedup import DedupIndex
+from ..database import models
 import aiohttp
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from concurrent.futures import ProcessPoolExecutor
 
 @pytest_asyncio.fixture
 async def feed_watcher():
@@ -17,7 +24,8 @@ async def feed_watcher():
 @pytest.mark.asyncio
 async def test_feed_watcher_initialization(feed_watcher):
     assert feed_watcher.session is not None
-    assert isinstance(feed_watcher.logged_entries, set)
+    assert isinstance(feed_watcher.dedup, DedupIndex)
+    assert feed_watcher.dedup.generations
 
 @pytest.mark.asyncio
 async def test_check_feed_headers():
@@ -61,3 +69,67 @@ async def test_process_feed_content():
     finally:
         await watcher.close()
 
+
+@pytest.mark.asyncio
+async def test_entry_is_stored_raw_then_enriched(monkeypatch, tmp_path):
+    conn = sqlite3.connect(':memory:')
+    models.init_db(conn)
+    monkeypatch.setattr(models, '_connection', conn)
+    messages = []
+
+    def capture(kind):
+        async def broadcast(item, article_id=None):
+            messages.append((kind, item))
+        return broadcast
+
+    monkeypatch.setattr(watcher_module, 'broadcast_news_update', capture('news_update'))
+    monkeypatch.setattr(watcher_module, 'broadcast_news_enriched', capture('news_enriched'))
+    watcher = FeedWatcher()
+    watcher.dedup = DedupIndex(directory=str(tmp_path))
+    record = EntryRecord('guid-1', 'https://example.com/news/1', 'Raw title', 'Raw description', 'Raw description', [])
+    entry = FeedEntry(record, datetime(2024, 1, 1), 'https://example.com/feed')
+
+    await watcher._store_stage(entry)
+    row = conn.execute('SELECT title, sentiment_score FROM news_entries').fetchone()
+    assert row == ('Raw title', None)
+    assert messages == [('news_update', watcher._news_item(entry, preview_result(record)))]
+    assert watcher.pipeline.stages['scrape'].get_nowait() is entry
+
+    enriched = preview_result(record)._replace(
+        title='Enriched title', description='Summary', sentiment_score=0.5, bias_category='neutral', bias_score=0.1
+    )
+    await watcher._persist_stage((entry, enriched))
+    await watcher._publish_stage(watcher.pipeline.stages['publish'].get_nowait())
+    assert conn.execute('SELECT COUNT(*), title, sentiment_score FROM news_entries').fetchone() == (1, 'Enriched title', 0.5)
+    kind, changes = messages[-1]
+    assert kind == 'news_enriched'
+    assert changes['link'] == record.link and changes['title'] == 'Enriched title'
+    watcher.dedup.close()
+    conn.close()
+
+def _long_feed(count):
+    items = ''.join(
+        f"<item><title>Story {n}</title><link>https://example.com/news/{n}</link>"
+        f"<description>Story {n}</description><pubDate>Mon, 01 Jan 2024 00:00:00 GMT</pubDate></item>"
+        for n in range(count)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>{items}</channel></rss>'
+
+@pytest.mark.asyncio
+async def test_long_new_feed_is_parsed_in_worker():
+    app = web.Application()
+    app.router.add_get('/feed', lambda request: web.Response(text=_long_feed(500), content_type='application/rss+xml'))
+    watcher = FeedWatcher(FeedConfiguration(parse_workers=1, stream_check_entries=5))
+    watcher.session = await watcher.http.session()
+    watcher.cpu_executor = ProcessPoolExecutor(max_workers=1)
+    try:
+        async with TestServer(app) as server:
+            text, parsed = await watcher.fetch_feed(str(server.make_url('/feed')))
+        # The event loop stopped parsing soon after finding no seen entries, but read the whole body
+        assert parsed.partial and not parsed.malformed
+        assert parsed.total_entries < 500
+        full = await watcher._parse_content(text, None, parsed.truncated)
+        assert len(full.entries) == 500
+        assert all(isinstance(record, EntryRecord) for record, _ in full.entries)
+    finally:
+        await watcher.close()
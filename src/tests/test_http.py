@@ -0,0 +1,35 @@
+"""Tests for the shared HTTP client."""
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from ..utils.http import HttpClient, ACCEPT_ENCODING
+
+async def _page(request):
+    return web.Response(text="x" * 1000, headers={'X-Accept-Encoding': request.headers.get('Accept-Encoding', '')})
+
+@pytest.mark.asyncio
+async def test_requests_share_session_and_record_host_stats():
+    app = web.Application()
+    app.router.add_get('/page', _page)
+    async with TestServer(app) as server:
+        client = HttpClient()
+        url = str(server.make_url('/page'))
+        session = await client.session()
+        async with client.request('GET', url) as response:
+            assert response.headers['X-Accept-Encoding'] == ACCEPT_ENCODING
+            assert len(await client.read(response)) == 1000
+        assert await client.get_text(url, max_bytes=100) == "x" * 100
+        assert await client.session() is session
+
+        stats = client.stats()[f"{server.host}:{server.port}"]
+        assert stats['requests'] == 2
+        assert stats['errors'] == 0
+        assert stats['bytes'] >= 1000
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_non_200_returns_none():
+    async with TestServer(web.Application()) as server:
+        client = HttpClient()
+        assert await client.get_text(str(server.make_url('/missing'))) is None
+        await client.close()
@@ -0,0 +1,61 @@
+"""Tests for the persistent LLM response cache."""
+import pytest
+import time
+from unittest.mock import AsyncMock, Mock, patch
+from ..utils.ai import ContentProcessor
+from ..utils.llm_cache import LLMCache
+
+def test_key_normalizes_input():
+    key = LLMCache.key('model', 'tags:v1', 'Hello   world\n')
+    assert key == LLMCache.key('model', 'tags:v1', 'Hello world')
+    assert key != LLMCache.key('model', 'tags:v2', 'Hello world')
+    assert key != LLMCache.key('other-model', 'tags:v1', 'Hello world')
+
+def test_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = LLMCache(path)
+    cache.put('a', 'response')
+    cache.close()
+
+    reopened = LLMCache(path)
+    assert reopened.get('a') == 'response'
+    assert reopened.get('b') is None
+    assert reopened.stats()['hits'] == 1
+    assert reopened.stats()['misses'] == 1
+    reopened.close()
+
+def test_expired_entries_miss(tmp_path):
+    cache = LLMCache(str(tmp_path / 'cache.db'), ttl=60)
+    cache.put('a', 'response')
+    with patch('src.utils.sqlite_cache.time.time', return_value=time.time() + 120):
+        assert cache.get('a') is None
+    cache.close()
+
+def test_least_recently_used_are_evicted(tmp_path):
+    cache = LLMCache(str(tmp_path / 'cache.db'), max_entries=10)
+    for i in range(10):
+        cache.put(f'key{i}', str(i))
+        time.sleep(0.001)
+    # Touch the oldest entry so it survives eviction
+    assert cache.get('key0') == '0'
+    cache.put('key10', '10')
+
+    assert len(cache) == 9
+    assert cache.stats()['evictions'] == 2
+    assert cache.get('key0') == '0'
+    assert cache.get('key1') is None
+    assert cache.get('key10') == '10'
+    cache.close()
+
+@pytest.mark.asyncio
+async def test_repeated_analysis_uses_cache(llm_cache):
+    processor = ContentProcessor(cache=llm_cache)
+    response = Mock(text="SENTIMENT: -0.4\nBIAS_CATEGORY: neutral\nBIAS_SCORE: 0.1")
+    with patch.object(processor.client.aio.models, 'generate_content',
+                      new_callable=AsyncMock, return_value=response) as mock_generate:
+        first = await processor.analyze_sentiment_and_bias('Talks resume in Geneva')
+        second = await processor.analyze_sentiment_and_bias('Talks  resume in Geneva ')
+
+    assert first == second == (-0.4, 'neutral', 0.1)
+    assert mock_generate.await_count == 1
+    assert llm_cache.hit_rate == 0.5
@@ -0,0 +1,43 @@
+"""Tests for the near-duplicate story index."""
+from ..core.near_dup import NearDuplicateIndex, simhash
+
+WIRE_STORY = (
+    "Foreign ministers from both countries met in Geneva on Tuesday to discuss "
+    "a ceasefire along the disputed border, according to officials familiar with "
+    "the talks, who said a joint statement could follow later this week"
+)
+REWRITE = WIRE_STORY.replace("on Tuesday", "on Tuesday morning")
+OTHER_STORY = (
+    "The central bank left interest rates unchanged on Wednesday and signalled "
+    "that inflation would remain above target for most of next year as energy prices rise"
+)
+
+def test_simhash_is_close_for_rewrites():
+    original, features = simhash(WIRE_STORY)
+    rewrite, _ = simhash(REWRITE)
+    other, _ = simhash(OTHER_STORY)
+    assert features > 30
+    assert bin(original ^ rewrite).count('1') < bin(original ^ other).count('1')
+
+def test_index_returns_result_of_near_duplicate():
+    index = NearDuplicateIndex(max_distance=5)
+    index.add(WIRE_STORY, "wire result")
+    assert index.find(REWRITE) == "wire result"
+    assert index.find(OTHER_STORY) is None
+    assert index.stats() == {'entries': 1, 'lookups': 2, 'hits': 1, 'hit_rate': 0.5}
+
+def test_index_ignores_short_texts():
+    index = NearDuplicateIndex()
+    index.add("Breaking news", "result")
+    assert len(index) == 0
+    assert index.find("Breaking news") is None
+    assert index.lookups == 0
+
+def test_index_forgets_entries_outside_window():
+    index = NearDuplicateIndex(window_hours=1)
+    index.add(WIRE_STORY, "wire result")
+    added, entry_id, fingerprint, result = index._entries[0]
+    index._entries[0] = (added - 7200, entry_id, fingerprint, result)
+    assert index.find(WIRE_STORY) is None
+    assert len(index) == 0
+    assert not index._buckets
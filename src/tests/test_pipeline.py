@@ -0,0 +1,125 @@
+"""Tests for the staged ingestion pipeline."""
+import pytest
+import asyncio
+from ..core.pipeline import Pipeline
+
+@pytest.mark.asyncio
+async def test_pipeline_chains_stages():
+    pipeline = Pipeline()
+    results = []
+
+    async def double(item):
+        await pipeline.put('collect', item * 2)
+
+    async def collect(item):
+        results.append(item)
+
+    pipeline.add_stage('double', double, workers=2)
+    pipeline.add_stage('collect', collect)
+    pipeline.start()
+    try:
+        for i in range(5):
+            await pipeline.put('double', i)
+        await pipeline.join()
+        assert sorted(results) == [0, 2, 4, 6, 8]
+        stats = pipeline.stats()
+        assert stats['double']['processed'] == 5
+        assert stats['collect']['processed'] == 5
+        assert stats['collect']['queue_depth'] == 0
+    finally:
+        await pipeline.stop()
+
+@pytest.mark.asyncio
+async def test_full_stage_blocks_producer():
+    pipeline = Pipeline()
+    release = asyncio.Event()
+
+    async def slow(item):
+        await release.wait()
+
+    pipeline.add_stage('slow', slow, workers=1, queue_size=2)
+    pipeline.start()
+    try:
+        # One item in the worker and two queued fill the stage
+        for i in range(3):
+            await pipeline.put('slow', i)
+        await asyncio.sleep(0)
+        blocked = asyncio.create_task(pipeline.put('slow', 3))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+        assert pipeline.stats()['slow']['queue_depth'] == 2
+
+        release.set()
+        await asyncio.wait_for(blocked, 1)
+        await pipeline.join()
+        assert pipeline.stats()['slow']['processed'] == 4
+    finally:
+        await pipeline.stop()
+
+@pytest.mark.asyncio
+async def test_handler_errors_are_counted():
+    pipeline = Pipeline()
+
+    async def fail(item):
+        raise ValueError(item)
+
+    pipeline.add_stage('fail', fail)
+    pipeline.add_stage('fetch')
+    pipeline.start()
+    try:
+        await pipeline.put('fail', 1)
+        await pipeline.join()
+        async with pipeline.track('fetch'):
+            pass
+        stats = pipeline.stats()
+        assert stats['fail']['errors'] == 1
+        assert stats['fail']['processed'] == 0
+        assert stats['fetch']['processed'] == 1
+        assert stats['fetch']['workers'] == 0
+    finally:
+        await pipeline.stop()
+
+@pytest.mark.asyncio
+async def test_batched_stage_respects_size_and_budget():
+    pipeline = Pipeline()
+    batches = []
+
+    async def record(batch):
+        batches.append(batch)
+
+    pipeline.add_stage('batch', record, batch_size=3, weigh=lambda item: item, batch_budget=10)
+    for item in [2, 3, 4, 5, 1, 1]:
+        await pipeline.put('batch', item)
+    pipeline.start()
+    try:
+        await pipeline.join()
+        # 2+3+4 fills the batch; 5+1+1 fits the budget; order is preserved
+        assert batches == [[2, 3, 4], [5, 1, 1]]
+
+        await pipeline.put('batch', 9)
+        await pipeline.put('batch', 6)
+        await pipeline.join()
+        # 9+6 would pass the budget, so 6 waits for the next batch
+        assert batches[2:] == [[9], [6]]
+        assert pipeline.stats()['batch']['processed'] == 8
+    finally:
+        await pipeline.stop()
+
+@pytest.mark.asyncio
+async def test_priority_stage_serves_lowest_value_first():
+    pipeline = Pipeline()
+    order = []
+
+    async def record(item):
+        order.append(item)
+
+    pipeline.add_stage('ranked', record, priority=lambda item: -item[1])
+    for item in [('stale', 1), ('fresh', 9), ('backlog', 1), ('breaking', 9)]:
+        await pipeline.put('ranked', item)
+    pipeline.start()
+    try:
+        await pipeline.join()
+        # Highest score first; equal scores keep their arrival order
+        assert [name for name, _ in order] == ['fresh', 'breaking', 'stale', 'backlog']
+    finally:
+        await pipeline.stop()
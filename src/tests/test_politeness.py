@@ -0,0 +1,72 @@
+"""Tests for per-domain request spacing."""
+import asyncio
+import email.utils
+import time
+import pytest
+from ..utils.politeness import PolitenessScheduler, parse_retry_after
+
+def test_retry_after_accepts_seconds_and_dates():
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    in_a_minute = email.utils.formatdate(time.time() + 60, usegmt=True)
+    assert 55 <= parse_retry_after(in_a_minute) <= 60
+
+def test_delay_shrinks_for_fast_domains_and_backs_off_on_throttling():
+    scheduler = PolitenessScheduler(initial_delay=3.0, min_delay=0.5, max_delay=20.0, target_latency=2.0)
+    for _ in range(20):
+        scheduler.record('fast.example', 200, 0.1)
+    assert scheduler.domains['fast.example'].delay == 0.5
+
+    scheduler.record('fragile.example', 429, 0.1)
+    assert scheduler.domains['fragile.example'].delay == 6.0
+    scheduler.record('fragile.example', None, 15.0)
+    assert scheduler.domains['fragile.example'].delay == 12.0
+    scheduler.record('fragile.example', 503, 0.1)
+    assert scheduler.domains['fragile.example'].delay == 20.0
+    assert scheduler.domains['fragile.example'].throttled == 2
+
+    # A slow answer spaces requests at least as far apart as it took
+    scheduler.record('slow.example', 200, 8.0)
+    assert scheduler.domains['slow.example'].delay == 8.0
+
+@pytest.mark.asyncio
+async def test_requests_to_a_domain_are_spaced_in_order():
+    scheduler = PolitenessScheduler(initial_delay=0.05, min_delay=0.05)
+    started = []
+
+    async def request(n):
+        async with scheduler.slot('example.com'):
+            started.append((n, time.monotonic()))
+
+    await asyncio.gather(*(request(n) for n in range(4)))
+    assert [n for n, _ in started] == [0, 1, 2, 3]
+    gaps = [b - a for (_, a), (_, b) in zip(started, started[1:])]
+    assert all(gap >= 0.045 for gap in gaps)
+
+@pytest.mark.asyncio
+async def test_retry_after_holds_the_domain_but_not_others():
+    scheduler = PolitenessScheduler(initial_delay=0.0, min_delay=0.0)
+    async with scheduler.slot('busy.example'):
+        scheduler.record('busy.example', 429, 0.1, retry_after='1')
+
+    started = time.monotonic()
+    async with scheduler.slot('other.example'):
+        assert time.monotonic() - started < 0.5
+    async with scheduler.slot('busy.example'):
+        assert time.monotonic() - started >= 0.9
+
+@pytest.mark.asyncio
+async def test_global_cap_limits_requests_in_flight():
+    scheduler = PolitenessScheduler(max_concurrent=2, initial_delay=0.0, min_delay=0.0)
+    peak = 0
+
+    async def request(domain):
+        nonlocal peak
+        async with scheduler.slot(domain):
+            peak = max(peak, scheduler.in_flight)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(request(f'site{n}.example') for n in range(6)))
+    assert peak == 2
+    assert scheduler.stats()['in_flight'] == 0
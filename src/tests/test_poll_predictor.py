@@ -0,0 +1,45 @@
+"""Tests for the publication-rate poll predictor."""
+import datetime
+from ..core.poll_predictor import PublishRhythm, PollPredictor
+
+UTC = datetime.timezone.utc
+START = datetime.datetime(2024, 1, 1, tzinfo=UTC)
+
+def test_regular_feed_predicts_next_gap():
+    rhythm = PublishRhythm()
+    for i in range(48):
+        rhythm.observe(START + datetime.timedelta(hours=i))
+    assert abs(rhythm.mean_gap - 3600) < 1
+    last = START + datetime.timedelta(hours=47)
+    delay = rhythm.next_delay(last + datetime.timedelta(minutes=10))
+    assert 40 * 60 < delay < 60 * 60
+
+def test_quiet_hours_push_prediction_later():
+    rhythm = PublishRhythm()
+    # Publishes every 30 minutes between 08:00 and 20:00 UTC for two weeks
+    for day in range(14):
+        for slot in range(24):
+            rhythm.observe(START + datetime.timedelta(days=day, hours=8, minutes=30 * slot))
+    evening = START + datetime.timedelta(days=13, hours=20)
+    morning = START + datetime.timedelta(days=13, hours=10)
+    assert rhythm.predict_after(evening) - evening > 4 * (rhythm.predict_after(morning) - morning)
+
+def test_duplicate_timestamps_count_once():
+    rhythm = PublishRhythm()
+    rhythm.observe(START)
+    rhythm.observe(START)
+    rhythm.observe(START + datetime.timedelta(hours=2))
+    assert rhythm.observations == 2
+    assert rhythm.mean_gap == 7200
+
+def test_predictor_needs_history_and_clamps():
+    predictor = PollPredictor(min_interval=60, max_interval=600, min_observations=5)
+    feed = "https://predict.example.com/feed"
+    predictor.observe_many(feed, [START + datetime.timedelta(hours=i) for i in range(3)])
+    assert predictor.next_delay(feed, START + datetime.timedelta(hours=2)) is None
+    predictor.observe_many(feed, [START + datetime.timedelta(hours=i) for i in range(3, 10)])
+    assert predictor.next_delay(feed, START + datetime.timedelta(hours=9)) == 600
+    predictor.max_interval = 1800
+    # Polls a fraction of the hourly gap apart by default
+    assert 300 < predictor.next_delay(feed, START + datetime.timedelta(hours=9)) < 1200
+    assert predictor.next_delay("https://unknown.example.com/feed") is None
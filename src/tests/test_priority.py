@@ -0,0 +1,33 @@
+"""Tests for enrichment lane scoring."""
+import datetime
+from ..core.priority import EnrichmentPrioritizer, FAST, BACKLOG
+
+NOW = datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.timezone.utc)
+
+def test_fresh_stories_from_quiet_sources_take_the_fast_lane():
+    prioritizer = EnrichmentPrioritizer(fast_threshold=0.6, recency_horizon=6 * 3600)
+    fresh = prioritizer.score('Talks resume', 'Delegations meet', NOW - datetime.timedelta(minutes=5), 100, now=NOW)
+    stale = prioritizer.score('Talks resume', 'Delegations meet', NOW - datetime.timedelta(hours=7), 100, now=NOW)
+    noisy = prioritizer.score('Talks resume', 'Delegations meet', NOW - datetime.timedelta(minutes=5), 10, now=NOW)
+    assert prioritizer.lane(fresh) == FAST
+    assert prioritizer.lane(stale) == BACKLOG
+    assert fresh > noisy > stale
+
+def test_breaking_keywords_raise_the_score():
+    prioritizer = EnrichmentPrioritizer()
+    published = NOW - datetime.timedelta(hours=3)
+    plain = prioritizer.score('Parliament sits', '', published, 50, now=NOW)
+    breaking = prioritizer.score('BREAKING: missile strike reported', '', published, 50, now=NOW)
+    assert breaking == plain + EnrichmentPrioritizer.KEYWORD_WEIGHT
+    # Naive timestamps count as UTC
+    assert prioritizer.score('Parliament sits', '', published.replace(tzinfo=None), 50, now=NOW) == plain
+
+def test_latency_percentiles_per_lane():
+    prioritizer = EnrichmentPrioritizer()
+    for latency in range(1, 101):
+        prioritizer.record(FAST, latency / 10)
+    prioritizer.record(BACKLOG, 60.0)
+    stats = prioritizer.percentiles()
+    assert stats[FAST] == {'count': 100, 'p50': 5.0, 'p90': 9.0, 'p99': 9.9}
+    assert stats[BACKLOG]['p50'] == stats[BACKLOG]['p99'] == 60.0
+    assert 'fast lane 100 enriched' in prioritizer.report()
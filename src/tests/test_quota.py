@@ -0,0 +1,52 @@
+"""Tests for the Gemini quota scheduler."""
+import pytest
+import asyncio
+from ..utils.quota import QuotaScheduler
+
+@pytest.mark.asyncio
+async def test_requests_spread_over_keys():
+    scheduler = QuotaScheduler(["a", "b"], per_minute=2, per_day=100)
+    keys = [await scheduler.acquire("model") for _ in range(4)]
+
+    # Each key's burst is used before anyone has to wait
+    assert sorted(keys) == ["a", "a", "b", "b"]
+    remaining = scheduler.stats()["remaining"]
+    assert remaining["key0"]["model"]["minute"] < 1
+    assert remaining["key1"]["model"]["minute"] < 1
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_by_priority():
+    scheduler = QuotaScheduler(["a"], per_minute=600, per_day=10000)
+    quota = scheduler._quota("a", "model")
+    quota.minute.tokens = 0
+    order = []
+
+    async def request(name, priority):
+        await scheduler.acquire("model", priority)
+        order.append(name)
+
+    tasks = [asyncio.create_task(request("background", 5))]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(request("urgent", 0)))
+    await asyncio.sleep(0)
+    assert scheduler.stats()["waiting"]["model"] == 2
+
+    await asyncio.wait_for(asyncio.gather(*tasks), 1)
+    assert order == ["urgent", "background"]
+
+@pytest.mark.asyncio
+async def test_models_have_separate_buckets():
+    scheduler = QuotaScheduler(["a"], per_minute=1, per_day=100, model_limits={"fast": (5, 100)})
+    await scheduler.acquire("slow")
+    # "slow" is exhausted but "fast" still has quota
+    assert await asyncio.wait_for(scheduler.acquire("fast"), 0.1) == "a"
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(scheduler.acquire("slow"), 0.1)
+
+@pytest.mark.asyncio
+async def test_penalized_key_is_skipped():
+    scheduler = QuotaScheduler(["a", "b"], per_minute=10, per_day=100)
+    scheduler.penalize("a", "model", seconds=60)
+    keys = {await scheduler.acquire("model") for _ in range(3)}
+    assert keys == {"b"}
+    assert scheduler.stats()["remaining"]["key0"]["model"]["blocked_for"] > 0
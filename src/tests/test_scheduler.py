@@ -0,0 +1,85 @@
+"""Tests for the central feed poll scheduler."""
+import pytest
+import asyncio
+from ..core.feed_watcher import FeedConfiguration
+from ..core.scheduler import FeedScheduler
+
+class FakeWatcher:
+    """Minimal stand-in for FeedWatcher that records polls."""
+    def __init__(self, max_concurrent_feeds=2):
+        self.config = FeedConfiguration(max_concurrent_feeds=max_concurrent_feeds, startup_spread=0.0)
+        self.polls = []
+        self.active = 0
+        self.peak = 0
+
+    async def poll_feed(self, feed_url):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        self.polls.append(feed_url)
+        return True
+
+    def next_poll_delay(self, feed_url, consecutive_errors=0):
+        return 0.05
+
+@pytest.mark.asyncio
+async def test_scheduler_bounds_concurrency():
+    watcher = FakeWatcher(max_concurrent_feeds=2)
+    scheduler = FeedScheduler(watcher)
+    scheduler.add_feeds(f"https://example.com/feed{i}" for i in range(6))
+
+    task = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(0.2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert watcher.peak <= 2
+    assert set(watcher.polls) == {f"https://example.com/feed{i}" for i in range(6)}
+    stats = scheduler.stats()
+    assert stats['feeds'] == 6
+    assert stats['polls_completed'] >= 6
+
+@pytest.mark.asyncio
+async def test_scheduler_spreads_startup_and_removes_feeds():
+    watcher = FakeWatcher()
+    scheduler = FeedScheduler(watcher, startup_spread=10.0)
+    scheduler.add_feeds(["https://example.com/a", "https://example.com/b"])
+    scheduler.remove_feed("https://example.com/a")
+
+    task = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(0.1)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # Feed "a" was removed; feed "b" is not due until 5s into the startup window
+    assert watcher.polls == []
+    assert scheduler.stats()['scheduled'] == 1
+
+@pytest.mark.asyncio
+async def test_scheduler_readding_a_feed_polls_it_once_per_cycle():
+    watcher = FakeWatcher()
+    scheduler = FeedScheduler(watcher)
+    scheduler.add_feeds(["https://example.com/a", "https://example.com/a", "https://example.com/b"])
+    assert scheduler.stats()['feeds'] == 2
+    assert scheduler.stats()['scheduled'] == 2
+
+    scheduler.remove_feed("https://example.com/a")
+    scheduler.add_feed("https://example.com/a")
+
+    task = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(0.03)
+    # Removed and re-added while its first poll is in flight
+    scheduler.remove_feed("https://example.com/b")
+    scheduler.add_feed("https://example.com/b")
+    await asyncio.sleep(0.2)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # Each feed is polled about every 60ms; a stale entry would double that
+    assert watcher.polls.count("https://example.com/a") <= 5
+    assert watcher.polls.count("https://example.com/b") <= 5
+    assert scheduler.stats()['scheduled'] <= 4
@@ -0,0 +1,79 @@
+"""Tests for the scraped article cache and request coalescing."""
+import pytest
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+from ..utils.scrape_cache import ScrapeCache
+from ..utils.scraper import ArticleScraper, Page
+
+BODY = 'Delegations met in Geneva on Monday to resume talks on the ceasefire.'
+ARTICLE = {'title': 'Title', 'text': BODY, 'authors': [], 'publish_date': None,
+           'top_image': None, 'meta_description': None}
+
+def test_articles_are_fresh_then_need_revalidation(tmp_path):
+    cache = ScrapeCache(str(tmp_path / 'cache.db'), fresh_for=60, ttl=3600)
+    cache.put('https://example.com/a', ARTICLE, etag='"v1"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT')
+    cached = cache.get('https://example.com/a')
+    assert cached.article == ARTICLE
+    assert cached.fresh
+
+    with patch('src.utils.scrape_cache.time.time', return_value=time.time() + 120):
+        stale = cache.get('https://example.com/a')
+        assert not stale.fresh
+        assert stale.conditional_headers() == {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'
+        }
+        cache.touch('https://example.com/a')
+        assert cache.get('https://example.com/a').fresh
+
+    with patch('src.utils.scrape_cache.time.time', return_value=time.time() + 7200):
+        assert cache.get('https://example.com/a') is None
+    cache.close()
+
+def test_least_recently_used_are_evicted(tmp_path):
+    cache = ScrapeCache(str(tmp_path / 'cache.db'), max_entries=10)
+    for i in range(11):
+        cache.put(f'https://example.com/{i}', ARTICLE)
+    assert len(cache) == 9
+    assert cache.get('https://example.com/0') is None
+    assert cache.get('https://example.com/10') is not None
+    cache.close()
+
+@pytest.mark.asyncio
+async def test_concurrent_scrapes_share_one_download(tmp_path):
+    cache = ScrapeCache(str(tmp_path / 'cache.db'))
+    scraper = ArticleScraper(cache)
+
+    async def download(url, headers):
+        await asyncio.sleep(0.05)
+        return Page(200, '<html></html>', '"v1"', None)
+
+    with patch.object(scraper, '_download', side_effect=download) as downloaded, \
+         patch.object(scraper.extraction, 'extract', new_callable=AsyncMock, return_value=('newspaper', dict(ARTICLE))):
+        results = await asyncio.gather(*(scraper.scrape_article('https://example.com/a') for _ in range(3)))
+        assert all(result['text'] == BODY for result in results)
+        assert downloaded.call_count == 1
+        assert cache.coalesced == 2
+
+        # Repeated requests are served from the cache
+        await scraper.scrape_article('https://example.com/a')
+        assert downloaded.call_count == 1
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+    cache.close()
+
+@pytest.mark.asyncio
+async def test_stale_article_is_revalidated(tmp_path):
+    cache = ScrapeCache(str(tmp_path / 'cache.db'), fresh_for=0)
+    cache.put('https://example.com/a', ARTICLE, etag='"v1"')
+    scraper = ArticleScraper(cache)
+
+    with patch.object(scraper, '_download', new_callable=AsyncMock, return_value=Page(304, None, None, None)) as downloaded, \
+         patch.object(scraper.extraction, 'extract', new_callable=AsyncMock) as extract:
+        assert await scraper.scrape_article('https://example.com/a') == ARTICLE
+        assert downloaded.call_args.args[1] == {'If-None-Match': '"v1"'}
+        extract.assert_not_called()
+    assert cache.stats()['revalidated'] == 1
+    assert cache.hit_rate == 1.0
+    cache.close()
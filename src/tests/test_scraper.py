@@ -0,0 +1,161 @@
+"""Tests for article extraction."""
+import asyncio
+import os
+import signal
+import pytest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+from ..utils import extraction as extraction_module
+from ..utils.scraper import ArticleScraper, Page
+from ..utils.extraction import ExtractionPool, extract_article, extract_with_lxml, extract_with_newspaper
+
+PARAGRAPH = ('Delegations from both governments met in Geneva on Monday to resume talks on a ceasefire '
+             'that collapsed last month after renewed shelling along the border.')
+PAGE = f"""<html><head>
+<title>Fallback title</title>
+<meta property="og:title" content="Talks resume in Geneva">
+<meta property="og:image" content="https://example.com/image.jpg">
+</head><body>
+<nav><p>{'Navigation ' * 20}</p></nav>
+<article><p>{PARAGRAPH}</p><p>Too short to count.</p><p>{PARAGRAPH}</p></article>
+<script>var x = 1;</script>
+</body></html>"""
+
+# Hand-written pages in common CMS layouts; not a measure of extraction quality on real sites
+LAYOUTS = sorted((Path(__file__).parent / 'fixtures' / 'extraction_layouts').glob('*.html'))
+
+def test_lxml_extractor_reads_main_article():
+    content = extract_with_lxml(PAGE)
+    assert content['title'] == 'Talks resume in Geneva'
+    assert content['top_image'] == 'https://example.com/image.jpg'
+    assert content['text'] == f'{PARAGRAPH}\n\n{PARAGRAPH}'
+
+def test_lxml_extractor_drops_boilerplate_and_link_lists():
+    page = f"""<html><body>
+<div class="share-bar"><p>{'Share this story with your friends and followers. ' * 3}</p></div>
+<div class="story-body"><p>{PARAGRAPH}</p><p>{PARAGRAPH}</p></div>
+<div class="advert-slot"><p>{'Advertisement, please support our journalism today. ' * 3}</p></div>
+<div class="story-body"><p>{PARAGRAPH}</p></div>
+<div class="most-read"><p><a href="/a">{'A headline that is only a link to another page. ' * 3}</a></p></div>
+<div id="comments"><p>{'I disagree with every word of this article, frankly. ' * 3}</p></div>
+</body></html>"""
+    content = extract_with_lxml(page)
+    # The second body section is a scored sibling of the first, so it is kept
+    assert content['text'].split('\n\n') == [PARAGRAPH] * 3
+    assert content['title'] is None
+
+@pytest.mark.parametrize('path', LAYOUTS, ids=lambda path: path.stem)
+def test_lxml_extractor_handles_common_layouts(path):
+    html = path.read_text(encoding='utf-8')
+    reference = extract_with_newspaper('https://example.com/', html)
+    content = extract_with_lxml(html)
+    assert content['title'] == reference['title']
+    assert content['top_image']
+    paragraphs = content['text'].split('\n\n')
+    assert len(paragraphs) >= 5
+    # Every paragraph found is one newspaper found too
+    assert all(paragraph in reference['text'] for paragraph in paragraphs)
+
+def test_extractors_fall_back_on_the_same_page():
+    def empty(url, html):
+        return {'title': 'Title', 'text': ''}
+
+    calls = []
+    def fallback(url, html):
+        calls.append(html)
+        return {'title': 'Title', 'text': PARAGRAPH}
+
+    with patch.object(extraction_module, 'EXTRACTORS', [('first', empty), ('second', fallback)]):
+        assert extract_article('https://example.com/a', PAGE) == ('second', {'title': 'Title', 'text': PARAGRAPH})
+    assert calls == [PAGE]
+
+@pytest.mark.asyncio
+async def test_page_is_downloaded_once_and_winner_recorded(scrape_cache, extraction):
+    scraper = ArticleScraper(scrape_cache, extraction)
+    with patch.object(scraper, '_download', new_callable=AsyncMock, return_value=Page(200, PAGE, None, None)) as downloaded, \
+         patch.object(extraction_module, 'EXTRACTORS', [('newspaper', lambda url, html: None),
+                                                     ('lxml', lambda url, html: extract_with_lxml(html))]):
+        content = await scraper.scrape_article('https://example.com/a')
+    assert downloaded.call_count == 1
+    assert content['title'] == 'Talks resume in Geneva'
+    assert scraper.extractor_stats() == {'example.com': {'lxml': 1}}
+
+@pytest.mark.asyncio
+async def test_workers_are_recycled_past_the_memory_ceiling():
+    pool = ExtractionPool(workers=1, max_jobs=10, max_rss_mb=0)
+    try:
+        extractor, content = await pool.extract('https://example.com/a', PAGE)
+        assert extractor is not None
+        assert PARAGRAPH in content['text']
+        # Any worker is over a 0 MB ceiling, so the pool was replaced after the job
+        assert pool.stats()['recycles'] == 1
+        assert pool._executor is None
+        await pool.extract('https://example.com/b', PAGE)
+        assert pool.stats()['jobs'] == 2
+        assert pool.stats()['pending'] == 0
+    finally:
+        pool.shutdown()
+
+@pytest.mark.asyncio
+async def test_worker_survives_normal_sized_pages():
+    pool = ExtractionPool(workers=1, max_jobs=100)
+    try:
+        await pool.extract('https://example.com/0', PAGE)
+        workers = set(pool._executor._processes)
+        for n in range(1, 20):
+            await pool.extract(f'https://example.com/{n}', PAGE)
+        # Well under the job limit and the memory ceiling, so the same worker did every page
+        assert pool.stats()['recycles'] == 0
+        assert set(pool._executor._processes) == workers
+    finally:
+        pool.shutdown()
+
+@pytest.mark.asyncio
+async def test_jobs_from_a_replaced_pool_do_not_replace_the_new_one():
+    pool = ExtractionPool(workers=1, max_jobs=10, max_rss_mb=0)
+    try:
+        await asyncio.gather(*(pool.extract(f'https://example.com/{n}', PAGE) for n in range(3)))
+        # All three ran in the first pool, which is replaced once
+        assert pool.stats()['recycles'] == 1
+    finally:
+        pool.shutdown()
+
+@pytest.mark.asyncio
+async def test_pool_is_replaced_after_max_jobs():
+    pool = ExtractionPool(workers=2, max_jobs=2)
+    try:
+        results = await asyncio.wait_for(
+            asyncio.gather(*(pool.extract(f'https://example.com/{n}', PAGE) for n in range(9))), timeout=60
+        )
+        assert all(PARAGRAPH in content['text'] for _, content in results)
+        # 4 jobs per pool of 2 workers, so the 5th and 9th jobs went to fresh pools
+        assert pool.stats()['recycles'] == 2
+        assert pool.stats()['jobs'] == 9
+    finally:
+        pool.shutdown()
+
+@pytest.mark.asyncio
+async def test_dead_worker_does_not_break_later_extractions():
+    pool = ExtractionPool(workers=1, max_jobs=100)
+    try:
+        await pool.extract('https://example.com/a', PAGE)
+        for pid in list(pool._executor._processes):
+            os.kill(pid, signal.SIGKILL)
+        await asyncio.sleep(0.5)
+        extractor, content = await asyncio.wait_for(pool.extract('https://example.com/b', PAGE), timeout=60)
+        assert PARAGRAPH in content['text']
+        assert pool.stats()['recycles'] == 1
+        extractor, content = await asyncio.wait_for(pool.extract('https://example.com/c', PAGE), timeout=60)
+        assert PARAGRAPH in content['text']
+    finally:
+        pool.shutdown()
+
+def test_beautifulsoup_still_follows_lxml():
+    def nothing(url, html):
+        return None
+
+    with patch.object(extraction_module, 'EXTRACTORS', [('newspaper', nothing)] + extraction_module.EXTRACTORS[1:]), \
+         patch.object(extraction_module, 'extract_with_lxml', return_value=None):
+        extractor, content = extract_article('https://example.com/a', PAGE)
+    assert extractor == 'beautifulsoup'
+    assert PARAGRAPH in content['text']
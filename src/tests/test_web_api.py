@@ -35,4 +35,11 @@ def test_error_handling(client):
     
     # Test malformed request
     response = client.post("/api/news")  # POST not allowed
-    assert response.status_code in [404, 405]
\ No newline at end of file
+    assert response.status_code in [404, 405]
+
+
+def test_websub_unknown_subscription(client):
+    response = client.get("/websub/unknown", params={'hub.mode': 'subscribe', 'hub.topic': 'x', 'hub.challenge': 'c'})
+    assert response.status_code == 404
+    response = client.post("/websub/unknown", content=b"<rss/>")
+    assert response.status_code == 410
@@ -0,0 +1,117 @@
+"""Tests for WebSub subscriptions against a local stand-in hub."""
+import asyncio
+import hashlib
+import hmac
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from ..core.feed_state import FeedStateStore
+from ..core.feed_parser import parse_feed
+from ..core.websub import WebSubManager
+from ..utils.http import http_client
+
+FEED_URL = "https://push.example.com/feed"
+
+HUB_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
+    <channel>
+        <title>Push Feed</title>
+        <atom:link rel="hub" href="{hub}"/>
+        <atom:link rel="self" href="https://push.example.com/feed.xml"/>
+        <item>
+            <title>Pushed story</title>
+            <link>https://push.example.com/story</link>
+            <pubDate>Wed, 03 Jan 2024 00:00:00 GMT</pubDate>
+        </item>
+    </channel>
+</rss>
+"""
+
+class FakeWatcher:
+    def __init__(self):
+        self.state = FeedStateStore()
+        self.received = []
+
+    async def process_feed_content(self, feed_url, content):
+        self.received.append((feed_url, content))
+
+def _callback_app(manager):
+    """Mirror of the web app's WebSub routes."""
+    async def verify(request):
+        params = request.query
+        body = manager.verify(request.match_info['token'], params.get('hub.mode'), params.get('hub.topic'),
+                              params.get('hub.challenge'), params.get('hub.lease_seconds'))
+        return web.Response(status=404) if body is None else web.Response(text=body)
+
+    async def deliver(request):
+        accepted = manager.deliver(request.match_info['token'], await request.read(),
+                                   request.headers.get('X-Hub-Signature'))
+        return web.Response(status=202 if accepted else 410)
+
+    app = web.Application()
+    app.router.add_get('/websub/{token}', verify)
+    app.router.add_post('/websub/{token}', deliver)
+    return app
+
+def _hub_app(subscribers):
+    """Stand-in hub that verifies intent right after accepting a subscription."""
+    async def subscribe(request):
+        form = await request.post()
+        async def verify_intent():
+            params = {'hub.mode': 'subscribe', 'hub.topic': form['hub.topic'],
+                      'hub.challenge': 'challenge-123', 'hub.lease_seconds': '600'}
+            body = await http_client.get_text(form['hub.callback'], params=params)
+            if body == 'challenge-123':
+                subscribers[form['hub.topic']] = (form['hub.callback'], form['hub.secret'])
+        asyncio.get_running_loop().create_task(verify_intent())
+        return web.Response(status=202)
+
+    app = web.Application()
+    app.router.add_post('/', subscribe)
+    return app
+
+async def _publish(callback, secret, body, signature=None):
+    if signature is None:
+        signature = 'sha1=' + hmac.new(secret.encode(), body, hashlib.sha1).hexdigest()
+    async with http_client.request('POST', callback, data=body,
+                                   headers={'X-Hub-Signature': signature}) as response:
+        return response.status
+
+@pytest.mark.asyncio
+async def test_subscribe_verify_and_receive_push():
+    watcher = FakeWatcher()
+    manager = WebSubManager()
+    subscribers = {}
+    async with TestServer(_callback_app(manager)) as callback_server, \
+            TestServer(_hub_app(subscribers)) as hub_server:
+        hub_url = str(hub_server.make_url('/'))
+        manager.attach(watcher, str(callback_server.make_url('/websub')))
+
+        manager.discover(FEED_URL, parse_feed(HUB_FEED.format(hub=hub_url)))
+        for _ in range(50):
+            if manager.is_active(FEED_URL):
+                break
+            await asyncio.sleep(0.05)
+        assert manager.is_active(FEED_URL)
+        assert watcher.state.get(FEED_URL).hub_url == hub_url
+        assert watcher.state.get(FEED_URL).topic_url == "https://push.example.com/feed.xml"
+
+        callback, secret = subscribers["https://push.example.com/feed.xml"]
+        body = HUB_FEED.format(hub=hub_url).encode('utf-8')
+        assert await _publish(callback, secret, body) == 202
+        assert await _publish(callback, secret, body, signature='sha1=forged') == 202
+        await asyncio.sleep(0.05)
+        assert watcher.received == [(FEED_URL, body.decode('utf-8'))]
+        assert manager.stats() == {'active': 1, 'deliveries': 1}
+
+        assert await _publish(callback.replace(manager.token(FEED_URL), 'unknown'), secret, body) == 410
+        await manager.stop()
+        await http_client.close()
+
+def test_feed_without_hub_is_not_subscribed():
+    watcher = FakeWatcher()
+    manager = WebSubManager()
+    manager.attach(watcher, "https://monitor.example.com/websub")
+    manager.discover(FEED_URL, parse_feed(HUB_FEED.replace('rel="hub"', 'rel="alternate"').format(hub='x')))
+    assert not manager.is_active(FEED_URL)
+    assert watcher.state.get(FEED_URL).hub_url is None
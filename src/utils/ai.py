@@ -1,13 +1,16 @@
 """AI processing utilities using Google's Gemini API."""
 import os
 import re
+import json
 import asyncio
 import time
 import logging
 from datetime import datetime
-from typing import Dict, Tuple, Optional, List
+from typing import Any, Dict, Tuple, Optional, List
 from google import genai
-from config.settings import GEMINI_API_KEYS
+from .llm_cache import LLMCache, llm_cache
+from .quota import QuotaExhausted, QuotaScheduler, quota_scheduler
+from config.settings import AI_CALL_TIMEOUT, AI_MAX_CONCURRENT_CALLS, AI_ENRICH_MODEL, AI_BATCH_CALL_TIMEOUT
 
 # Configure logging
 logging.basicConfig(
@@ -16,125 +19,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Rate limiting constants
-RPM_LIMIT = 60  # Requests per minute
-RPD_LIMIT = 1500  # Requests per day
-MINUTE_WINDOW = 60  # Window size in seconds
-DAY_WINDOW = 86400  # 24 hours in seconds
-
-# Initialize rate limiting variables
-last_request_time = time.time()
-requests_this_minute = 0
-requests_today = 0
-day_start_time = time.time()
-
-class APIKeyManager:
-    """Manages multiple API keys with rate limiting."""
-    def __init__(self, api_keys: List[str]):
-        self.api_keys = api_keys
-        self.current_key_index = 0
-        self.key_states = [{
-            'last_request_time': 0,
-            'requests_this_minute': 0,
-            'requests_today': 0,
-            'day_start_time': time.time(),
-            'backoff_until': 0
-        } for _ in api_keys]
-        self._lock = asyncio.Lock()
-        
-    def get_current_key(self) -> str:
-        """Get current API key."""
-        return self.api_keys[self.current_key_index]
-    
-    async def rotate_key(self):
-        """Rotate to next available API key."""
-        async with self._lock:
-            original_index = self.current_key_index
-            while True:
-                self.current_key_index = (self.current_key_index + 1) % len(self.api_keys)
-                if self.key_states[self.current_key_index]['backoff_until'] <= time.time():
-                    break
-                if self.current_key_index == original_index:
-                    # All keys are in backoff, wait for the one with shortest backoff
-                    min_backoff = min(state['backoff_until'] for state in self.key_states)
-                    wait_time = min_backoff - time.time()
-                    if wait_time > 0:
-                        logger.warning(f"All API keys are rate limited. Waiting {wait_time:.1f}s")
-                        await asyncio.sleep(wait_time)
-                    break
-            return self.get_current_key()
-    
-    async def wait_for_rate_limit(self) -> bool:
-        """Check and wait for rate limits. Returns True if key rotation needed."""
-        current_time = time.time()
-        state = self.key_states[self.current_key_index]
-        
-        # Reset daily counter if needed
-        if current_time - state['day_start_time'] >= 86400:  # 24 hours
-            state['requests_today'] = 0
-            state['day_start_time'] = current_time
-        
-        # Handle daily limit
-        if state['requests_today'] >= 1500:  # Daily limit
-            state['backoff_until'] = state['day_start_time'] + 86400
-            return True
-        
-        # Reset minute counter if needed
-        time_since_last = current_time - state['last_request_time']
-        if time_since_last >= 60:
-            state['requests_this_minute'] = 0
-            state['last_request_time'] = current_time
-        
-        # Handle minute limit
-        if state['requests_this_minute'] >= 15:  # Per-minute limit
-            state['backoff_until'] = current_time + (60 - time_since_last)
-            return True
-        
-        # Update counters
-        state['requests_this_minute'] += 1
-        state['requests_today'] += 1
-        state['last_request_time'] = current_time
-        return False
-
-class ContentProcessor:
-    """Handles content processing with Gemini API."""
-    
-    def __init__(self):
-        self.key_manager = APIKeyManager(GEMINI_API_KEYS)
-        self._init_client()
-        self.model = "gemini-2.0-flash-thinking-exp-01-21"
-    
-    def _init_client(self):
-        """Initialize or reinitialize the Gemini client with current API key."""
-        self.client = genai.Client(api_key=self.key_manager.get_current_key())
-    
-    async def process_content(self, text: str, url: str, is_title: bool = False, instruction: Optional[str] = None) -> Tuple[str, str]:
-        """Process content with Gemini API."""
-        try:
-            rotate_needed = await self.key_manager.wait_for_rate_limit()
-            if rotate_needed:
-                await self.key_manager.rotate_key()
-                self._init_client()
-
-            # Validate URL parameter
-            if not isinstance(url, str) or not url.startswith(('http://', 'https://')):
-                logger.error(f"Invalid URL provided: {url}")
-                raise ValueError(f"Invalid URL format: {url}")
-
-            # Always scrape full article content from URL
-            from .scraper import scrape_article
-            logger.info(f"Attempting to scrape article content from: {url}")
-            article_data = await scrape_article(url)
-            if article_data and article_data.get('text'):
-                logger.info(f"Successfully scraped article content from: {url}")
-                text = f"{article_data.get('title', '')}\n\n{article_data['text']}"
-            else:
-                logger.error(f"Failed to scrape required article content from: {url}")
-                raise ValueError(f"Could not scrape content from {url}")
-
-            await wait_for_rate_limit()
-            
-            prompt = f"""Analyze this text and provide three things:
+def build_content_prompt(text: str, is_title: bool = False, instruction: Optional[str] = None) -> str:
+    """Prompt for the translation, emoji and summary call."""
+    return f"""Analyze this text and provide three things:
 
 1. TRANSLATION & FORMATTING:
    - ALWAYS translate non-English text to clear, natural English
@@ -219,58 +106,9 @@ EMOJI_1: [first specific emoji]
 EMOJI_2: [second specific emoji]
 TEXT: [processed text]"""
 
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt
-            )
-
-            # Parse response
-            result = response.text.strip().split('\n')
-            emoji1 = None
-            emoji2 = None
-            processed_text = text  # Default to original text
-            
-            for line in result:
-                line = line.strip()
-                if line.startswith('EMOJI_1:'):
-                    emoji1 = line.split('EMOJI_1:')[1].strip()
-                elif line.startswith('EMOJI_2:'):
-                    emoji2 = line.split('EMOJI_2:')[1].strip()
-                elif line.startswith('TEXT:'):
-                    processed_text = line.split('TEXT:')[1].strip()
-            
-            # Return combined emoji string and processed text
-            emoji_str = f"{emoji1 or '🌎'}{emoji2 or '📰'}"
-            return emoji_str, processed_text
-
-        except Exception as e:
-            error_msg = str(e)
-            if "RESOURCE_EXHAUSTED" in error_msg:
-                logger.warning("Rate limit exceeded, taking extended break")
-                await asyncio.sleep(60)  # Take a minute break
-                return "⏳💤", text
-            elif "INVALID_ARGUMENT" in error_msg:
-                logger.error(f"Invalid input: {error_msg}")
-                return "⚠️❌", text
-            else:
-                logger.error(f"Unexpected Gemini API error: {error_msg}")
-                return "🔄❌", text
-
-    async def process_content_with_tags(self, text: str, url: str, is_title: bool = False, instruction: Optional[str] = None) -> Tuple[str, str, list[str], list[str], list[str]]:
-        """Process content and generate tags with Gemini API."""
-        emoji_str, processed_text = await self.process_content(text, url, is_title, instruction)
-        topics, geography, events = await generate_tags(text)
-        return emoji_str, processed_text, topics, geography, events
-
-    async def analyze_sentiment_and_bias(self, text: str) -> Tuple[float, str, float]:
-        """Analyze sentiment and bias of content using Gemini API."""
-        try:
-            rotate_needed = await self.key_manager.wait_for_rate_limit()
-            if rotate_needed:
-                await self.key_manager.rotate_key()
-                self._init_client()
-
-            prompt = f"""Analyze this text and provide a detailed sentiment and bias analysis:
+def build_sentiment_prompt(text: str) -> str:
+    """Prompt for the sentiment and bias call."""
+    return f"""Analyze this text and provide a detailed sentiment and bias analysis:
 
 1. SENTIMENT SCORE (-1.0 to 1.0):
    Consider these aspects:
@@ -329,12 +167,477 @@ SENTIMENT: [score]
 BIAS_CATEGORY: [category]
 BIAS_SCORE: [score]"""
 
-            response = self.client.models.generate_content(
-                model=self.model,
-                contents=prompt
-            )
+TAGS_PROMPT = """Analyze this text and generate three sets of tags:
+
+1. TOPICS (e.g., Politics, Economy, Technology, etc.)
+2. GEOGRAPHY (Countries, Regions, Cities mentioned)
+3. EVENT TYPES (e.g., Election, Conflict, Treaty, Summit, etc.)
 
-            result = response.text.strip().split('\n')
+Rules for tag generation:
+- Each tag should be a single word or hyphenated phrase
+- Convert multi-word concepts into hyphenated form (e.g., "artificial intelligence" → "artificial-intelligence")
+- Use lowercase for all tags
+- Include only tags that are explicitly or strongly implied in the text
+- Maximum 5 tags per category
+- For geography, prefer country names over city names unless the city is the main focus
+
+Example response format:
+TOPICS: economy, technology, cybersecurity
+GEOGRAPHY: united-states, china, european-union
+EVENTS: trade-agreement, diplomatic-summit
+
+Text to analyze: {text}
+
+Respond exactly in this format:
+TOPICS: [comma-separated tags]
+GEOGRAPHY: [comma-separated tags]
+EVENTS: [comma-separated tags]"""
+
+BIAS_CATEGORIES = [
+    'western', 'russian', 'ukrainian', 'chinese', 'israeli', 'palestinian', 'turkish',
+    'arab', 'indian', 'african', 'iranian', 'latin-american', 'neutral'
+]
+
+# Bump a template's version whenever its prompt changes, so cached responses to
+# the old prompt stop matching. Batched enrich results are cached per article
+# under the single-article enrich template.
+PROMPT_VERSIONS = {
+    'content': 1,
+    'sentiment': 1,
+    'tags': 1,
+    'enrich': 1
+}
+
+# Response schema for the single-call enrich mode
+ENRICH_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'title': {'type': 'STRING'},
+        'summary': {'type': 'STRING'},
+        'emoji_location': {'type': 'STRING'},
+        'emoji_topic': {'type': 'STRING'},
+        'topics': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'geography': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'events': {'type': 'ARRAY', 'items': {'type': 'STRING'}},
+        'sentiment': {'type': 'NUMBER'},
+        'bias_category': {'type': 'STRING', 'enum': BIAS_CATEGORIES},
+        'bias_score': {'type': 'NUMBER'}
+    },
+    'required': [
+        'title', 'summary', 'emoji_location', 'emoji_topic', 'topics', 'geography',
+        'events', 'sentiment', 'bias_category', 'bias_score'
+    ]
+}
+
+# Response schema for batched enrichment; ids tie each result to its article
+ENRICH_BATCH_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'articles': {
+            'type': 'ARRAY',
+            'items': {
+                'type': 'OBJECT',
+                'properties': {'id': {'type': 'STRING'}, **ENRICH_SCHEMA['properties']},
+                'required': ['id', *ENRICH_SCHEMA['required']]
+            }
+        }
+    },
+    'required': ['articles']
+}
+
+ENRICH_FIELDS = """- title: the headline translated to clear, natural English if needed, as a concise title
+- summary: exactly three short paragraphs in English summarizing the key points, 1-3 sentences each, separated by blank lines; professional and factual
+- emoji_location: the flag emoji of the main country or organization involved, even if only implied by a city, leader or government body (e.g. "Macron" → 🇫🇷, "EU" → 🇪🇺); 🌎 if none
+- emoji_topic: the most specific topic emoji, e.g. 🏦 markets, 💵 currency, 📉 economic decline, 🗳️ elections, ⚖️ legislation, 🏛️ government, 🤝 diplomacy, ⚔️ military, ✊ protests, 🚨 disasters, 🏥 healthcare, 💻 technology, ⚡ energy, 🌡️ climate
+- topics, geography, events: up to 5 lowercase tags each, single words or hyphenated phrases (e.g. artificial-intelligence); geography prefers countries over cities; events are types such as election, conflict, treaty
+- sentiment: -1.0 (crisis, conflict) to 1.0 (breakthrough, success), 0 for neutral factual reporting
+- bias_category: the dominant geopolitical perspective, neutral if there is none
+- bias_score: 0.0 (multiple perspectives, balanced) to 1.0 (propaganda-like, one-sided)"""
+
+def build_enrich_prompt(title: str, text: str) -> str:
+    """Prompt asking for every enrichment field in one structured response."""
+    return f"""Analyze this news article and fill in every field of the response.
+
+{ENRICH_FIELDS}
+
+Headline: {title}
+
+Article: {text}"""
+
+def build_enrich_batch_prompt(articles: List[Tuple[str, str, str]]) -> str:
+    """Prompt enriching several (id, title, text) articles in one structured response."""
+    sections = '\n\n'.join(
+        f"=== ARTICLE {article_id} ===\nHeadline: {title}\n\nArticle: {text}"
+        for article_id, title, text in articles
+    )
+    return f"""Analyze each of the following {len(articles)} news articles independently.
+Return one entry per article in "articles", with "id" set to the article's id, and fill in every field:
+
+{ENRICH_FIELDS}
+
+{sections}"""
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, at about four characters per token."""
+    return len(text) // 4 + 1
+
+def _clean_tags(values: Any) -> List[str]:
+    if not isinstance(values, list):
+        raise ValueError("tags must be a list")
+    tags = []
+    for value in values:
+        tag = re.sub(r'\s+', '-', str(value).strip().lower())
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags[:5]
+
+def _clamp_score(value: Any, low: float, high: float) -> float:
+    try:
+        return max(low, min(high, float(value)))
+    except (TypeError, ValueError):
+        raise ValueError(f"score {value!r} is not a number")
+
+def _load_json(raw: str) -> Any:
+    try:
+        return json.loads(raw)
+    except (TypeError, json.JSONDecodeError) as e:
+        raise ValueError(f"response is not JSON: {e}")
+
+def parse_enrichment(raw: str) -> Dict[str, Any]:
+    """Validate a structured enrich response. Raises ValueError if it is unusable."""
+    return validate_enrichment(_load_json(raw))
+
+def parse_enrichment_batch(raw: str) -> Dict[str, Any]:
+    """Split a batched enrich response into raw items keyed by article id."""
+    data = _load_json(raw)
+    items = data.get('articles') if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        raise ValueError("response has no articles list")
+    return {str(item['id']): item for item in items if isinstance(item, dict) and 'id' in item}
+
+def validate_enrichment(data: Any) -> Dict[str, Any]:
+    """Validate the fields of one enriched article. Raises ValueError if it is unusable."""
+    if not isinstance(data, dict):
+        raise ValueError("response is not an object")
+    title = str(data.get('title') or '').strip()
+    summary = str(data.get('summary') or '').strip()
+    if not title or not summary:
+        raise ValueError("response is missing the title or summary")
+    bias_category = str(data.get('bias_category') or '').strip().lower()
+    return {
+        'title': title,
+        'summary': summary,
+        'emoji_location': str(data.get('emoji_location') or '').strip(),
+        'emoji_topic': str(data.get('emoji_topic') or '').strip(),
+        'topics': _clean_tags(data.get('topics', [])),
+        'geography': _clean_tags(data.get('geography', [])),
+        'events': _clean_tags(data.get('events', [])),
+        'sentiment': _clamp_score(data.get('sentiment', 0.0), -1.0, 1.0),
+        'bias_category': bias_category if bias_category in BIAS_CATEGORIES else 'neutral',
+        'bias_score': _clamp_score(data.get('bias_score', 0.0), 0.0, 1.0)
+    }
+
+class ContentProcessor:
+    """Handles content processing with Gemini API."""
+    
+    def __init__(self, call_timeout: float = AI_CALL_TIMEOUT, max_concurrent_calls: int = AI_MAX_CONCURRENT_CALLS,
+                 cache: Optional[LLMCache] = None, quota: Optional[QuotaScheduler] = None):
+        self.cache = cache if cache is not None else llm_cache
+        self.quota = quota if quota is not None else quota_scheduler
+        self._clients: Dict[str, genai.Client] = {}
+        self.model = "gemini-2.0-flash-thinking-exp-01-21"
+        self.enrich_model = AI_ENRICH_MODEL
+        self.enrich_stats = {'articles': 0, 'calls': 0, 'tokens_used': 0, 'prompt_tokens_saved': 0}
+        self.call_timeout = call_timeout
+        self.batch_call_timeout = AI_BATCH_CALL_TIMEOUT
+        self._call_slots = asyncio.Semaphore(max_concurrent_calls)
+    
+    def client_for(self, key: str) -> genai.Client:
+        """Gemini client for an API key, created on first use."""
+        client = self._clients.get(key)
+        if client is None:
+            client = self._clients[key] = genai.Client(api_key=key)
+        return client
+
+    @property
+    def client(self) -> genai.Client:
+        """Client of the first configured key."""
+        return self.client_for(self.quota.keys[0])
+
+    async def generate(self, prompt: str, timeout: Optional[float] = None, model: Optional[str] = None,
+                       config: Optional[Dict[str, Any]] = None, priority: int = 0):
+        """Run one model call on the SDK's async client and return its response.
+
+        The call waits for quota on any API key, lower ``priority`` first. It
+        is cancelled, and its connection released, once ``timeout`` seconds
+        pass or the awaiting task is cancelled. A quota rejection holds the
+        key back and raises QuotaExhausted so callers can defer the work.
+        """
+        model = model or self.model
+        key = await self.quota.acquire(model, priority)
+        async with self._call_slots:
+            try:
+                return await asyncio.wait_for(
+                    self.client_for(key).aio.models.generate_content(model=model, contents=prompt, config=config),
+                    timeout or self.call_timeout
+                )
+            except Exception as e:
+                if "RESOURCE_EXHAUSTED" in str(e):
+                    self.quota.penalize(key, model)
+                    raise QuotaExhausted(str(e)) from e
+                raise
+
+    def cache_key(self, template: str, model: str, *inputs) -> str:
+        """Response cache key for a prompt template, model and the inputs the prompt is built from."""
+        return self.cache.key(model, f"{template}:v{PROMPT_VERSIONS[template]}", *inputs)
+
+    async def _article_text(self, url: str, description: str, article_data: Optional[Dict[str, Any]]) -> str:
+        """Full article text to enrich from, scraping the URL if no article was passed."""
+        if article_data is None:
+            from .scraper import scrape_article
+            article_data = await scrape_article(url)
+        if article_data and article_data.get('text'):
+            return f"{article_data.get('title', '')}\n\n{article_data['text']}"
+        logger.warning(f"No scraped content for {url}, enriching from the feed description")
+        return description
+
+    async def enrich(self, title: str, description: str, url: str,
+                     article_data: Optional[Dict[str, Any]] = None, priority: int = 0) -> Optional[Dict[str, Any]]:
+        """Summarize, tag and score an article with a single schema-constrained call.
+
+        Returns the validated fields, or None if the call or its response failed.
+        Raises QuotaExhausted if the API is out of quota.
+        ``article_data`` is a previously scraped article; without it the URL is
+        scraped here, and the feed description is used if that fails.
+        ``priority`` orders the call's wait for quota, lower first.
+        """
+        try:
+            text = await self._article_text(url, description, article_data)
+        except Exception as e:
+            logger.error(f"Error enriching article: {e}")
+            return None
+        return await self._enrich_text(title, description, url, text, priority)
+
+    async def _enrich_text(self, title: str, description: str, url: str, text: str,
+                           priority: int = 0) -> Optional[Dict[str, Any]]:
+        try:
+            key = self.cache_key('enrich', self.enrich_model, title, text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.info(f"🗃️ Reusing cached enrichment for: {url}")
+                return parse_enrichment(cached)
+            prompt = build_enrich_prompt(title, text)
+            response = await self.generate(prompt, model=self.enrich_model, config={
+                'response_mime_type': 'application/json',
+                'response_schema': ENRICH_SCHEMA
+            }, priority=priority)
+            result = parse_enrichment(response.text)
+            self.cache.put(key, json.dumps(result))
+        except QuotaExhausted:
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"Gemini enrich call timed out after {self.call_timeout}s for: {url}")
+            return None
+        except ValueError as e:
+            logger.error(f"Invalid enrich response for {url}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Error enriching article: {e}")
+            return None
+
+        self._record_enrich_usage(prompt, [(title, description, text, result)], response)
+        return result
+
+    async def enrich_batch(self, articles: List[Dict[str, Any]], priority: int = 0) -> List[Optional[Dict[str, Any]]]:
+        """Enrich several articles with one call, returning results in input order.
+
+        Each article is a dict of enrich() arguments. Articles missing from
+        the response or failing validation fall back to single-item calls.
+        Raises QuotaExhausted if the API is out of quota.
+        """
+        if len(articles) == 1:
+            return [await self.enrich(**articles[0], priority=priority)]
+        texts = await asyncio.gather(*(
+            self._article_text(a['url'], a['description'], a.get('article_data')) for a in articles
+        ))
+        results: List[Optional[Dict[str, Any]]] = [None] * len(articles)
+        keys = [self.cache_key('enrich', self.enrich_model, a['title'], text) for a, text in zip(articles, texts)]
+        pending = []
+        for i, key in enumerate(keys):
+            cached = self.cache.get(key)
+            try:
+                results[i] = parse_enrichment(cached) if cached is not None else None
+            except ValueError:
+                results[i] = None
+            if results[i] is None:
+                pending.append(i)
+        if len(pending) < 2:
+            for i in pending:
+                article = articles[i]
+                results[i] = await self._enrich_text(article['title'], article['description'], article['url'], texts[i],
+                                                     priority)
+            return results
+
+        try:
+            prompt = build_enrich_batch_prompt([(str(i), articles[i]['title'], texts[i]) for i in pending])
+            response = await self.generate(prompt, timeout=self.batch_call_timeout, model=self.enrich_model, config={
+                'response_mime_type': 'application/json',
+                'response_schema': ENRICH_BATCH_SCHEMA
+            }, priority=priority)
+            items = parse_enrichment_batch(response.text)
+        except QuotaExhausted:
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"Gemini batch enrich call timed out after {self.batch_call_timeout}s")
+            items, response = {}, None
+        except Exception as e:
+            logger.error(f"Error enriching batch of {len(articles)} articles: {e}")
+            items, response = {}, None
+
+        enriched = []
+        for i in pending:
+            article = articles[i]
+            try:
+                results[i] = validate_enrichment(items.get(str(i)))
+                self.cache.put(keys[i], json.dumps(results[i]))
+                enriched.append((article['title'], article['description'], texts[i], results[i]))
+            except ValueError as e:
+                if response is not None:
+                    logger.warning(f"Batch item for {article['url']} unusable ({e}), enriching it on its own")
+        if enriched:
+            self._record_enrich_usage(prompt, enriched, response, len(pending))
+
+        for i in pending:
+            article = articles[i]
+            if results[i] is None:
+                results[i] = await self._enrich_text(article['title'], article['description'], article['url'], texts[i],
+                                                     priority)
+        return results
+
+    def _record_enrich_usage(self, prompt: str, enriched: List[Tuple[str, str, str, Dict[str, Any]]],
+                             response: Any, batch_size: int = 1):
+        """Tally the tokens an enrich call used against what the separate calls would have sent.
+
+        ``enriched`` holds (title, description, text, result) for each article
+        the call produced; a batch prompt is shared out over ``batch_size``.
+        """
+        separate = 0
+        for title, description, text, result in enriched:
+            separate += sum(estimate_tokens(p) for p in [
+                build_content_prompt(text, False, "Summarize in clear English, focusing on key points."),
+                build_content_prompt(text, True, "Translate to clear English title if needed."),
+                TAGS_PROMPT.format(text=description),
+                TAGS_PROMPT.format(text=title),
+                build_sentiment_prompt(result['summary'])
+            ])
+        saved = separate - estimate_tokens(prompt) * len(enriched) // batch_size
+        usage = getattr(response, 'usage_metadata', None)
+        used = getattr(usage, 'total_token_count', None) or 0
+        self.enrich_stats['articles'] += len(enriched)
+        self.enrich_stats['calls'] += 1
+        self.enrich_stats['tokens_used'] += used
+        self.enrich_stats['prompt_tokens_saved'] += saved
+        logger.info(
+            f"🧮 Enriched {len(enriched)} article(s) in one call: {used} tokens used, "
+            f"~{saved // len(enriched)} prompt tokens saved per article"
+        )
+
+    def token_savings(self) -> Dict[str, float]:
+        """Average tokens per enriched article and estimated prompt tokens saved."""
+        articles = self.enrich_stats['articles']
+        return {
+            **self.enrich_stats,
+            'tokens_per_article': self.enrich_stats['tokens_used'] / articles if articles else 0.0,
+            'saved_per_article': self.enrich_stats['prompt_tokens_saved'] / articles if articles else 0.0
+        }
+    
+    async def process_content(self, text: str, url: str, is_title: bool = False, instruction: Optional[str] = None,
+                              article_data: Optional[Dict[str, Any]] = None) -> Tuple[str, str]:
+        """Process content with Gemini API.
+
+        ``article_data`` is a previously scraped article; without it the URL is scraped here.
+        Raises QuotaExhausted if the API is out of quota.
+        """
+        try:
+            # Validate URL parameter
+            if not isinstance(url, str) or not url.startswith(('http://', 'https://')):
+                logger.error(f"Invalid URL provided: {url}")
+                raise ValueError(f"Invalid URL format: {url}")
+
+            # Always work from the full article content
+            if article_data is None:
+                from .scraper import scrape_article
+                logger.info(f"Attempting to scrape article content from: {url}")
+                article_data = await scrape_article(url)
+            if article_data and article_data.get('text'):
+                logger.info(f"Successfully scraped article content from: {url}")
+                text = f"{article_data.get('title', '')}\n\n{article_data['text']}"
+            else:
+                logger.error(f"Failed to scrape required article content from: {url}")
+                raise ValueError(f"Could not scrape content from {url}")
+
+            key = self.cache_key('content', self.model, is_title, instruction, text)
+            response_text = self.cache.get(key)
+            if response_text is None:
+                prompt = build_content_prompt(text, is_title, instruction)
+
+                response = await self.generate(prompt)
+                response_text = response.text
+                self.cache.put(key, response_text)
+
+            # Parse response
+            result = response_text.strip().split('\n')
+            emoji1 = None
+            emoji2 = None
+            processed_text = text  # Default to original text
+            
+            for line in result:
+                line = line.strip()
+                if line.startswith('EMOJI_1:'):
+                    emoji1 = line.split('EMOJI_1:')[1].strip()
+                elif line.startswith('EMOJI_2:'):
+                    emoji2 = line.split('EMOJI_2:')[1].strip()
+                elif line.startswith('TEXT:'):
+                    processed_text = line.split('TEXT:')[1].strip()
+            
+            # Return combined emoji string and processed text
+            emoji_str = f"{emoji1 or '🌎'}{emoji2 or '📰'}"
+            return emoji_str, processed_text
+
+        except QuotaExhausted:
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"Gemini call timed out after {self.call_timeout}s for: {url}")
+            return "🔄❌", text
+        except Exception as e:
+            error_msg = str(e)
+            if "INVALID_ARGUMENT" in error_msg:
+                logger.error(f"Invalid input: {error_msg}")
+                return "⚠️❌", text
+            else:
+                logger.error(f"Unexpected Gemini API error: {error_msg}")
+                return "🔄❌", text
+
+    async def process_content_with_tags(self, text: str, url: str, is_title: bool = False, instruction: Optional[str] = None,
+                                        article_data: Optional[Dict[str, Any]] = None) -> Tuple[str, str, list[str], list[str], list[str]]:
+        """Process content and generate tags with Gemini API."""
+        emoji_str, processed_text = await self.process_content(text, url, is_title, instruction, article_data)
+        topics, geography, events = await generate_tags(text)
+        return emoji_str, processed_text, topics, geography, events
+
+    async def analyze_sentiment_and_bias(self, text: str) -> Tuple[float, str, float]:
+        """Analyze sentiment and bias of content using Gemini API."""
+        try:
+            key = self.cache_key('sentiment', self.model, text)
+            response_text = self.cache.get(key)
+            if response_text is None:
+                prompt = build_sentiment_prompt(text)
+
+                response = await self.generate(prompt)
+                response_text = response.text
+                self.cache.put(key, response_text)
+
+            result = response_text.strip().split('\n')
             sentiment_score = 0.0
             bias_category = 'neutral'
             bias_score = 0.0
@@ -358,6 +661,8 @@ BIAS_SCORE: [score]"""
 
             return sentiment_score, bias_category, bias_score
 
+        except QuotaExhausted:
+            raise
         except Exception as e:
             logger.error(f"Error analyzing sentiment and bias: {e}")
             return 0.0, 'neutral', 0.0
@@ -382,82 +687,18 @@ content_processor = ContentProcessor()
 # Update singleton instance methods
 process_with_analysis = content_processor.process_content_with_analysis
 
-async def wait_for_rate_limit():
-    """Implements rate limiting according to free tier limits."""
-    global last_request_time, requests_this_minute, requests_today, day_start_time
-    current_time = time.time()
-    
-    # Reset daily counter if needed
-    if current_time - day_start_time >= DAY_WINDOW:
-        requests_today = 0
-        day_start_time = current_time
-    
-    # Handle daily limit
-    if requests_today >= RPD_LIMIT:
-        wait_time = day_start_time + DAY_WINDOW - current_time
-        logger.warning(f"Daily rate limit reached. Waiting {wait_time:.2f} seconds...")
-        await asyncio.sleep(wait_time)
-        requests_today = 0
-        day_start_time = time.time()
-        current_time = time.time()
-    
-    # Reset minute counter if needed
-    time_since_last = current_time - last_request_time
-    if time_since_last >= MINUTE_WINDOW:
-        requests_this_minute = 0
-        last_request_time = current_time
-    
-    # Handle minute limit
-    if requests_this_minute >= RPM_LIMIT:
-        wait_time = MINUTE_WINDOW - time_since_last + 1
-        logger.warning(f"Rate limit reached. Waiting {wait_time:.2f} seconds...")
-        await asyncio.sleep(wait_time)
-        requests_this_minute = 0
-        last_request_time = time.time()
-    
-    # Update counters
-    requests_this_minute += 1
-    requests_today += 1
-    last_request_time = current_time
-
 async def generate_tags(text: str) -> Tuple[list[str], list[str], list[str]]:
     """Generate tags for an article using Gemini API."""
     try:
-        await wait_for_rate_limit()
-        
-        prompt = """Analyze this text and generate three sets of tags:
-
-1. TOPICS (e.g., Politics, Economy, Technology, etc.)
-2. GEOGRAPHY (Countries, Regions, Cities mentioned)
-3. EVENT TYPES (e.g., Election, Conflict, Treaty, Summit, etc.)
-
-Rules for tag generation:
-- Each tag should be a single word or hyphenated phrase
-- Convert multi-word concepts into hyphenated form (e.g., "artificial intelligence" → "artificial-intelligence")
-- Use lowercase for all tags
-- Include only tags that are explicitly or strongly implied in the text
-- Maximum 5 tags per category
-- For geography, prefer country names over city names unless the city is the main focus
-
-Example response format:
-TOPICS: economy, technology, cybersecurity
-GEOGRAPHY: united-states, china, european-union
-EVENTS: trade-agreement, diplomatic-summit
-
-Text to analyze: {text}
-
-Respond exactly in this format:
-TOPICS: [comma-separated tags]
-GEOGRAPHY: [comma-separated tags]
-EVENTS: [comma-separated tags]"""
-
-        response = content_processor.client.models.generate_content(
-            model=content_processor.model,
-            contents=prompt.format(text=text)
-        )
+        key = content_processor.cache_key('tags', content_processor.model, text)
+        response_text = content_processor.cache.get(key)
+        if response_text is None:
+            response = await content_processor.generate(TAGS_PROMPT.format(text=text))
+            response_text = response.text
+            content_processor.cache.put(key, response_text)
 
         # Parse response
-        result = response.text.strip().split('\n')
+        result = response_text.strip().split('\n')
         topics = []
         geography = []
         events = []
@@ -473,6 +714,8 @@ EVENTS: [comma-separated tags]"""
         
         return topics, geography, events
 
+    except QuotaExhausted:
+        raise
     except Exception as e:
         logger.error(f"Error generating tags: {e}")
         return [], [], []
\ No newline at end of file
@@ -0,0 +1,326 @@
+"""Article extraction from downloaded HTML, run in recycled worker processes."""
+import asyncio
+import logging
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+import lxml.html
+from bs4 import BeautifulSoup
+from newspaper import Article, Config
+
+from config.settings import (
+    EXTRACT_WORKERS, EXTRACT_MAX_JOBS_PER_WORKER, EXTRACT_MAX_WORKER_RSS_MB, EXTRACT_QUEUE_SIZE
+)
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; the RSS ceiling is not enforced there
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Pages are passed in, so newspaper never downloads anything itself
+newspaper_config = Config()
+newspaper_config.fetch_images = False
+newspaper_config.memoize_articles = False
+
+def extract_with_newspaper(url: str, html: str) -> Optional[Dict[str, Any]]:
+    """Extract an article from a downloaded page using newspaper3k library."""
+    article = Article(url, config=newspaper_config)
+    # Hand newspaper the page so it does not download it again with requests
+    article.set_html(html)
+    article.parse()
+    return {
+        'title': article.title,
+        'text': article.text,
+        'authors': article.authors,
+        'publish_date': article.publish_date,
+        'top_image': article.top_image,
+        'meta_description': article.meta_description
+    }
+
+# class/id fragments of page furniture around an article, dropped before scoring
+BOILERPLATE_PATTERN = re.compile(
+    r'comment|share|social|related|recommend|promo|advert|\bads?\b|sponsor|sidebar|newsletter|'
+    r'subscri|signup|footer|masthead|\bnav|menu|breadcrumb|cookie|consent|popup|modal|banner|'
+    r'widget|outbrain|taboola|paywall|byline-list|tags?\b',
+    re.IGNORECASE
+)
+# class/id fragments of elements that hold the article body
+CONTENT_PATTERN = re.compile(r'article|body|content|entry|main|post|story|text|prose', re.IGNORECASE)
+# Elements that never hold article text
+NON_CONTENT_TAGS = ('script', 'style', 'noscript', 'template', 'nav', 'header', 'footer', 'aside',
+                    'form', 'button', 'iframe', 'svg', 'figure', 'select', 'input')
+# Paragraphs shorter than this are not scored, and are not kept unless they sit in the article
+MIN_PARAGRAPH = 25
+MIN_KEPT_PARAGRAPH = 80
+
+def _class_weight(element) -> float:
+    names = f"{element.get('class', '')} {element.get('id', '')}"
+    weight = 0.0
+    if CONTENT_PATTERN.search(names):
+        weight += 25
+    if BOILERPLATE_PATTERN.search(names):
+        weight -= 25
+    return weight
+
+def _link_density(element, length: int) -> float:
+    links = sum(len(a.text_content()) for a in element.iter('a'))
+    return links / length if length else 1.0
+
+def _remove_boilerplate(doc):
+    for element in list(doc.iter(*NON_CONTENT_TAGS)):
+        element.drop_tree()
+    for element in doc.xpath('//*[@class or @id]'):
+        if element.tag in ('html', 'body', 'article', 'main'):
+            continue
+        names = f"{element.get('class', '')} {element.get('id', '')}"
+        if BOILERPLATE_PATTERN.search(names) and not CONTENT_PATTERN.search(names):
+            element.drop_tree()
+
+def extract_with_lxml(html: str) -> Optional[Dict[str, Any]]:
+    """Readability-style main content extraction with lxml.
+
+    Page furniture (navigation, sharing, comments, related links) is dropped,
+    then every paragraph scores its parent and, at half weight, its
+    grandparent by length and comma count. The element with the highest
+    score, discounted by how much of its text is links, holds the article;
+    its paragraphs and those of siblings scoring close to it are kept.
+    """
+    doc = lxml.html.document_fromstring(html)
+    title = (doc.xpath('string(//meta[@property="og:title"]/@content)').strip()
+             or (doc.findtext('.//title') or '').strip() or None)
+    top_image = doc.xpath('string(//meta[@property="og:image"]/@content)').strip() or None
+    description = (doc.xpath('string(//meta[@property="og:description"]/@content)').strip()
+                   or doc.xpath('string(//meta[@name="description"]/@content)').strip() or None)
+    _remove_boilerplate(doc)
+
+    scores: Dict[Any, float] = {}
+    for paragraph in doc.iter('p'):
+        text = ' '.join(paragraph.text_content().split())
+        if len(text) < MIN_PARAGRAPH:
+            continue
+        score = 1 + text.count(',') + min(len(text) // 100, 3)
+        parent = paragraph.getparent()
+        for ancestor, share in ((parent, 1.0), (parent.getparent() if parent is not None else None, 0.5)):
+            if ancestor is None:
+                continue
+            if ancestor not in scores:
+                scores[ancestor] = _class_weight(ancestor)
+            scores[ancestor] += score * share
+    if not scores:
+        return None
+
+    for element in scores:
+        scores[element] *= 1 - _link_density(element, len(element.text_content()))
+    best = max(scores, key=scores.get)
+    # Siblings that score well continue the article, e.g. text split by an inline ad slot
+    threshold = max(10.0, scores[best] * 0.2)
+    parent = best.getparent()
+    sections = [sibling for sibling in parent if sibling is best or scores.get(sibling, 0) >= threshold] \
+        if parent is not None else [best]
+
+    texts = []
+    for section in sections:
+        for paragraph in section.iter('p'):
+            text = ' '.join(paragraph.text_content().split())
+            if len(text) < MIN_PARAGRAPH or _link_density(paragraph, len(text)) > 0.5:
+                continue
+            # Short lines inside the article count only when they read as sentences
+            if len(text) < MIN_KEPT_PARAGRAPH and not text.endswith(('.', '"', '\u201d', '?', '!')):
+                continue
+            texts.append(text)
+    content = '\n\n'.join(texts)
+    if not content:
+        return None
+    return {
+        'title': title,
+        'text': content,
+        'authors': None,
+        'publish_date': None,
+        'top_image': top_image,
+        'meta_description': description
+    }
+
+def extract_with_beautifulsoup(html: str) -> Optional[Dict[str, Any]]:
+    """Extract article text using BeautifulSoup as fallback."""
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Remove unwanted elements
+    for element in soup.find_all(['script', 'style', 'nav', 'header', 'footer', 'iframe']):
+        element.decompose()
+    
+    # Extract title
+    title = None
+    title_tag = soup.find('meta', property='og:title') or soup.find('title')
+    if title_tag:
+        title = title_tag.get('content', None) or title_tag.string
+    
+    # Extract main content
+    article_tag = soup.find('article') or soup.find(class_=['article', 'post', 'content', 'main'])
+    
+    if article_tag:
+        paragraphs = article_tag.find_all('p')
+    else:
+        paragraphs = soup.find_all('p')
+    
+    content = ' '.join(p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 100)
+    
+    if not content:
+        return None
+    
+    return {
+        'title': title,
+        'text': content,
+        'authors': None,
+        'publish_date': None,
+        'top_image': None,
+        'meta_description': None
+    }
+
+# Tried in order on the same downloaded page until one finds article text
+EXTRACTORS = [
+    ('newspaper', extract_with_newspaper),
+    ('lxml', lambda url, html: extract_with_lxml(html)),
+    ('beautifulsoup', lambda url, html: extract_with_beautifulsoup(html))
+]
+
+def extract_article(url: str, html: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """Run the extractors over one page. Returns the name of the one that found text, and its result."""
+    for name, extractor in EXTRACTORS:
+        try:
+            content = extractor(url, html)
+        except Exception as e:
+            logger.warning(f"{name} extraction failed for {url}: {str(e)}")
+            continue
+        if content and content.get('text'):
+            return name, content
+    return None, None
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of the current process in MB, or 0 where unknown."""
+    if resource is None:
+        return 0.0
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _extraction_job(url: str, html: str) -> Tuple[Optional[str], Optional[Dict[str, Any]], float]:
+    """Worker process entry point: extract a page and report the worker's memory."""
+    extractor, content = extract_article(url, html)
+    return extractor, content, peak_rss_mb()
+
+class ExtractionPool:
+    """Runs article extraction in worker processes that are replaced as they age.
+
+    Once ``max_jobs`` pages per worker have been submitted to a pool, it is
+    swapped for a fresh one. lxml and readability rarely give memory back,
+    so RSS is only a hard ceiling set well above a worker's steady state:
+    every job reports its worker's peak RSS, and a pool with a worker past
+    ``max_rss_mb`` is swapped too. Jobs already submitted finish in the old
+    pool, and their reports do not swap the new one. A pool whose worker died is
+    replaced and the page retried once, then extracted in a thread. At
+    most ``queue_size`` pages are queued or extracting at once, and
+    further callers wait. With ``workers`` at 0, extraction runs in a
+    thread instead. Worker processes are started on first use.
+    """
+
+    def __init__(self, workers: int = 2, max_jobs: int = 200, max_rss_mb: float = 1024, queue_size: int = 32):
+        self.workers = workers
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self.queue_size = queue_size
+        self.jobs = 0
+        self.recycles = 0
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._submitted = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        # Not max_tasks_per_child: on Python 3.11 the pool hangs when it replaces a worker
+        if self._executor is not None and self._submitted >= self.max_jobs * self.workers:
+            self.recycle(f"{self._submitted} pages extracted")
+        if self._executor is None:
+            # Spawned workers do not inherit the event loop's threads and sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+            )
+            self._submitted = 0
+            logger.info(f"🧮 Article extraction offloaded to {self.workers} worker processes")
+        self._submitted += 1
+        return self._executor
+
+    def _queue_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.queue_size)
+            self._loop = loop
+        return self._slots
+
+    async def _run(self, url: str, html: str) -> Tuple[Optional[str], Optional[Dict[str, Any]], float]:
+        executor = self._pool()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(executor, _extraction_job, url, html)
+        except BrokenProcessPool:
+            # Another job may already have replaced the broken pool
+            if executor is self._executor:
+                self.recycle("a worker died")
+            raise
+        rss_mb = result[2]
+        if rss_mb > self.max_rss_mb and executor is self._executor:
+            self.recycle(f"a worker reached {rss_mb:.0f} MB")
+        return result
+
+    async def extract(self, url: str, html: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Extract an article from a page. Returns the winning extractor's name and its result."""
+        self.pending += 1
+        try:
+            async with self._queue_slots():
+                if not self.workers:
+                    return await asyncio.to_thread(extract_article, url, html)
+                try:
+                    try:
+                        extractor, content, _ = await self._run(url, html)
+                    except BrokenProcessPool:
+                        extractor, content, _ = await self._run(url, html)
+                except BrokenProcessPool:
+                    logger.warning(f"Extraction workers keep dying, extracting {url} in a thread")
+                    return await asyncio.to_thread(extract_article, url, html)
+                self.jobs += 1
+                return extractor, content
+        finally:
+            self.pending -= 1
+
+    def recycle(self, reason: str):
+        """Replace the worker processes, letting submitted jobs finish in the old ones."""
+        if self._executor is None:
+            return
+        logger.info(f"♻️ Recycling extraction workers: {reason}")
+        self._executor.shutdown(wait=False)
+        self._executor = None
+        self.recycles += 1
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'workers': self.workers,
+            'jobs': self.jobs,
+            'recycles': self.recycles,
+            'pending': self.pending
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+# Shared instance used by the article scraper
+extraction_pool = ExtractionPool(
+    workers=EXTRACT_WORKERS,
+    max_jobs=EXTRACT_MAX_JOBS_PER_WORKER,
+    max_rss_mb=EXTRACT_MAX_WORKER_RSS_MB,
+    queue_size=EXTRACT_QUEUE_SIZE
+)
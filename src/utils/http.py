@@ -0,0 +1,138 @@
+"""Shared pooled HTTP client for feeds, article scraping and Telegram."""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli  # noqa: F401  aiohttp only decodes br bodies when this is installed
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+@dataclass
+class HostStats:
+    """Traffic counters for one host."""
+    requests: int = 0
+    errors: int = 0
+    bytes: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def avg_latency(self) -> float:
+        return self.total_latency / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'bytes': self.bytes,
+            'avg_latency': self.avg_latency,
+            'max_latency': self.max_latency
+        }
+
+class HttpClient:
+    """One keep-alive connection pool shared by every outbound request.
+
+    The underlying session is created lazily on the running event loop and
+    recreated if that loop changes, so the module-level instance can be
+    used from any entry point. Latency is measured up to the response
+    headers; byte counts are of the decoded body.
+    """
+
+    def __init__(self, limit: int = 100, limit_per_host: int = 8, dns_ttl: int = 300,
+                 keepalive_timeout: float = 60.0, connect_timeout: float = 15.0,
+                 total_timeout: float = 60.0, max_response_bytes: int = 10 * 1024 * 1024):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(connect=connect_timeout, total=total_timeout)
+        self.max_response_bytes = max_response_bytes
+        self.hosts: Dict[str, HostStats] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def session(self) -> aiohttp.ClientSession:
+        """Get the shared session, creating it on the running loop if needed."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers={'Accept-Encoding': ACCEPT_ENCODING}
+            )
+            self._loop = loop
+            logger.info(f"📡 Shared HTTP session created ({self.limit_per_host} connections per host)")
+        return self._session
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send a request through the shared pool, recording per-host counters."""
+        session = await self.session()
+        stats = self.hosts.setdefault(urlparse(url).netloc, HostStats())
+        stats.requests += 1
+        started = time.monotonic()
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                latency = time.monotonic() - started
+                stats.total_latency += latency
+                stats.max_latency = max(stats.max_latency, latency)
+                try:
+                    yield response
+                finally:
+                    stats.bytes += response.content.total_bytes
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            stats.errors += 1
+            raise
+
+    async def read(self, response: aiohttp.ClientResponse, max_bytes: Optional[int] = None) -> bytes:
+        """Read a response body, stopping at ``max_bytes``."""
+        max_bytes = max_bytes or self.max_response_bytes
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            chunks.append(chunk[:max_bytes - size])
+            size += len(chunks[-1])
+            if size >= max_bytes:
+                logger.warning(f"✂️ Response from {response.url.host} exceeds {max_bytes} bytes, truncating")
+                break
+        return b''.join(chunks)
+
+    async def get_text(self, url: str, max_bytes: Optional[int] = None, **kwargs) -> Optional[str]:
+        """GET a URL and decode its body, or return None on a non-200 response."""
+        async with self.request('GET', url, **kwargs) as response:
+            if response.status != 200:
+                return None
+            body = await self.read(response, max_bytes)
+            try:
+                return body.decode(response.charset or 'utf-8', errors='replace')
+            except LookupError:
+                return body.decode('utf-8', errors='replace')
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {host: stats.to_dict() for host, stats in self.hosts.items()}
+
+    async def close(self):
+        if self._session and not self._session.closed and self._loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+# Shared instance used by every outbound fetch path
+http_client = HttpClient()
@@ -0,0 +1,80 @@
+"""Persistent cache of model responses keyed by model, prompt version and input."""
+import hashlib
+import logging
+import os
+import re
+import unicodedata
+from typing import Dict, Optional
+
+from config.settings import LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_DAYS
+from .sqlite_cache import SQLiteCache
+from ..database.models import PROJECT_ROOT
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_PATH = os.path.join(PROJECT_ROOT, 'data', 'llm_cache.db')
+
+def normalize(text: str) -> str:
+    """Normalize input so cosmetic differences map to the same cache key."""
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFKC', text)).strip()
+
+class LLMCache(SQLiteCache):
+    """Content-addressed response cache in its own SQLite file.
+
+    Entries expire ``ttl`` seconds after they were stored. Once more than
+    ``max_entries`` are stored, the least recently used are evicted.
+    """
+
+    TABLE = 'llm_cache'
+    COLUMNS = ('response TEXT NOT NULL',)
+    NAME = 'LLM cache'
+    NOUN = 'responses'
+
+    def __init__(self, path: str = LLM_CACHE_PATH, max_entries: int = 50000, ttl: float = 30 * 86400):
+        super().__init__(path, max_entries, ttl)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model: str, template: str, *inputs) -> str:
+        """Cache key for a model, a versioned prompt template and its inputs."""
+        digest = hashlib.sha256()
+        for part in (model, template, *inputs):
+            digest.update(normalize(str(part)).encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._lookup(key, ('response',))
+        if row is None:
+            self.misses += 1
+            response = None
+        else:
+            self.hits += 1
+            response = row[0]
+        if (self.hits + self.misses) % self.REPORT_EVERY == 0:
+            logger.info(
+                f"🗃️ LLM cache: {self.hit_rate:.0%} hit rate over {self.hits + self.misses} lookups, "
+                f"{self._count} responses stored"
+            )
+        return response
+
+    def put(self, key: str, response: str):
+        self._store(key, {'response': response})
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'entries': self._count,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+            'evictions': self.evictions
+        }
+
+# Shared instance used by the Gemini content processor
+llm_cache = LLMCache(max_entries=LLM_CACHE_MAX_ENTRIES, ttl=LLM_CACHE_TTL_DAYS * 86400)
@@ -0,0 +1,171 @@
+"""Adaptive per-domain request spacing for article scraping."""
+import asyncio
+import datetime
+import email.utils
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Optional
+
+from config.settings import (
+    SCRAPE_MAX_CONCURRENT, SCRAPE_DOMAIN_DELAY, SCRAPE_MIN_DOMAIN_DELAY, SCRAPE_MAX_DOMAIN_DELAY,
+    SCRAPE_TARGET_LATENCY
+)
+
+logger = logging.getLogger(__name__)
+
+# Statuses a publisher uses to ask us to slow down
+THROTTLE_STATUSES = (429, 503)
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header, given as seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+@dataclass
+class DomainState:
+    """Request spacing and counters for one domain."""
+    delay: float
+    # Monotonic time before which no request to the domain may start
+    not_before: float = 0.0
+    waiting: int = 0
+    in_flight: int = 0
+    requests: int = 0
+    throttled: int = 0
+    latency: Optional[float] = None
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            'delay': self.delay,
+            'waiting': self.waiting,
+            'in_flight': self.in_flight,
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'latency': self.latency or 0.0
+        }
+
+class PolitenessScheduler:
+    """Spaces requests to each domain by a delay that adapts to how it responds.
+
+    Requests to a domain queue in arrival order and start at least
+    ``delay`` seconds apart, with at most ``max_concurrent`` requests in
+    flight across all domains. A domain's delay shrinks by
+    ``decrease_step`` after each response faster than ``target_latency``,
+    down to ``min_delay``. A slower response raises it by half and to at
+    least the response time. A 429, a 503 or a failed request doubles it,
+    up to ``max_delay``. A Retry-After header holds the domain's queue for
+    the time asked.
+    """
+
+    DECREASE_STEP = 0.25
+    SLOW_FACTOR = 1.5
+    BACKOFF_FACTOR = 2.0
+    # Weight of the newest response in a domain's latency average
+    LATENCY_WEIGHT = 0.3
+
+    def __init__(self, max_concurrent: int = 16, initial_delay: float = 3.0, min_delay: float = 0.5,
+                 max_delay: float = 120.0, target_latency: float = 2.0, max_retry_after: float = 3600.0):
+        self.max_concurrent = max_concurrent
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.target_latency = target_latency
+        self.max_retry_after = max_retry_after
+        self.domains: Dict[str, DomainState] = {}
+        self.in_flight = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _domain(self, domain: str) -> DomainState:
+        state = self.domains.get(domain)
+        if state is None:
+            state = self.domains[domain] = DomainState(delay=self.initial_delay)
+        return state
+
+    def _global_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+            self._loop = loop
+            for state in self.domains.values():
+                state.lock = asyncio.Lock()
+        return self._slots
+
+    @asynccontextmanager
+    async def slot(self, domain: str) -> AsyncIterator[DomainState]:
+        """Wait for the domain's turn, then hold a request slot for the body of the block."""
+        slots = self._global_slots()
+        state = self._domain(domain)
+        state.waiting += 1
+        try:
+            # The lock queues the domain's requests in order, so each one sees
+            # the spacing left by the previous one and its response
+            async with state.lock:
+                while (wait := state.not_before - time.monotonic()) > 0:
+                    await asyncio.sleep(wait)
+                await slots.acquire()
+                state.not_before = time.monotonic() + state.delay
+        finally:
+            state.waiting -= 1
+        state.in_flight += 1
+        state.requests += 1
+        self.in_flight += 1
+        try:
+            yield state
+        finally:
+            state.in_flight -= 1
+            self.in_flight -= 1
+            slots.release()
+
+    def record(self, domain: str, status: Optional[int], latency: float, retry_after: Optional[str] = None):
+        """Adapt a domain's delay to a response, or to a failed request when ``status`` is None."""
+        state = self._domain(domain)
+        if status is not None:
+            state.latency = latency if state.latency is None else (
+                self.LATENCY_WEIGHT * latency + (1 - self.LATENCY_WEIGHT) * state.latency
+            )
+        if status is None or status in THROTTLE_STATUSES:
+            if status is not None:
+                state.throttled += 1
+            state.delay = min(state.delay * self.BACKOFF_FACTOR, self.max_delay)
+            wait = parse_retry_after(retry_after)
+            if wait is not None:
+                wait = min(wait, self.max_retry_after)
+                state.not_before = max(state.not_before, time.monotonic() + wait)
+            logger.info(
+                f"🐢 {domain} {'failed' if status is None else f'answered {status}'}, "
+                f"spacing requests {state.delay:.1f}s apart"
+                + (f", pausing {wait:.0f}s as asked" if wait else "")
+            )
+        elif latency > self.target_latency:
+            state.delay = min(max(state.delay * self.SLOW_FACTOR, latency), self.max_delay)
+        else:
+            state.delay = max(state.delay - self.DECREASE_STEP, self.min_delay)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            'in_flight': self.in_flight,
+            'waiting': sum(state.waiting for state in self.domains.values()),
+            'domains': {domain: state.to_dict() for domain, state in self.domains.items()}
+        }
+
+# Shared instance used by the article scraper
+politeness = PolitenessScheduler(
+    max_concurrent=SCRAPE_MAX_CONCURRENT,
+    initial_delay=SCRAPE_DOMAIN_DELAY,
+    min_delay=SCRAPE_MIN_DOMAIN_DELAY,
+    max_delay=SCRAPE_MAX_DOMAIN_DELAY,
+    target_latency=SCRAPE_TARGET_LATENCY
+)
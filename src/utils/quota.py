@@ -0,0 +1,151 @@
+"""Token-bucket scheduling of Gemini requests across API keys and models."""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import GEMINI_API_KEYS, RPM_LIMIT, RPD_LIMIT, MODEL_RATE_LIMITS
+
+logger = logging.getLogger(__name__)
+
+class QuotaExhausted(Exception):
+    """The API rejected a request because a key's quota is used up."""
+
+class TokenBucket:
+    """Continuously refilling request allowance."""
+
+    def __init__(self, capacity: float, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until a whole token is available, as of the last refill."""
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+class KeyModelQuota:
+    """Per-minute and per-day buckets for one API key on one model."""
+
+    def __init__(self, per_minute: int, per_day: int):
+        self.minute = TokenBucket(per_minute, 60)
+        self.day = TokenBucket(per_day, 86400)
+        self.blocked_until = 0.0
+
+    def wait_time(self, now: float) -> float:
+        self.minute.refill(now)
+        self.day.refill(now)
+        return max(self.minute.wait_time(), self.day.wait_time(), self.blocked_until - now)
+
+    def take(self):
+        self.minute.tokens -= 1
+        self.day.tokens -= 1
+
+class QuotaScheduler:
+    """Hands out API keys so requests run on every key in parallel within its quota.
+
+    Each (key, model) pair has its own per-minute and per-day bucket, so N
+    keys give N times the request rate. Waiting requests are served in
+    priority order (lower first), then in arrival order, and nobody holds a
+    lock while waiting for quota to refill. A key that the API reports as
+    exhausted is held back with penalize().
+    """
+
+    def __init__(self, keys: List[str], per_minute: int, per_day: int,
+                 model_limits: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.keys = [key for key in keys if key]
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self.model_limits = model_limits or {}
+        self._quotas: Dict[Tuple[str, str], KeyModelQuota] = {}
+        self._waiters: Dict[str, list] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._seq = itertools.count()
+        self.granted = 0
+
+    def _quota(self, key: str, model: str) -> KeyModelQuota:
+        quota = self._quotas.get((key, model))
+        if quota is None:
+            per_minute, per_day = self.model_limits.get(model, (self.per_minute, self.per_day))
+            quota = self._quotas[(key, model)] = KeyModelQuota(per_minute, per_day)
+        return quota
+
+    async def acquire(self, model: str, priority: int = 0) -> str:
+        """Wait for quota on any key for ``model`` and return that key."""
+        if not self.keys:
+            raise RuntimeError("No Gemini API keys configured")
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters.setdefault(model, []), (priority, next(self._seq), future))
+        self._dispatch(model)
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # A key granted just before cancellation goes unused; its token is spent
+            if not future.cancelled():
+                future.cancel()
+            raise
+
+    def _dispatch(self, model: str):
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+        waiters = self._waiters.get(model, [])
+        now = time.monotonic()
+        while waiters:
+            future = waiters[0][2]
+            if future.done():
+                heapq.heappop(waiters)
+                continue
+            waits = {key: self._quota(key, model).wait_time(now) for key in self.keys}
+            # Prefer the ready key with the most minute tokens left, spreading load over keys
+            ready = [key for key, wait in waits.items() if wait == 0]
+            if not ready:
+                delay = min(waits.values())
+                self._timers[model] = asyncio.get_running_loop().call_later(delay, self._dispatch, model)
+                return
+            key = max(ready, key=lambda k: self._quota(k, model).minute.tokens)
+            self._quota(key, model).take()
+            heapq.heappop(waiters)
+            future.set_result(key)
+            self.granted += 1
+
+    def penalize(self, key: str, model: str, seconds: float = 60.0):
+        """Hold a key back on a model after the API reported its quota exhausted."""
+        quota = self._quota(key, model)
+        quota.blocked_until = max(quota.blocked_until, time.monotonic() + seconds)
+        logger.warning(f"⏳ Gemini key {self.label(key)} exhausted on {model}, holding it back {seconds:.0f}s")
+
+    def wait_time(self, model: str) -> float:
+        """Seconds until a request for ``model`` could be granted on some key."""
+        now = time.monotonic()
+        return min((self._quota(key, model).wait_time(now) for key in self.keys), default=0.0)
+
+    def label(self, key: str) -> str:
+        """Loggable name for a key that does not reveal it."""
+        return f"key{self.keys.index(key)}" if key in self.keys else "key?"
+
+    def stats(self) -> Dict[str, object]:
+        """Remaining quota per key and model, and requests waiting per model."""
+        now = time.monotonic()
+        remaining: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (key, model), quota in self._quotas.items():
+            quota.wait_time(now)
+            remaining.setdefault(self.label(key), {})[model] = {
+                'minute': quota.minute.tokens,
+                'day': quota.day.tokens,
+                'blocked_for': max(0.0, quota.blocked_until - now)
+            }
+        return {
+            'remaining': remaining,
+            'waiting': {model: sum(1 for *_, f in waiters if not f.done()) for model, waiters in self._waiters.items()},
+            'granted': self.granted
+        }
+
+# Shared instance used for every Gemini request
+quota_scheduler = QuotaScheduler(GEMINI_API_KEYS, RPM_LIMIT, RPD_LIMIT, MODEL_RATE_LIMITS)
@@ -0,0 +1,127 @@
+"""Persistent, compressed cache of scraped articles with conditional revalidation."""
+import json
+import logging
+import os
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from config.settings import SCRAPE_CACHE_FRESH_HOURS, SCRAPE_CACHE_TTL_DAYS, SCRAPE_CACHE_MAX_ENTRIES
+from .sqlite_cache import SQLiteCache
+from ..database.models import PROJECT_ROOT
+
+logger = logging.getLogger(__name__)
+
+SCRAPE_CACHE_PATH = os.path.join(PROJECT_ROOT, 'data', 'scrape_cache.db')
+
+@dataclass
+class CachedArticle:
+    """A scraped article with the validators of the page it came from."""
+    article: Dict[str, Any]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched: float
+    fresh: bool
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Build conditional-GET request headers from stored validators."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+class ScrapeCache(SQLiteCache):
+    """Scraped articles by URL, zlib-compressed in their own SQLite file.
+
+    An article is served as is for ``fresh_for`` seconds after it was
+    fetched or revalidated. After that it is served again only once the
+    publisher answers a conditional GET with 304 Not Modified. Entries are
+    dropped ``ttl`` seconds after they were last fetched or revalidated.
+    Once more than ``max_entries`` are stored, the least recently used are
+    evicted.
+    """
+
+    TABLE = 'scrape_cache'
+    KEY = 'url'
+    COLUMNS = ('article BLOB NOT NULL', 'etag TEXT', 'last_modified TEXT')
+    STORED = 'fetched'
+    NAME = 'Scrape cache'
+    NOUN = 'articles'
+
+    def __init__(self, path: str = SCRAPE_CACHE_PATH, max_entries: int = 20000,
+                 fresh_for: float = 6 * 3600, ttl: float = 7 * 86400):
+        super().__init__(path, max_entries, ttl)
+        self.fresh_for = fresh_for
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, url: str) -> Optional[CachedArticle]:
+        """Look up an article; check ``fresh`` before serving it without revalidation."""
+        row = self._lookup(url, ('article', 'etag', 'last_modified'))
+        if row is None:
+            return None
+        return CachedArticle(
+            article=json.loads(zlib.decompress(row[0])),
+            etag=row[1],
+            last_modified=row[2],
+            fetched=row[3],
+            fresh=row[3] >= time.time() - self.fresh_for
+        )
+
+    def put(self, url: str, article: Dict[str, Any], etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self._store(url, {
+            'article': zlib.compress(json.dumps(article).encode('utf-8')),
+            'etag': etag,
+            'last_modified': last_modified
+        })
+
+    def touch(self, url: str):
+        """Mark an article fresh again after the publisher answered 304 Not Modified."""
+        conn = self._connect()
+        now = time.time()
+        conn.execute('UPDATE scrape_cache SET fetched = ?, last_used = ? WHERE url = ?', (now, now, url))
+        conn.commit()
+
+    def record(self, outcome: str):
+        """Count a lookup as a 'hit', 'revalidated' or 'miss'."""
+        if outcome == 'hit':
+            self.hits += 1
+        elif outcome == 'revalidated':
+            self.revalidated += 1
+        else:
+            self.misses += 1
+        lookups = self.hits + self.revalidated + self.misses
+        if lookups % self.REPORT_EVERY == 0:
+            logger.info(
+                f"🗃️ Scrape cache: {self.hit_rate:.0%} served without a download over {lookups} lookups "
+                f"({self.revalidated} revalidated, {self.coalesced} coalesced), {self._count} articles stored"
+            )
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered without downloading the page body."""
+        lookups = self.hits + self.revalidated + self.misses
+        return (self.hits + self.revalidated) / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'entries': self._count,
+            'hits': self.hits,
+            'revalidated': self.revalidated,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'hit_rate': self.hit_rate,
+            'evictions': self.evictions
+        }
+
+# Shared instance used by the article scraper
+scrape_cache = ScrapeCache(
+    max_entries=SCRAPE_CACHE_MAX_ENTRIES,
+    fresh_for=SCRAPE_CACHE_FRESH_HOURS * 3600,
+    ttl=SCRAPE_CACHE_TTL_DAYS * 86400
+)
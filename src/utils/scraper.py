@@ -1,12 +1,17 @@
 """Article scraping utilities for news content extraction."""
 import asyncio
+import collections
+import datetime
 import logging
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, NamedTuple
 from urllib.parse import urlparse
-import aiohttp
-from bs4 import BeautifulSoup
-from newspaper import Article, Config
+from newspaper import Config
 from fake_useragent import UserAgent
+from .http import http_client
+from .scrape_cache import ScrapeCache, scrape_cache
+from .extraction import ExtractionPool, extraction_pool
+from .politeness import PolitenessScheduler, politeness as politeness_scheduler
 
 # Configure logging
 logging.basicConfig(
@@ -25,109 +30,64 @@ config.request_timeout = 15
 config.fetch_images = False
 config.memoize_articles = False
 
+class Page(NamedTuple):
+    """A downloaded page with its cache validators. ``html`` is None on 304 Not Modified."""
+    status: int
+    html: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+
 class ArticleScraper:
-    """Handles article scraping with fallback methods and content cleaning."""
-    
-    def __init__(self):
-        self.session = None
-        self._rate_limits: Dict[str, float] = {}
-        self._domain_delays: Dict[str, float] = {}
-    
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session."""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
-        return self.session
+    """Handles article scraping with fallback methods and content cleaning.
+
+    Each page is downloaded once and every extractor works on that copy,
+    in the extraction worker pool.
+    Scraped articles are cached per URL. Concurrent requests for a URL
+    share one in-flight scrape. Downloads are spaced per domain by the
+    politeness scheduler, which adapts to each publisher's responses.
+    """
     
-    async def _respect_rate_limits(self, domain: str):
-        """Implement rate limiting per domain."""
-        import time
-        
-        current_time = time.time()
-        if domain in self._rate_limits:
-            time_since_last = current_time - self._rate_limits[domain]
-            delay = self._domain_delays.get(domain, 3)  # Default 3 second delay
-            
-            if time_since_last < delay:
-                wait_time = delay - time_since_last
-                logger.debug(f"Rate limiting for {domain}, waiting {wait_time:.2f}s")
-                await asyncio.sleep(wait_time)
-        
-        self._rate_limits[domain] = current_time
+    def __init__(self, cache: Optional[ScrapeCache] = None, extraction: Optional[ExtractionPool] = None,
+                 politeness: Optional[PolitenessScheduler] = None):
+        self.http = http_client
+        self.cache = cache if cache is not None else scrape_cache
+        self.extraction = extraction if extraction is not None else extraction_pool
+        self.politeness = politeness if politeness is not None else politeness_scheduler
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Extractor that produced each domain's articles, 'none' when all failed
+        self.extractor_wins: Dict[str, collections.Counter] = collections.defaultdict(collections.Counter)
     
     def _extract_domain(self, url: str) -> str:
         """Extract domain from URL."""
         return urlparse(url).netloc
     
-    async def _fetch_with_newspaper(self, url: str) -> Optional[Dict[str, Any]]:
-        """Fetch article using newspaper3k library."""
-        try:
-            article = Article(url, config=config)
-            await asyncio.to_thread(article.download)
-            await asyncio.to_thread(article.parse)
-            
-            return {
-                'title': article.title,
-                'text': article.text,
-                'authors': article.authors,
-                'publish_date': article.publish_date,
-                'top_image': article.top_image,
-                'meta_description': article.meta_description
-            }
-        except Exception as e:
-            logger.warning(f"Newspaper3k extraction failed for {url}: {str(e)}")
-            return None
-    
-    async def _fetch_with_beautifulsoup(self, url: str) -> Optional[Dict[str, Any]]:
-        """Fetch article using BeautifulSoup as fallback."""
+    async def _download(self, url: str, headers: Dict[str, str]) -> Optional[Page]:
+        """GET a page, or return None on a failed request or an unexpected status."""
+        domain = self._extract_domain(url)
+        started = time.monotonic()
+        answered = False
         try:
-            session = await self._get_session()
-            headers = {'User-Agent': user_agent.random}
-            
-            async with session.get(url, headers=headers) as response:
+            async with self.http.request('GET', url, headers={'User-Agent': config.browser_user_agent, **headers}) as response:
+                answered = True
+                self.politeness.record(domain, response.status, time.monotonic() - started,
+                                       response.headers.get('Retry-After'))
+                if response.status == 304:
+                    return Page(304, None, None, None)
                 if response.status != 200:
                     return None
-                
-                html = await response.text()
-                soup = BeautifulSoup(html, 'html.parser')
-                
-                # Remove unwanted elements
-                for element in soup.find_all(['script', 'style', 'nav', 'header', 'footer', 'iframe']):
-                    element.decompose()
-                
-                # Extract title
-                title = None
-                title_tag = soup.find('meta', property='og:title') or soup.find('title')
-                if title_tag:
-                    title = title_tag.get('content', None) or title_tag.string
-                
-                # Extract main content
-                content = ''
-                article_tag = soup.find('article') or soup.find(class_=['article', 'post', 'content', 'main'])
-                
-                if article_tag:
-                    paragraphs = article_tag.find_all('p')
-                else:
-                    paragraphs = soup.find_all('p')
-                
-                content = ' '.join(p.get_text().strip() for p in paragraphs if len(p.get_text().strip()) > 100)
-                
-                if not content:
-                    return None
-                
-                return {
-                    'title': title,
-                    'text': content,
-                    'authors': None,
-                    'publish_date': None,
-                    'top_image': None,
-                    'meta_description': None
-                }
-                
+                body = await self.http.read(response)
+                try:
+                    html = body.decode(response.charset or 'utf-8', errors='replace')
+                except LookupError:
+                    html = body.decode('utf-8', errors='replace')
+                return Page(200, html, response.headers.get('ETag'), response.headers.get('Last-Modified'))
         except Exception as e:
-            logger.warning(f"BeautifulSoup extraction failed for {url}: {str(e)}")
+            if not answered:
+                # Timeouts and refused connections slow the domain down like a 503
+                self.politeness.record(domain, None, time.monotonic() - started)
+            logger.warning(f"Download failed for {url}: {str(e)}")
             return None
-    
+
     def _clean_content(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """Clean and normalize extracted content."""
         if not content:
@@ -145,33 +105,64 @@ class ArticleScraper:
         # Clean title
         if content.get('title'):
             content['title'] = ' '.join(content['title'].split())
+
+        # Keep the article JSON-serializable so cached and fresh results match
+        if isinstance(content.get('publish_date'), datetime.datetime):
+            content['publish_date'] = content['publish_date'].isoformat()
         
         return content
     
     async def scrape_article(self, url: str) -> Optional[Dict[str, Any]]:
-        """Scrape article content with fallback methods."""
+        """Scrape article content with fallback methods.
+
+        Articles come from the scrape cache while fresh, and after a 304
+        Not Modified once stale. A URL already being scraped is not
+        fetched again; its callers all await the same scrape.
+        """
         # Validate URL before proceeding
         if not isinstance(url, str) or not url.startswith(('http://', 'https://')):            
             logger.error(f"Invalid URL provided: {url}. URL must be a string starting with http:// or https://")
             return None
 
+        future = self._inflight.get(url)
+        if future is not None:
+            self.cache.coalesced += 1
+        else:
+            future = self._inflight[url] = asyncio.ensure_future(self._scrape(url))
+            future.add_done_callback(lambda _: self._inflight.pop(url, None))
+        # A cancelled caller must not cancel the scrape the others are waiting on
+        return await asyncio.shield(future)
+
+    async def _scrape(self, url: str) -> Optional[Dict[str, Any]]:
+        cached = self.cache.get(url)
+        if cached is not None and cached.fresh:
+            self.cache.record('hit')
+            return cached.article
+
         domain = self._extract_domain(url)
-        await self._respect_rate_limits(domain)
-        
-        # Try newspaper3k first
-        content = await self._fetch_with_newspaper(url)
-        
-        # Fallback to BeautifulSoup if newspaper fails
-        if not content or not content.get('text'):
-            content = await self._fetch_with_beautifulsoup(url)
+        async with self.politeness.slot(domain):
+            page = await self._download(url, cached.conditional_headers() if cached else {})
+        if page is not None and page.status == 304 and cached is not None:
+            self.cache.touch(url)
+            self.cache.record('revalidated')
+            return cached.article
+        self.cache.record('miss')
+        if page is None or not page.html:
+            return None
+
+        # newspaper3k first, then lxml, then BeautifulSoup, all on the same page
+        extractor, content = await self.extraction.extract(url, page.html)
+        self.extractor_wins[domain][extractor or 'none'] += 1
         
         # Clean and return content
-        return self._clean_content(content) if content else None
-    
-    async def close(self):
-        """Close the aiohttp session."""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        content = self._clean_content(content) if content else None
+        if content and content.get('text'):
+            self.cache.put(url, content, page.etag if page else None, page.last_modified if page else None)
+        return content
+
+    def extractor_stats(self) -> Dict[str, Dict[str, int]]:
+        """How often each extractor produced the article, per domain."""
+        return {domain: dict(wins) for domain, wins in self.extractor_wins.items()}
 
 # Create singleton instance
 article_scraper = ArticleScraper()
@@ -0,0 +1,117 @@
+"""Base class for caches kept in their own SQLite file, with TTL and LRU eviction."""
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+class SQLiteCache:
+    """Keyed rows in one table of their own SQLite file.
+
+    Subclasses name the table, its key column, the value columns and the
+    column holding the time an entry was stored. Entries expire ``ttl``
+    seconds after that time. Once more than ``max_entries`` are stored,
+    the least recently used are evicted. The connection is opened on
+    first use.
+    """
+
+    TABLE = ''
+    KEY = 'key'
+    # Value column definitions, e.g. 'response TEXT NOT NULL'
+    COLUMNS: Sequence[str] = ()
+    # Column with the time an entry was stored, which the TTL counts from
+    STORED = 'created'
+    # Name for log lines and what the entries are
+    NAME = 'Cache'
+    NOUN = 'entries'
+    # Fraction of max_entries kept after an eviction pass, so eviction runs in batches
+    EVICT_TO = 0.9
+    # Lookups between hit rate log lines
+    REPORT_EVERY = 100
+
+    def __init__(self, path: str, max_entries: int, ttl: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._count = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                    {self.KEY} TEXT PRIMARY KEY,
+                    {', '.join(self.COLUMNS)},
+                    {self.STORED} REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            ''')
+            self._conn.execute(
+                f'CREATE INDEX IF NOT EXISTS idx_{self.TABLE}_last_used ON {self.TABLE}(last_used)'
+            )
+            self._conn.execute(f'DELETE FROM {self.TABLE} WHERE {self.STORED} < ?', (time.time() - self.ttl,))
+            self._conn.commit()
+            self._count = self._conn.execute(f'SELECT COUNT(*) FROM {self.TABLE}').fetchone()[0]
+            logger.info(f"🗃️ {self.NAME} opened with {self._count} {self.NOUN}")
+        return self._conn
+
+    def _lookup(self, key: str, columns: Sequence[str]) -> Optional[Tuple[Any, ...]]:
+        """Fetch an unexpired entry's columns followed by its stored time, marking it used."""
+        conn = self._connect()
+        row = conn.execute(
+            f'SELECT {", ".join(columns)}, {self.STORED} FROM {self.TABLE} WHERE {self.KEY} = ?', (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None or row[-1] < now - self.ttl:
+            return None
+        conn.execute(f'UPDATE {self.TABLE} SET last_used = ? WHERE {self.KEY} = ?', (now, key))
+        conn.commit()
+        return row
+
+    def _store(self, key: str, values: Dict[str, Any]):
+        """Insert or replace an entry, stamped as stored and used now."""
+        conn = self._connect()
+        now = time.time()
+        values = {**values, self.STORED: now, 'last_used': now}
+        cursor = conn.execute(
+            f'INSERT OR IGNORE INTO {self.TABLE} ({self.KEY}, {", ".join(values)}) '
+            f'VALUES (?, {", ".join("?" * len(values))})',
+            (key, *values.values())
+        )
+        if cursor.rowcount:
+            self._count += 1
+        else:
+            conn.execute(
+                f'UPDATE {self.TABLE} SET {", ".join(f"{column} = ?" for column in values)} WHERE {self.KEY} = ?',
+                (*values.values(), key)
+            )
+        if self._count > self.max_entries:
+            self._evict(conn)
+        conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection):
+        conn.execute(f'DELETE FROM {self.TABLE} WHERE {self.STORED} < ?', (time.time() - self.ttl,))
+        keep = int(self.max_entries * self.EVICT_TO)
+        conn.execute(f'''
+            DELETE FROM {self.TABLE} WHERE {self.KEY} IN (
+                SELECT {self.KEY} FROM {self.TABLE} ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+        ''', (keep,))
+        count = conn.execute(f'SELECT COUNT(*) FROM {self.TABLE}').fetchone()[0]
+        self.evictions += self._count - count
+        self._count = count
+
+    def __len__(self) -> int:
+        self._connect()
+        return self._count
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -3,7 +3,7 @@ from pathlib import Path
 from fastapi import FastAPI, HTTPException, Request, WebSocket
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
@@ -19,6 +19,7 @@ from ..database.models import (
     get_article_tags, search_articles_by_tags
 )
 from ..core.processor import ImageExtractor
+from ..core.websub import websub_manager
 from ..utils.text import clean_text
 from .websocket_manager import manager
 from config.settings import STATIC_DIR, TEMPLATES_DIR, WEB_HOST
@@ -283,6 +284,30 @@ def create_app():
             print(f"Error serving countries data: {str(e)}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    @app.get("/websub/{token}")
+    async def websub_verify(token: str, request: Request):
+        """Answer a WebSub hub's subscription verification."""
+        params = request.query_params
+        body = websub_manager.verify(
+            token,
+            mode=params.get('hub.mode', ''),
+            topic=params.get('hub.topic', ''),
+            challenge=params.get('hub.challenge'),
+            lease_seconds=params.get('hub.lease_seconds')
+        )
+        if body is None:
+            raise HTTPException(status_code=404, detail="Unknown subscription")
+        return PlainTextResponse(body)
+
+    @app.post("/websub/{token}")
+    async def websub_deliver(token: str, request: Request):
+        """Receive a feed body pushed by a WebSub hub."""
+        body = await request.body()
+        if not websub_manager.deliver(token, body, request.headers.get('X-Hub-Signature')):
+            # Tells the hub to drop a subscription we no longer know about
+            return Response(status_code=410)
+        return Response(status_code=202)
+
     @app.websocket("/ws")
     async def websocket_endpoint(websocket: WebSocket):
         await manager.connect(websocket)
@@ -11,6 +11,7 @@ const updateInterval = 30000; // 30 seconds
 
 // Make functions globally available for WebSocket handler
 window.handleNewsUpdate = handleNewsUpdate;
+window.handleNewsEnriched = handleNewsEnriched;
 window.updateNews = updateNews;
 
 async function handleNewsUpdate(newItem) {
@@ -54,6 +55,19 @@ async function handleNewsUpdate(newItem) {
     }
 }
 
+async function handleNewsEnriched(changes) {
+    // Replace the raw item shown on arrival with its enriched version
+    const container = document.getElementById('newsContainer');
+    const article = Array.from(container.querySelectorAll('article'))
+        .find(el => el.dataset.link === changes.link);
+    if (!article || !article.newsItem) return;
+
+    const element = createNewsElement({ ...article.newsItem, ...changes });
+    if (element) {
+        article.replaceWith(element);
+    }
+}
+
 async function fetchNews() {
     try {
         addLoadingItem('Fetching latest news articles...');
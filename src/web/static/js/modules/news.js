@@ -31,6 +31,9 @@ export function createNewsElement(newsItem) {
     const template = document.getElementById('newsItemTemplate');
     const element = template.content.cloneNode(true);
     const article = element.querySelector('article');
+    // Kept so an enriched update can be merged into the item and re-rendered
+    article.dataset.link = newsItem.link;
+    article.newsItem = newsItem;
     const imageContainer = article.querySelector('.news-image-container');
     const image = article.querySelector('.news-image');
 
@@ -65,7 +68,7 @@ export function createNewsElement(newsItem) {
     const titleContainer = article.querySelector('h2');
     titleContainer.textContent = titleWithEmojis;
     
-    if (newsItem.sentiment_score !== undefined) {
+    if (newsItem.sentiment_score != null) {
         const sentimentWrapper = document.createElement('div');
         sentimentWrapper.className = 'sentiment-wrapper';
         
@@ -83,7 +86,7 @@ export function createNewsElement(newsItem) {
     }
     
     // Add bias indicator if available
-    if (newsItem.bias_score !== undefined) {
+    if (newsItem.bias_score != null) {
         const biasWrapper = document.createElement('div');
         biasWrapper.className = 'bias-wrapper';
         
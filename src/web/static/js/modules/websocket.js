@@ -14,6 +14,8 @@ export function initWebSocket() {
         const data = JSON.parse(event.data);
         if (data.type === 'news_update') {
             await window.handleNewsUpdate(data.data);
+        } else if (data.type === 'news_enriched' && window.handleNewsEnriched) {
+            await window.handleNewsEnriched(data.data);
         }
     };
 
@@ -63,16 +63,36 @@ def format_news_item_for_broadcast(news_item: dict, article_id: int = None) -> d
     }
     
     if article_id:
-        # Get tags and format geography tags
-        tags = get_article_tags(article_id)
-        for tag in tags:
-            if tag['category'] == 'geography':
-                tag['name'] = format_tag_name(tag['name'])
-        formatted["data"]["tags"] = tags
+        formatted["data"]["tags"] = format_article_tags(article_id)
     
     return formatted
 
+def format_article_tags(article_id: int) -> list:
+    """Get an article's tags with geography tags formatted for display."""
+    tags = get_article_tags(article_id)
+    for tag in tags:
+        if tag['category'] == 'geography':
+            tag['name'] = format_tag_name(tag['name'])
+    return tags
+
+def format_news_enriched(changes: dict, article_id: int = None) -> dict:
+    """Format the fields AI enrichment filled in for an already broadcast news item.
+
+    Clients find the item by its link and merge the changes into it.
+    """
+    return {
+        "type": "news_enriched",
+        "data": {
+            **changes,
+            "tags": format_article_tags(article_id) if article_id else []
+        }
+    }
+
 async def broadcast_news_update(news_item: dict, article_id: int = None):
     """Broadcast news update to all connected clients."""
     formatted_item = format_news_item_for_broadcast(news_item, article_id)
-    await manager.broadcast(json.dumps(formatted_item))
\ No newline at end of file
+    await manager.broadcast(json.dumps(formatted_item))
+
+async def broadcast_news_enriched(changes: dict, article_id: int = None):
+    """Broadcast the enriched fields of a news item to all connected clients."""
+    await manager.broadcast(json.dumps(format_news_enriched(changes, article_id)))
\ No newline at end of file